@@ -18,9 +18,9 @@ import time
 
 from src.auth import register_user, login_user, verify_user_email, get_user_settings, save_user_settings, logout, resend_verification_code, init_session_state
 from src.alerts import check_alerts, get_alert_history
-from src.data import get_live_price, get_historical_data
-from src.indicators import calculate_rsi, calculate_macd, calculate_bollinger_bands
-from src.trading_rules import SmartSignals, RiskAssessment
+from src.data import get_live_price, get_live_price_batch, get_historical_data, get_live_indicators, prefetch_history
+from src.trading_rules import RiskAssessment
+from src.indicator_frame import IndicatorFrame
 from src.tooltips import get_tooltip, format_tooltip_markdown
 
 st.set_page_config(
@@ -217,9 +217,10 @@ def get_ai_news(force_refresh=False):
     cache.set(cache_key, unique_news, ttl=86400)
     return unique_news
 
-def display_live_price_with_animation(ticker):
+def display_live_price_with_animation(ticker, price_info=None):
     """Display live price with smooth animation updates like a sports watch"""
-    price_info = get_live_price(ticker)
+    if price_info is None:
+        price_info = get_live_price(ticker)
     price = price_info.get('price', 0)
     change_24h = price_info.get('change_24h', 0)
     
@@ -1429,6 +1430,12 @@ def page_dashboard():
             commodities = sum(1 for t in selected_tickers if t in ["XAU"])
             st.metric(" Matières 1ères", commodities, "sélectionnées")
     
+    # Prix de tous les actifs sélectionnés en un seul appel concurrent (réutilisés par tous les onglets)
+    live_prices = get_live_price_batch(st.session_state.get("selected_tickers", []))
+    # Historique 1J des graphes en parallèle, pour les seuls tickers pas encore en cache
+    # (les fenêtres 30J/90J se chargent dans leurs sections, sans jetons CoinGecko dépensés d'avance)
+    prefetch_history(st.session_state.get("selected_tickers", []), [1])
+    
     with tab_prices:
         st.markdown("### Prix en Temps Réel - Market Snapshot")
         
@@ -1454,7 +1461,7 @@ def page_dashboard():
             for idx, ticker in enumerate(selected_tickers):
                 with price_cols[idx % 3]:
                     # Display price with animation and change info
-                    price_display = display_live_price_with_animation(ticker)
+                    price_display = display_live_price_with_animation(ticker, live_prices.get(ticker))
                     prices_data[ticker] = price_display
                     
                     # Display as metric with delta (like a sports watch)
@@ -1533,6 +1540,10 @@ def page_dashboard():
         selected_period = "1D"
         days_to_fetch = 1  # Always fetch 1 day of data for ALL assets
         
+        # Historique 1J et indicateurs de tous les tickers, calculés en un seul passage
+        chart_history = {ticker: get_historical_data(ticker, days=days_to_fetch) for ticker in selected_tickers}
+        chart_frame = IndicatorFrame({ticker: hist['close'].values for ticker, hist in chart_history.items() if not hist.empty})
+        
         for ticker in selected_tickers:
             # Display with period badge
             period_badge = {"1H": "️ 1 Heure", "4H": "️ 4 Heures", "1D": " 1 Jour", "1W": " 1 Semaine", "1M": " 1 Mois", "3M": " 3 Mois"}
@@ -1543,7 +1554,7 @@ def page_dashboard():
             with col_badge:
                 st.info(badge)
             
-            hist_data = get_historical_data(ticker, days=days_to_fetch)
+            hist_data = chart_history[ticker]
             
             # Sécuriser les données pour le candlestick
             if hist_data.empty:
@@ -1570,9 +1581,9 @@ def page_dashboard():
             # Recalculate indicators on FULL data for accuracy
             prices = hist_data['close'].values
             
-            rsi = calculate_rsi(prices)
-            macd_line, signal_line, histogram = calculate_macd(prices)
-            bb_mid, bb_upper, bb_lower = calculate_bollinger_bands(prices)
+            rsi = chart_frame.rsi(ticker)
+            macd_line, signal_line, histogram = chart_frame.macd(ticker)
+            bb_mid, bb_upper, bb_lower = chart_frame.bollinger(ticker)
             
             # Graphe candlestick principal - Subplots: Candles (row1) + Volume (row2)
             fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
@@ -1822,6 +1833,23 @@ def page_dashboard():
             
             st.divider()
         
+        # Clôtures 30J synchronisées avec le prix live: un seul calcul d'indicateurs
+        # partagé par les alertes, les signaux et l'historique des alertes
+        signal_closes = {}
+        for ticker in selected_tickers:
+            try:
+                live_price_data = live_prices.get(ticker) or get_live_price(ticker)
+                price = live_price_data.get('price', 0) if isinstance(live_price_data, dict) else float(live_price_data)
+                hist_data = get_historical_data(ticker, days=30)
+                if price <= 0 or np.isnan(price) or hist_data is None or len(hist_data) == 0:
+                    continue
+                prices = np.nan_to_num(hist_data['close'].values, nan=price)
+                prices[-1] = price
+                signal_closes[ticker] = prices
+            except Exception:
+                pass
+        signal_frame = IndicatorFrame(signal_closes)
+        
         st.markdown("---")
         st.subheader("🔔 Alertes en Temps Réel")
         
@@ -1830,26 +1858,23 @@ def page_dashboard():
         for ticker in selected_tickers:
             try:
                 # Get live price
-                live_price_data = get_live_price(ticker)
+                live_price_data = live_prices.get(ticker) or get_live_price(ticker)
                 price = live_price_data.get('price', 0) if isinstance(live_price_data, dict) else float(live_price_data)
                 
                 if price <= 0 or np.isnan(price):
                     continue
                 
-                # Get historical data
-                hist_data = get_historical_data(ticker, days=30)
-                if hist_data is None or len(hist_data) == 0:
+                # RSI maintenu par le flux temps réel si disponible, sinon calcul batch
+                live_indicators = get_live_indicators(ticker)
+                if live_indicators:
+                    all_alerts.extend(check_alerts(ticker, float(live_indicators['rsi']), price))
                     continue
                 
-                prices = hist_data['close'].values
-                prices = np.nan_to_num(prices, nan=price)
-                
-                # Synchronize with live price
-                if len(prices) > 0:
-                    prices[-1] = price
+                if ticker not in signal_frame:
+                    continue
                 
-                # Calculate RSI for alerts
-                rsi = calculate_rsi(prices)
+                # RSI sur l'historique 30J synchronisé (calculé une fois pour tous les onglets)
+                rsi = signal_frame.rsi(ticker)
                 if rsi is not None and len(rsi) > 0:
                     ticker_alerts = check_alerts(ticker, float(rsi[-1]), price)
                     all_alerts.extend(ticker_alerts)
@@ -1873,7 +1898,7 @@ def page_dashboard():
         for ticker in selected_tickers:
             try:
                 # Get live price for real-time data
-                live_price_data = get_live_price(ticker)
+                live_price_data = live_prices.get(ticker) or get_live_price(ticker)
                 current_price = live_price_data.get('price', 0) if isinstance(live_price_data, dict) else float(live_price_data)
                 
                 # Validate live price
@@ -1881,21 +1906,11 @@ def page_dashboard():
                     st.warning(f"Prix en temps réel invalide pour {ticker}")
                     continue
                 
-                # Get historical data for indicators
-                hist_data = get_historical_data(ticker, days=30)
-                if hist_data is None or len(hist_data) == 0:
+                # Indicators on the live-synced 30-day history (shared with the alerts)
+                if ticker not in signal_frame:
                     st.warning(f"Données historiques indisponibles pour {ticker}")
                     continue
-                
-                prices = hist_data['close'].values
-                prices = np.nan_to_num(prices, nan=current_price)
-                
-                # Synchronize last price with live price for accuracy
-                if len(prices) > 0:
-                    prices[-1] = current_price
-                
-                # Calculate indicators
-                smart_signals = SmartSignals(prices)
+                smart_signals = signal_frame.signals(ticker)
                 signals = smart_signals.get_detailed_signals()
                 
                 # Display ticker header with live price
@@ -1928,7 +1943,7 @@ def page_dashboard():
         for ticker in selected_tickers:
             try:
                 # Get live price for real-time accuracy
-                live_price_data = get_live_price(ticker)
+                live_price_data = live_prices.get(ticker) or get_live_price(ticker)
                 live_price = live_price_data.get('price', 0) if isinstance(live_price_data, dict) else float(live_price_data)
                 
                 if live_price <= 0 or np.isnan(live_price):
@@ -2005,13 +2020,9 @@ def page_dashboard():
             auto_alerts = []
             for ticker in selected_tickers[:3]:  # Show alerts for first 3 tickers
                 try:
-                    hist_data = get_historical_data(ticker, days=30)
-                    if hist_data is not None and len(hist_data) > 0:
-                        prices = hist_data['close'].values
-                        prices = np.nan_to_num(prices, nan=np.nanmean(prices))
-                        
-                        # Calculate signals
-                        smart_signals = SmartSignals(prices)
+                    if ticker in signal_frame:
+                        # Signaux déjà calculés pour la section Signaux de Trading
+                        smart_signals = signal_frame.signals(ticker)
                         signal_text = smart_signals.get_signal_text()
                         
                         # Determine alert type
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""Benchmark: démarrage à froid du cache disque vs re-téléchargement
+
+Mesure, pour 11 tickers x 90 jours de bougies horaires:
+- le temps pour reconstruire l'historique (APIs, ou données mock si hors ligne)
+- le temps de rechargement depuis le disque par un CacheManager neuf
+  (processus redémarré: niveau mémoire vide), pour chaque format disponible
+"""
+import shutil
+import tempfile
+import time
+
+from src.cache import CacheManager
+from src.data import get_historical_data
+from src.serializers import ARROW_AVAILABLE, DataFrameSerializer, NumpySerializer, JsonSerializer
+
+TICKERS = ["BTC", "ETH", "SOL", "ADA", "XRP", "DOT", "EUR", "GBP", "JPY", "AUD", "XAU"]
+DAYS = 90
+
+print("=" * 70)
+print(f"BENCHMARK: DÉMARRAGE À FROID - {len(TICKERS)} tickers x {DAYS} jours")
+print("=" * 70)
+
+# Re-téléchargement: cache désactivé via un répertoire vide
+import src.data as data_module
+data_module.cache = CacheManager(cache_dir=tempfile.mkdtemp())
+start = time.perf_counter()
+frames = {ticker: get_historical_data(ticker, days=DAYS) for ticker in TICKERS}
+refetch = time.perf_counter() - start
+rows = sum(len(frame) for frame in frames.values())
+print(f"\nRe-téléchargement:      {refetch * 1000:9.1f} ms  ({rows} bougies)")
+
+formats = [("npz", DataFrameSerializer(use_arrow=False))]
+if ARROW_AVAILABLE:
+    formats.insert(0, ("feather (mmap)", DataFrameSerializer(use_arrow=True)))
+
+for label, serializer in formats:
+    cache_dir = tempfile.mkdtemp()
+    serializers = [serializer, NumpySerializer(), JsonSerializer()]
+    writer = CacheManager(cache_dir=cache_dir, serializers=serializers)
+    for ticker, frame in frames.items():
+        writer.set(f"history_{ticker}_{DAYS}", frame, ttl=3600)
+
+    # Nouveau CacheManager = processus redémarré (niveau mémoire vide)
+    reader = CacheManager(cache_dir=cache_dir, serializers=serializers)
+    start = time.perf_counter()
+    loaded = [reader.get(f"history_{ticker}_{DAYS}") for ticker in TICKERS]
+    cold = time.perf_counter() - start
+    assert all(frame is not None for frame in loaded)
+    print(f"Cache disque {label:<15} {cold * 1000:6.1f} ms  (x{refetch / cold:,.0f} plus rapide)")
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+print("\n" + "=" * 70)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""Benchmark: débit du replay dans le chemin de signaux live
+
+Rejoue 30 jours de bougies horaires (4 ticks par bougie) de plusieurs cryptos
+après un préchauffage de 30 jours, à travers TickStore, PriceArbiter,
+IncrementalIndicatorSet, check_alerts et SmartSignals:
+- sans attente (débit maximal, événements/s)
+- à 1000x le temps réel sur une heure simulée (précision de la cadence)
+"""
+import pandas as pd
+
+from src.mock_market import mock_candles
+from src.replay import HISTORY_BARS, ReplayEngine, candle_events, merge_events
+
+TICKERS = ["BTC", "ETH", "SOL", "ADA", "XRP", "DOT"]
+DAYS = 30
+NOW = pd.Timestamp("2025-06-01")
+
+print("=" * 70)
+print(f"BENCHMARK: REPLAY - {len(TICKERS)} tickers x {DAYS} jours (4 ticks/bougie)")
+print("=" * 70)
+
+history = {ticker: mock_candles(ticker, HISTORY_BARS + DAYS * 24, now=NOW) for ticker in TICKERS}
+
+def engine_for(speed):
+    engine = ReplayEngine(speed=speed)
+    for ticker, candles in history.items():
+        engine.warmup(ticker, candles["close"].to_numpy()[:HISTORY_BARS + 1],
+                      candles["timestamp"].iat[HISTORY_BARS].timestamp())
+    return engine
+
+events = list(merge_events(*(candle_events(t, c.iloc[HISTORY_BARS + 1:]) for t, c in history.items())))
+report = engine_for(None).run(events)
+print(f"\nSans attente:  {report['events']:>7} événements en {report['seconds']:6.2f} s  "
+      f"({report['events_per_sec']:,.0f} événements/s, x{report['acceleration']:,.0f} temps réel)")
+print(f"               {len(report['signals'])} signaux, {len(report['alerts'])} alertes")
+
+hour = [event for event in events if event[0] <= events[0][0] + 3600]
+report = engine_for(1000).run(hour)
+print(f"\nVitesse 1000x: {report['simulated_seconds']:.0f} s simulées en {report['seconds']:.2f} s "
+      f"(x{report['acceleration']:.0f}, {report['events_per_sec']:,.0f} événements/s)")
+
+print("\n" + "=" * 70)
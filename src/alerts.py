@@ -2,7 +2,7 @@
 Alerts Management - Real-time trading alerts and notifications"""
 import json
 import os
-from datetime import datetime
+from src import clock
 
 ALERTS_FILE = "data/alerts_history.json"
 
@@ -79,7 +79,7 @@ def save_alert_history(ticker, alert_type, value, message=""):
             history = []
     
     history.append({
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": clock.now().isoformat(),
         "ticker": ticker,
         "alert_type": alert_type,
         "value": value,
@@ -1,52 +1,138 @@
 """© 2025-2026 ELOADXFAMILY - Tous droits réservés
-Backtesting Engine - Historical strategy performance analysis"""
+Backtesting Engine - Historical strategy performance analysis
+
+Le coeur (run_backtest) travaille sur des arrays complets: l'état de position
+est déduit des signaux par propagation du dernier signal (np.maximum.accumulate
+sur les indices des signaux), puis rendements, courbe d'équité, drawdown,
+Sharpe et taux de réussite sont calculés en opérations NumPy. BacktestEngine
+reste disponible comme interface de compatibilité.
+"""
+import numpy as np
 import pandas as pd
+from src.trading_rules import RSI_OVERBOUGHT, RSI_OVERSOLD
+
+# Barres horaires par an (Sharpe annualisé)
+HOURLY_PERIODS = 24 * 365
+
+def rsi_signals(rsi, oversold=RSI_OVERSOLD, overbought=RSI_OVERBOUGHT):
+    """Signaux RSI: achat sous `oversold`, vente au-dessus de `overbought`"""
+    rsi = np.asarray(rsi, dtype=float)
+    return rsi < oversold, rsi > overbought
+
+def positions_from_signals(buy, sell):
+    """Position longue (1) ou neutre (0) après chaque barre
+
+    Un achat ouvre la position si elle est neutre, une vente la ferme si elle
+    est ouverte; les signaux répétés sont sans effet. À égalité l'achat gagne.
+    """
+    buy = np.asarray(buy, dtype=bool)
+    sell = np.asarray(sell, dtype=bool)
+    signal = np.where(buy, 1, np.where(sell, -1, 0))
+    # Indice du dernier signal vu à chaque barre (0 si aucun, signal[0] pouvant être nul)
+    last = np.maximum.accumulate(np.where(signal != 0, np.arange(len(signal)), 0))
+    return (signal[last] == 1).astype(np.int8)
+
+def run_backtest(prices, buy, sell, initial_balance=1000, fee=0.0, periods_per_year=HOURLY_PERIODS):
+    """Backtest long-only vectorisé
+
+    Args:
+        prices: Clôtures (array 1-D); entrées et sorties se font à la clôture du signal
+        buy: Signaux d'achat (booléens, même longueur que prices)
+        sell: Signaux de vente
+        initial_balance: Capital de départ
+        fee: Frais proportionnels par ordre (ex: 0.001 = 0.1%)
+        periods_per_year: Barres par an pour annualiser le Sharpe
+
+    Returns:
+        dict: arrays (position, returns, equity, drawdown, entries, exits,
+        trade_returns) et métriques (final_balance, total_profit,
+        profit_percent, total_trades, closed_trades, win_rate, max_drawdown,
+        sharpe)
+    """
+    prices = np.asarray(prices, dtype=float)
+    n = len(prices)
+    position = positions_from_signals(buy, sell)[:n]
+
+    # Rendement de la barre i: position détenue depuis la barre i-1
+    price_returns = np.zeros(n)
+    if n > 1:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price_returns[1:] = prices[1:] / prices[:-1] - 1
+        price_returns[~np.isfinite(price_returns)] = 0.0
+    held = np.concatenate(([0], position[:-1])) if n else position
+    changes = np.abs(np.diff(position, prepend=0))
+    growth = (1 + held * price_returns) * (1 - fee * changes)
+    returns = growth - 1
+    equity = initial_balance * np.cumprod(growth)
+    drawdown = equity / np.maximum.accumulate(equity) - 1 if n else np.zeros(0)
+
+    entries = np.flatnonzero(np.diff(position, prepend=0) == 1)
+    exits = np.flatnonzero(np.diff(position, prepend=0) == -1)
+    closed = len(exits)
+    trade_returns = prices[exits] / prices[entries[:closed]] * (1 - fee) ** 2 - 1
+
+    final_balance = float(equity[-1]) if n else float(initial_balance)
+    deviation = returns.std() if n else 0.0
+    return {
+        "position": position,
+        "returns": returns,
+        "equity": equity,
+        "drawdown": drawdown,
+        "entries": entries,
+        "exits": exits,
+        "trade_returns": trade_returns,
+        "final_balance": final_balance,
+        "total_profit": final_balance - initial_balance,
+        "profit_percent": (final_balance - initial_balance) / initial_balance * 100,
+        "total_trades": len(entries),
+        "closed_trades": closed,
+        "win_rate": float((trade_returns > 0).mean() * 100) if closed else 0.0,
+        "max_drawdown": float(drawdown.min() * 100) if n else 0.0,
+        "sharpe": float(returns.mean() / deviation * np.sqrt(periods_per_year)) if deviation > 0 else 0.0,
+    }
 
 class BacktestEngine:
-    def __init__(self, data, initial_balance=1000):
+    def __init__(self, data, initial_balance=1000, oversold=RSI_OVERSOLD, overbought=RSI_OVERBOUGHT):
         self.data = data
+        self.oversold = oversold
+        self.overbought = overbought
         self.balance = initial_balance
         self.initial_balance = initial_balance
         self.position = 0
         self.trades = []
         self.equity_curve = [initial_balance]
-    
+
     def buy_signal(self, rsi):
-        return rsi < 30
-    
+        return rsi < self.oversold
+
     def sell_signal(self, rsi):
-        return rsi > 70
-    
+        return rsi > self.overbought
+
     def run(self, rsi_values):
-        results = []
-        
-        for i, rsi in enumerate(rsi_values):
-            if self.balance <= 0:
-                break
-            
-            if self.buy_signal(rsi) and self.position == 0:
-                self.position = 1
-                entry_price = self.data['close'].iloc[i] if i < len(self.data) else 100
-                results.append({"type": "buy", "price": entry_price, "rsi": rsi})
-            
-            elif self.sell_signal(rsi) and self.position == 1:
-                self.position = 0
-                exit_price = self.data['close'].iloc[i] if i < len(self.data) else 100
-                results.append({"type": "sell", "price": exit_price, "rsi": rsi})
-            
-            self.equity_curve.append(self.balance)
-        
-        total_trades = len([t for t in results if t["type"] == "buy"])
-        win_rate = 0
-        if total_trades > 0:
-            win_rate = (len([t for t in results if t["type"] == "sell"]) / total_trades) * 100
-        
+        rsi = np.asarray(rsi_values, dtype=float)
+        # Les barres au-delà des données gardent le prix par défaut historique (100)
+        prices = np.full(len(rsi), 100.0)
+        closes = pd.to_numeric(self.data['close'], errors='coerce').to_numpy(dtype=float)[:len(rsi)]
+        prices[:len(closes)] = closes
+
+        result = run_backtest(prices, self.buy_signal(rsi), self.sell_signal(rsi), self.initial_balance)
+
+        events = sorted([(i, "buy") for i in result["entries"]] + [(i, "sell") for i in result["exits"]])
+        results = [{"type": kind, "price": prices[i], "rsi": rsi[i]} for i, kind in events]
+
+        self.trades = results
+        self.position = int(result["position"][-1]) if len(rsi) else 0
+        self.balance = result["final_balance"]
+        self.equity_curve = [self.initial_balance] + result["equity"].tolist()
+
         return {
             "trades": results,
             "final_balance": self.balance,
-            "total_profit": self.balance - self.initial_balance,
-            "profit_percent": ((self.balance - self.initial_balance) / self.initial_balance) * 100,
-            "total_trades": total_trades,
-            "win_rate": win_rate,
+            "total_profit": result["total_profit"],
+            "profit_percent": result["profit_percent"],
+            "total_trades": result["total_trades"],
+            "win_rate": result["win_rate"],
+            "max_drawdown": result["max_drawdown"],
+            "sharpe": result["sharpe"],
             "equity_curve": self.equity_curve
         }
@@ -1,19 +1,108 @@
 """© 2025-2026 ELOADXFAMILY - Tous droits réservés
-Cache Management - Efficient data caching with TTL support"""
-import json
+Cache Management - Efficient data caching with TTL support
+
+Two tiers: a bounded in-memory LRU (entry count + approximate byte budget,
+expired entries swept lazily) in front of a persistent backend.
+
+Backends (src/cache_backends.py), selected with CACHE_BACKEND:
+- file (default): `{key}.json` entry files in cache_dir, DataFrames and NumPy
+  arrays in a binary format next to them (see src/serializers.py)
+- sqlite: one WAL-mode database (CACHE_DB_PATH) shared by all CacheManager
+  instances and all worker processes. Memory entries are then only trusted
+  for memory_ttl seconds so writes and deletes from other instances show up."""
 import os
+import sys
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
+import numpy as np
+import pandas as pd
+from src.cache_backends import create_backend
+from src.serializers import default_serializers
+
+def estimate_size(value, _depth=0):
+    """Approximate memory footprint of a cached value in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    size = sys.getsizeof(value)
+    if _depth < 4:
+        if isinstance(value, dict):
+            size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items())
+        elif isinstance(value, (list, tuple, set)):
+            size += sum(estimate_size(v, _depth + 1) for v in value)
+    return size
+
 class CacheManager:
-    def __init__(self, cache_dir="data/.cache", default_ttl=300):
+    def __init__(self, cache_dir="data/.cache", default_ttl=300, max_entries=512,
+                 max_bytes=256 * 1024 * 1024, sweep_interval=60, serializers=None,
+                 backend=None, memory_ttl=None):
         self.cache_dir = cache_dir
+        self.serializers = serializers or default_serializers()
+        if backend is None or isinstance(backend, str):
+            backend = create_backend(cache_dir, self.serializers, name=backend)
+        self.backend = backend
+        if memory_ttl is None:
+            memory_ttl = float(os.getenv("CACHE_MEMORY_TTL", "5")) if backend.shared else None
+        self.memory_ttl = memory_ttl
         self.default_ttl = default_ttl
-        self.memory_cache = {}
-        os.makedirs(cache_dir, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self.memory_cache = OrderedDict()
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._last_sweep = time.time()
+        self._lock = threading.RLock()
+    
+    def _remember(self, key, cache_data):
+        """Insert an entry in the memory tier, evicting least recently used entries"""
+        cache_data["expiry_ts"] = datetime.fromisoformat(cache_data["expiry"]).timestamp()
+        cache_data["memory_until"] = cache_data["expiry_ts"]
+        if self.memory_ttl is not None:
+            cache_data["memory_until"] = min(cache_data["expiry_ts"], time.time() + self.memory_ttl)
+        cache_data["size"] = estimate_size(cache_data["value"])
+        with self._lock:
+            self._forget(key)
+            if cache_data["size"] > self.max_bytes:
+                # Too large for the memory tier: only the backend keeps it
+                return
+            self.memory_cache[key] = cache_data
+            self.memory_bytes += cache_data["size"]
+            while len(self.memory_cache) > self.max_entries or self.memory_bytes > self.max_bytes:
+                _, evicted = self.memory_cache.popitem(last=False)
+                self.memory_bytes -= evicted["size"]
+                self.evictions += 1
+    
+    def _forget(self, key):
+        entry = self.memory_cache.pop(key, None)
+        if entry is not None:
+            self.memory_bytes -= entry["size"]
+        return entry
     
-    def _get_cache_file(self, key):
-        return os.path.join(self.cache_dir, f"{key}.json")
+    def _maybe_sweep(self):
+        """Drop expired entries, at most once per sweep_interval"""
+        now = time.time()
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        with self._lock:
+            self._last_sweep = now
+            expired = [k for k, entry in self.memory_cache.items() if entry["memory_until"] <= now]
+            for key in expired:
+                self._forget(key)
+                self.expirations += 1
+        try:
+            self.backend.purge_expired()
+        except Exception:
+            pass
     
     def set(self, key, value, ttl=None, ttl_seconds=None):
         # Accept either ttl (seconds) or ttl_seconds for backwards compatibility
@@ -29,73 +118,93 @@ class CacheManager:
             "expiry": expiry.isoformat()
         }
         
-        self.memory_cache[key] = cache_data
+        self._maybe_sweep()
+        self._remember(key, dict(cache_data))
         
         try:
-            with open(self._get_cache_file(key), "w", encoding="utf-8") as f:
-                json.dump(cache_data, f)
-        except:
-            pass
-
-# Module-level instance for convenience
-
+            written = self.backend.write(key, cache_data)
+        except Exception:
+            written = False
+        if not written:
+            # Never leave an older value in the backend behind a newer one
+            self._safe_delete(key)
+    
     def get(self, key):
-        if key in self.memory_cache:
-            data = self.memory_cache[key]
-            if datetime.fromisoformat(data["expiry"]) > datetime.now():
-                return data["value"]
-            else:
-                del self.memory_cache[key]
+        self._maybe_sweep()
+        with self._lock:
+            data = self.memory_cache.get(key)
+            if data is not None:
+                if data["memory_until"] > time.time():
+                    self.memory_cache.move_to_end(key)
+                    self.hits += 1
+                    return data["value"]
+                self._forget(key)
+                self.expirations += 1
         
-        cache_file = self._get_cache_file(key)
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+        try:
+            data = self.backend.read(key)
+            if data is not None:
                 if datetime.fromisoformat(data["expiry"]) > datetime.now():
-                    self.memory_cache[key] = data
+                    self._remember(key, data)
+                    with self._lock:
+                        self.hits += 1
                     return data["value"]
                 else:
-                    os.remove(cache_file)
-            except:
-                pass
+                    self.backend.delete(key)
+        except:
+            pass
         
+        with self._lock:
+            self.misses += 1
         return None
     
     def clear(self):
-        self.memory_cache.clear()
-        for f in os.listdir(self.cache_dir):
-            try:
-                os.remove(os.path.join(self.cache_dir, f))
-            except:
-                pass
+        with self._lock:
+            self.memory_cache.clear()
+            self.memory_bytes = 0
+        try:
+            self.backend.clear()
+        except Exception:
+            pass
     
     def delete(self, key):
         """Delete a specific cache entry"""
         # Remove from memory cache
-        if key in self.memory_cache:
-            del self.memory_cache[key]
+        with self._lock:
+            self._forget(key)
         
-        # Remove from disk cache
-        cache_file = self._get_cache_file(key)
-        if os.path.exists(cache_file):
-            try:
-                os.remove(cache_file)
-            except:
-                pass
+        # Remove from the backend (all instances/processes when shared)
+        self._safe_delete(key)
+    
+    def _safe_delete(self, key):
+        try:
+            self.backend.delete(key)
+        except Exception:
+            pass
     
     def get_ttl_remaining(self, key):
-        if key in self.memory_cache:
-            expiry = datetime.fromisoformat(self.memory_cache[key]["expiry"])
-            remaining = (expiry - datetime.now()).total_seconds()
-            return max(0, remaining)
+        with self._lock:
+            if key in self.memory_cache:
+                remaining = self.memory_cache[key]["expiry_ts"] - time.time()
+                return max(0, remaining)
         return 0
     
     def get_stats(self):
-        return {
-            "memory_items": len(self.memory_cache),
-            "disk_items": len([f for f in os.listdir(self.cache_dir) if f.endswith(".json")])
-        }
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "memory_items": len(self.memory_cache),
+                "memory_bytes": self.memory_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "backend": type(self.backend).__name__,
+                "disk_items": self.backend.count()
+            }
 
 # Module-level instance for convenience
 cache_manager = CacheManager()
@@ -0,0 +1,191 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+Cache Backends - Persistent tier of CacheManager
+
+- FileBackend: one `{key}.json` entry file per key (plus a binary payload file
+  for DataFrames/arrays). Local to the machine, no cross-process coordination.
+- SQLiteBackend: a single SQLite database in WAL mode shared by every
+  CacheManager instance and every Streamlit worker process. Writes are
+  atomic (one INSERT OR REPLACE), expiries are indexed so expired rows are
+  purged with one DELETE.
+
+Select with CACHE_BACKEND=file|sqlite (and CACHE_DB_PATH for SQLite)."""
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from src.serializers import JsonSerializer
+
+class FileBackend:
+    shared = False
+
+    def __init__(self, cache_dir, serializers):
+        self.cache_dir = cache_dir
+        self.serializers = serializers
+        self._serializers_by_name = {s.name: s for s in serializers}
+        self._entry_serializer = JsonSerializer()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _get_cache_file(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _payload_extensions(self):
+        return {s.extension for s in self.serializers if s.name != "json"}
+
+    def _payload_files(self, key):
+        return [os.path.join(self.cache_dir, f"{key}{ext}") for ext in self._payload_extensions()]
+
+    def _entry_keys(self):
+        return [f[:-len(".json")] for f in os.listdir(self.cache_dir) if f.endswith(".json")]
+
+    def write(self, key, cache_data):
+        """Write an entry with the first serializer able to handle its value"""
+        value = cache_data["value"]
+        for serializer in self.serializers:
+            if not serializer.can_handle(value):
+                continue
+            try:
+                if serializer.name == "json":
+                    self._entry_serializer.dump(cache_data, self._get_cache_file(key))
+                    return True
+                payload = f"{key}{serializer.extension}"
+                serializer.dump(value, os.path.join(self.cache_dir, payload))
+                entry = {k: v for k, v in cache_data.items() if k != "value"}
+                entry.update({"format": serializer.name, "payload": payload})
+                self._entry_serializer.dump(entry, self._get_cache_file(key))
+                return True
+            except Exception:
+                continue
+        return False
+
+    def read(self, key):
+        """Return the stored entry dict (value, timestamp, expiry) or None"""
+        if not os.path.exists(self._get_cache_file(key)):
+            return None
+        data = self._entry_serializer.load(self._get_cache_file(key))
+        if "format" in data:
+            serializer = self._serializers_by_name[data["format"]]
+            data["value"] = serializer.load(os.path.join(self.cache_dir, data["payload"]))
+        return data
+
+    def delete(self, key):
+        for path in [self._get_cache_file(key)] + self._payload_files(key):
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except:
+                    pass
+
+    def clear(self):
+        # Only entry and payload files: cache_dir also holds other databases (SQLite cache, OHLCV store)
+        extensions = (".json",) + tuple(self._payload_extensions())
+        for f in os.listdir(self.cache_dir):
+            if f.endswith(extensions):
+                try:
+                    os.remove(os.path.join(self.cache_dir, f))
+                except:
+                    pass
+
+    def purge_expired(self):
+        """Delete entries whose expiry has passed, including keys never read again"""
+        now = datetime.now()
+        for key in self._entry_keys():
+            try:
+                entry = self._entry_serializer.load(self._get_cache_file(key))
+                expired = datetime.fromisoformat(entry["expiry"]) <= now
+            except Exception:
+                # Partial or foreign file: leave it alone
+                continue
+            if expired:
+                self.delete(key)
+
+    def count(self):
+        return len(self._entry_keys())
+
+class SQLiteBackend:
+    shared = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            key TEXT PRIMARY KEY,
+            format TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            timestamp TEXT NOT NULL,
+            expiry TEXT NOT NULL,
+            expiry_ts REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cache_entries_expiry ON cache_entries (expiry_ts);
+    """
+
+    def __init__(self, db_path, serializers, timeout=5.0):
+        self.db_path = db_path
+        self.serializers = serializers
+        self._serializers_by_name = {s.name: s for s in serializers}
+        self.timeout = timeout
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(self.SCHEMA)
+
+    def _connection(self):
+        # sqlite3 connections must not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def write(self, key, cache_data):
+        value = cache_data["value"]
+        expiry_ts = datetime.fromisoformat(cache_data["expiry"]).timestamp()
+        for serializer in self.serializers:
+            if not serializer.can_handle(value):
+                continue
+            try:
+                payload = serializer.dumps(value)
+            except Exception:
+                continue
+            self._connection().execute(
+                "INSERT OR REPLACE INTO cache_entries (key, format, payload, timestamp, expiry, expiry_ts) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, serializer.name, payload, cache_data["timestamp"], cache_data["expiry"], expiry_ts)
+            )
+            return True
+        return False
+
+    def read(self, key):
+        row = self._connection().execute(
+            "SELECT format, payload, timestamp, expiry FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        fmt, payload, timestamp, expiry = row
+        return {
+            "value": self._serializers_by_name[fmt].loads(payload),
+            "timestamp": timestamp,
+            "expiry": expiry
+        }
+
+    def delete(self, key):
+        self._connection().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connection().execute("DELETE FROM cache_entries")
+
+    def purge_expired(self):
+        self._connection().execute("DELETE FROM cache_entries WHERE expiry_ts <= ?", (time.time(),))
+
+    def count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+def create_backend(cache_dir, serializers, name=None, db_path=None):
+    """Build the backend selected by CACHE_BACKEND (default: file)"""
+    name = (name or os.getenv("CACHE_BACKEND", "file")).lower()
+    if name == "sqlite":
+        db_path = db_path or os.getenv("CACHE_DB_PATH", os.path.join(cache_dir, "cache.sqlite3"))
+        return SQLiteBackend(db_path, serializers)
+    return FileBackend(cache_dir, serializers)
@@ -0,0 +1,142 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+Candles - Agrégation des trades WebSocket en bougies OHLCV réelles
+
+Chaque (symbol, intervalle) dispose d'un tableau NumPy de capacité fixe
+(start, open, high, low, close, volume): un trade met à jour la bougie en
+cours ou en ouvre une nouvelle quand son horodatage change d'intervalle.
+Les intervalles sans trade ne produisent pas de bougie. Les trades arrivant
+après l'ouverture d'une bougie plus récente sont ignorés (comptés dans `late`).
+Les horodatages exposés sont en UTC naïf, comme l'historique CoinGecko.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+
+INTERVALS = {"1m": 60, "5m": 300, "1h": 3600}
+START, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+
+class CandleSeries:
+    """Bougies d'un symbol pour un intervalle, dans un buffer circulaire"""
+
+    def __init__(self, seconds, capacity):
+        self.seconds = seconds
+        self.capacity = capacity
+        self.bars = np.zeros((capacity, 6))
+        self.count = 0
+        self.head = -1
+        self.late = 0
+
+    def update(self, price, size, timestamp):
+        start = timestamp - timestamp % self.seconds
+        if self.count and start == self.bars[self.head, START]:
+            bar = self.bars[self.head]
+            bar[HIGH] = max(bar[HIGH], price)
+            bar[LOW] = min(bar[LOW], price)
+            bar[CLOSE] = price
+            bar[VOLUME] += size
+            return
+        if self.count and start < self.bars[self.head, START]:
+            self.late += 1
+            return
+        self.head = (self.head + 1) % self.capacity
+        self.bars[self.head] = (start, price, price, price, price, size)
+        self.count = min(self.count + 1, self.capacity)
+
+    def ordered(self, limit=None):
+        """Bougies en ordre chronologique (copie), les `limit` dernières si précisé"""
+        n = self.count if limit is None else min(limit, self.count)
+        index = (np.arange(self.head - n + 1, self.head + 1)) % self.capacity
+        return self.bars[index]
+
+class CandleAggregator:
+    """Bougies 1m/5m/1h de plusieurs symbols, alimentées trade par trade"""
+
+    def __init__(self, intervals=("1m", "5m", "1h"), capacity=1440):
+        """
+        Args:
+            intervals: Clés de INTERVALS à construire
+            capacity: Bougies conservées par (symbol, intervalle)
+        """
+        self.intervals = {name: INTERVALS[name] for name in intervals}
+        self.capacity = capacity
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def on_trade(self, symbol, price, size=0.0, timestamp=None):
+        """Intégrer un trade (timestamp en secondes epoch, défaut: maintenant)"""
+        if price <= 0:
+            return
+        timestamp = time.time() if timestamp is None else float(timestamp)
+        with self._lock:
+            series = self._series.get(symbol)
+            if series is None:
+                series = {name: CandleSeries(seconds, self.capacity) for name, seconds in self.intervals.items()}
+                self._series[symbol] = series
+            for candles in series.values():
+                candles.update(float(price), float(size), timestamp)
+
+    def symbols(self):
+        with self._lock:
+            return list(self._series)
+
+    def current(self, symbol, interval="1h"):
+        """Bougie en cours (dict avec timestamp UTC naïf) ou None"""
+        with self._lock:
+            series = self._series.get(symbol, {}).get(interval)
+            if series is None or series.count == 0:
+                return None
+            bar = series.bars[series.head].copy()
+        return {
+            "timestamp": datetime.fromtimestamp(bar[START], timezone.utc).replace(tzinfo=None),
+            "open": bar[OPEN],
+            "high": bar[HIGH],
+            "low": bar[LOW],
+            "close": bar[CLOSE],
+            "volume": bar[VOLUME]
+        }
+
+    def candles(self, symbol, interval="1h", limit=None):
+        """Bougies terminées et en cours, même format que get_historical_data"""
+        with self._lock:
+            series = self._series.get(symbol, {}).get(interval)
+            bars = series.ordered(limit) if series is not None else np.zeros((0, 6))
+        return pd.DataFrame({
+            "timestamp": pd.to_datetime(bars[:, START], unit="s"),
+            "open": bars[:, OPEN],
+            "high": bars[:, HIGH],
+            "low": bars[:, LOW],
+            "close": bars[:, CLOSE],
+            "volume": bars[:, VOLUME]
+        })
+
+def merge_live_candle(history, candle):
+    """Remplacer/compléter la bougie horaire en cours de l'historique par la bougie live
+
+    - Même heure que la dernière bougie: clôture live, high/low élargis
+    - Heure suivante: bougie live ajoutée à la fin (la plus ancienne retirée,
+      la fenêtre garde sa longueur)
+    - Sinon (historique décalé): historique inchangé
+
+    Returns:
+        Nouveau DataFrame (l'historique passé en argument n'est pas modifié)
+    """
+    if candle is None or history is None or len(history) == 0:
+        return history
+    hour = pd.Timestamp(candle["timestamp"]).floor("h")
+    last = pd.Timestamp(history["timestamp"].iloc[-1]).floor("h")
+    if last.tzinfo is not None or hour not in (last, last + pd.Timedelta(hours=1)):
+        return history
+    merged = history.copy()
+    merged["volume"] = merged["volume"].astype(float)
+    if hour == last:
+        i = merged.index[-1]
+        merged.loc[i, "close"] = candle["close"]
+        merged.loc[i, "high"] = max(merged.loc[i, "high"], candle["high"])
+        merged.loc[i, "low"] = min(merged.loc[i, "low"], candle["low"])
+        merged.loc[i, "volume"] = max(merged.loc[i, "volume"], candle["volume"])
+        return merged
+    row = {column: candle[column] for column in ("open", "high", "low", "close", "volume")}
+    row["timestamp"] = hour
+    return pd.concat([merged.iloc[1:], pd.DataFrame([row])], ignore_index=True)
@@ -0,0 +1,74 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+Clock - Horloge remplaçable pour le chemin temps réel
+
+Les modules du chemin live (data, alerts, price_arbiter) lisent l'heure via
+clock.now() / clock.time() au lieu de datetime.now() / time.time(). Par défaut
+l'horloge est celle du système; set_clock/use_clock la remplacent pour tout le
+processus (tests, scripts). Le moteur de replay, lui, passe sa SimulatedClock
+à ses propres composants (PriceArbiter(clock=...)) sans toucher à l'horloge
+globale.
+"""
+import threading
+import time as _time
+from contextlib import contextmanager
+from datetime import datetime
+
+class SystemClock:
+    """Heure du système"""
+
+    def time(self):
+        return _time.time()
+
+    def now(self):
+        return datetime.now()
+
+class SimulatedClock:
+    """Heure simulée, avancée explicitement (secondes epoch)"""
+
+    def __init__(self, start=0.0):
+        self._timestamp = float(start)
+        self._lock = threading.Lock()
+
+    def set(self, timestamp):
+        """Placer l'horloge à `timestamp` (le temps ne recule jamais)"""
+        with self._lock:
+            self._timestamp = max(self._timestamp, float(timestamp))
+
+    def advance(self, seconds):
+        with self._lock:
+            self._timestamp += seconds
+
+    def time(self):
+        return self._timestamp
+
+    def now(self):
+        return datetime.fromtimestamp(self._timestamp)
+
+_clock = SystemClock()
+
+def get_clock():
+    return _clock
+
+def set_clock(clock):
+    """Installer une horloge (None = horloge système), retourne la précédente"""
+    global _clock
+    previous = _clock
+    _clock = clock or SystemClock()
+    return previous
+
+@contextmanager
+def use_clock(clock):
+    """Utiliser `clock` le temps d'un bloc"""
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
+
+def time():
+    """Secondes epoch selon l'horloge courante"""
+    return _clock.time()
+
+def now():
+    """datetime local naïf selon l'horloge courante"""
+    return _clock.now()
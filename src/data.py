@@ -4,7 +4,7 @@ Module de données en temps réel et historiques
 
 Utilise APIs authentiques pour récupérer les données réelles:
 - CoinGecko API pour les cryptomonnaies (BTC, ETH, SOL)
-- WebSocket en temps réel (Binance, CoinCap) pour flux live
+- WebSocket en temps réel (Binance, Coinbase, CoinCap), source la plus fraîche retenue
 - exchangerate.host pour les paires de change (EUR, GBP, JPY, AUD)
 - metals.live pour les métaux précieux (Or/XAU)
 
@@ -12,130 +12,213 @@ Avec fallback sur données mock réalistes pour continuité de service.
 Cache optimisé: 24h pour prix, 1h pour données historiques
 """
 
-import requests
+import functools
+import threading
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from src import clock
 from src.cache import CacheManager
+from src.http_client import http_get
+from src.candles import merge_live_candle
+from src.ohlcv_store import ohlcv_store
+from src.price_arbiter import PriceArbiter
+from src.price_board import get_board_reader
+from src.mock_market import COINGECKO_IDS, CRYPTO_TICKERS, FOREX_TICKERS, base_price, mock_candles
 
 # Import WebSocket feeds
 try:
     from src.websocket_feeds import (
         get_binance_feed, 
         get_coincap_feed,
+        get_coinbase_feed,
         initialize_realtime_feeds
     )
     WEBSOCKET_AVAILABLE = True
 except:
     WEBSOCKET_AVAILABLE = False
 
+price_arbiter = PriceArbiter()
+
+def _feed_reader(get_feed, symbol):
+    """Source de l'arbitre: dernier tick d'un flux WebSocket avec sa latence"""
+    def read(ticker):
+        feed = get_feed()
+        tick = feed.get_price(symbol(ticker))
+        return dict(tick, latency=feed.latency.value) if tick else None
+    return read
+
+if WEBSOCKET_AVAILABLE:
+    price_arbiter.add_source("binance-websocket", _feed_reader(get_binance_feed, lambda t: f"{t}USDT"))
+    price_arbiter.add_source("coinbase-websocket", _feed_reader(get_coinbase_feed, lambda t: f"{t}-USD"))
+    price_arbiter.add_source("coincap-websocket", _feed_reader(get_coincap_feed, lambda t: COINGECKO_IDS[t]))
+
 cache = CacheManager()
 
+class SingleFlight:
+    """Regroupe les appels concurrents identiques: un seul appel amont par clé
+    
+    Les appelants qui arrivent pendant qu'un appel est en cours pour la même
+    clé attendent sa fin et partagent son résultat (ou son exception).
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self.calls = 0
+        self.executed = 0
+        self.deduplicated = 0
+    
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = {"done": threading.Event(), "result": None, "error": None}
+                self._in_flight[key] = flight
+                self.executed += 1
+            else:
+                self.deduplicated += 1
+        
+        if not leader:
+            flight["done"].wait()
+            if flight["error"] is not None:
+                raise flight["error"]
+            return flight["result"]
+        
+        try:
+            flight["result"] = fn(*args, **kwargs)
+            return flight["result"]
+        except BaseException as e:
+            flight["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight["done"].set()
+    
+    def get_stats(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executed": self.executed,
+                "deduplicated": self.deduplicated,
+                "in_flight": len(self._in_flight)
+            }
+
+upstream_flights = SingleFlight()
+
+def single_flight(key):
+    """Décorateur: les appels concurrents avec la même clé partagent un seul appel amont
+    
+    Args:
+        key: Fonction (mêmes arguments que la fonction décorée) -> clé de regroupement
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return upstream_flights.do(key(*args, **kwargs), fn, *args, **kwargs)
+        return wrapper
+    return decorator
+
+def get_single_flight_stats():
+    """Métriques de regroupement des appels amont (appels, exécutés, dédupliqués)"""
+    return upstream_flights.get_stats()
+
+# Âge maximal (secondes) de l'historique crypto stocké avant de redemander la fin manquante
+HISTORY_REFRESH = 3600
+
+# Jours redemandés au plus en bougies 30 minutes (granularité CoinGecko OHLC jusqu'à 2 jours)
+INTRADAY_DAYS = 2
+
+# Délai total (secondes) accordé à get_live_price_batch avant repli sur les prix par défaut
+BATCH_DEADLINE = 8.0
+
 def get_live_price(ticker):
     cached = cache.get(f"price_{ticker}")
     if cached:
         return cached
     
     # All cryptos use CoinGecko
-    if ticker in ["BTC", "ETH", "SOL", "ADA", "XRP", "DOT"]:
+    if ticker in CRYPTO_TICKERS:
         return get_crypto_price(ticker)
-    elif ticker in ["EUR", "GBP", "JPY", "AUD"]:
+    elif ticker in FOREX_TICKERS:
         return get_forex_price(ticker)
     elif ticker == "XAU":
         return get_gold_price()
     
     return generate_mock_data(ticker, 1).iloc[-1].to_dict()
 
-def get_crypto_price(ticker):
-    coins = {
-        "BTC": "bitcoin",
-        "ETH": "ethereum",
-        "SOL": "solana",
-        "ADA": "cardano",
-        "XRP": "ripple",
-        "DOT": "polkadot"
-    }
-    if ticker not in coins:
-        return generate_mock_data(ticker, 1).iloc[-1].to_dict()
-    
-    # PRIORITY 1: Try WebSocket feeds (fastest, most real-time)
-    if WEBSOCKET_AVAILABLE:
-        try:
-            # Try Binance WebSocket
-            binance = get_binance_feed()
-            binance_symbol = f"{ticker}USDT"
-            binance_price = binance.get_price(binance_symbol)
-            if binance_price and binance_price.get('price', 0) > 0:
-                return {
-                    "ticker": ticker,
-                    "price": float(binance_price['price']),
-                    "volume": float(binance_price.get('volume', 0)),
-                    "bid": float(binance_price.get('bid', 0)),
-                    "ask": float(binance_price.get('ask', 0)),
-                    "timestamp": datetime.now(),
-                    "source": "binance-websocket"
-                }
-        except:
-            pass
-        
-        try:
-            # Try CoinCap WebSocket
-            coincap = get_coincap_feed()
-            coincap_price = coincap.get_price(coins[ticker])
-            if coincap_price and coincap_price.get('price', 0) > 0:
-                return {
-                    "ticker": ticker,
-                    "price": float(coincap_price['price']),
-                    "volume": 0,
-                    "timestamp": datetime.now(),
-                    "source": "coincap-websocket"
-                }
-        except:
-            pass
+def _board_crypto_price(ticker):
+    """Prix publié par le processus d'ingestion (mémoire partagée), None si absent ou périmé"""
+    board = get_board_reader()
+    if board is None:
+        return None
+    quote = board.read(ticker, max_age=price_arbiter.staleness_budget)
+    if quote:
+        quote["timestamp"] = datetime.fromtimestamp(quote["updated_at"])
+    return quote
+
+def _websocket_crypto_price(ticker):
+    """Prix arbitré des flux WebSocket, None si tous les flux sont périmés"""
+    quote = _board_crypto_price(ticker)
+    if quote:
+        return quote
+    if not WEBSOCKET_AVAILABLE:
+        return None
+    return price_arbiter.select(ticker)
+
+@single_flight(lambda tickers, timeout=10: f"coingecko_price_{','.join(tickers)}")
+def _fetch_coingecko_prices(tickers, timeout=10):
+    """Une seule requête CoinGecko simple/price pour plusieurs cryptos
     
-    # PRIORITY 2: CoinGecko REST API - REAL PRICES with proper caching
+    Returns:
+        Dict ticker -> prix (seuls les tickers avec un prix valide sont présents)
+    """
+    ids = ",".join(COINGECKO_IDS[t] for t in tickers)
+    url = f"https://api.coingecko.com/api/v3/simple/price?ids={ids}&vs_currencies=usd&include_market_cap=true&include_24hr_vol=true&include_24hr_change=true&include_last_updated_at=true"
+    results = {}
     try:
-        url = f"https://api.coingecko.com/api/v3/simple/price?ids={coins[ticker]}&vs_currencies=usd&include_market_cap=true&include_24hr_vol=true&include_24hr_change=true"
-        response = requests.get(url, timeout=10)
+        started = clock.time()
+        response = http_get(url, timeout=timeout)
+        now = clock.time()
+        price_arbiter.record_latency("coingecko-api", now - started)
         if response.status_code == 200:
             data = response.json()
-            coin_data = data.get(coins[ticker], {})
-            price = coin_data.get("usd")
-            if price and isinstance(price, (int, float)) and price > 0:
-                result = {
-                    "ticker": ticker,
-                    "price": float(price),
-                    "volume": float(coin_data.get("usd_24h_vol", 0) or 0),
-                    "market_cap": float(coin_data.get("usd_market_cap", 0) or 0),
-                    "change_24h": float(coin_data.get("usd_24h_change", 0) or 0),
-                    "timestamp": datetime.now(),
-                    "source": "coingecko-api"
-                }
-                # No cache for live prices - always fresh from API
-                return result
-    except Exception as e:
+            for ticker in tickers:
+                coin_data = data.get(COINGECKO_IDS[ticker], {})
+                price = coin_data.get("usd")
+                updated_at = coin_data.get("last_updated_at") or now
+                if price and isinstance(price, (int, float)) and price > 0:
+                    results[ticker] = {
+                        "ticker": ticker,
+                        "price": float(price),
+                        "volume": float(coin_data.get("usd_24h_vol", 0) or 0),
+                        "market_cap": float(coin_data.get("usd_market_cap", 0) or 0),
+                        "change_24h": float(coin_data.get("usd_24h_change", 0) or 0),
+                        "timestamp": clock.now(),
+                        "source": "coingecko-api",
+                        "age": max(0.0, now - updated_at),
+                        "latency": price_arbiter.latency("coingecko-api")
+                    }
+    except Exception:
         pass
-    
-    # PRIORITY 3: Use realistic fallback prices if API fails
-    # These are realistic prices based on current market (February 2026)
-    fallback_prices = {
-        "BTC": 74000,
-        "ETH": 2600,
-        "SOL": 195,
-        "ADA": 0.98,
-        "XRP": 2.45,
-        "DOT": 8.50
-    }
-    
-    if ticker in fallback_prices:
+    return results
+
+def _crypto_fallback_price(ticker):
+    # Realistic fallback prices if API fails (registry base prices)
+    if ticker in COINGECKO_IDS:
         return {
             "ticker": ticker,
-            "price": fallback_prices[ticker],
+            "price": base_price(ticker),
             "volume": 0,
             "market_cap": 0,
             "change_24h": 0,
-            "timestamp": datetime.now(),
-            "source": "fallback-cache"
+            "timestamp": clock.now(),
+            "source": "fallback-cache",
+            "age": None
         }
     
     # Last resort: minimal mock data
@@ -145,38 +228,38 @@ def get_crypto_price(ticker):
         "volume": 0,
         "market_cap": 0,
         "change_24h": 0,
-        "timestamp": datetime.now(),
+        "timestamp": clock.now(),
         "error": "Price data unavailable"
     }
 
+def get_crypto_price(ticker):
+    if ticker not in COINGECKO_IDS:
+        return generate_mock_data(ticker, 1).iloc[-1].to_dict()
+    
+    # PRIORITY 1: Freshest WebSocket feed within the staleness budget
+    result = _websocket_crypto_price(ticker)
+    if result:
+        return result
+    
+    # PRIORITY 2: CoinGecko REST API when every stream is stale (no cache for live prices)
+    result = _fetch_coingecko_prices([ticker]).get(ticker)
+    if result:
+        return result
+    
+    # PRIORITY 3: Use realistic fallback prices if API fails
+    return _crypto_fallback_price(ticker)
+
+@single_flight(lambda ticker: f"forex_price_{ticker}")
 def get_forex_price(ticker):
-    # EUR vs USD 
+    result = _fetch_forex_rates([ticker]).get(ticker)
+    if result:
+        return result
+    
+    # EUR vs USD: fallback to alternative source
     if ticker == "EUR":
-        # Try multiple sources for better reliability
-        try:
-            url = "https://api.exchangerate.host/latest?base=USD&symbols=EUR"
-            response = requests.get(url, timeout=3)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("success") and "rates" in data:
-                    rate = data.get("rates", {}).get("EUR")
-                    if rate and isinstance(rate, (int, float)) and rate > 0:
-                        result = {
-                            "ticker": "EUR",
-                            "price": float(rate),
-                            "volume": 0,
-                            "market_cap": 0,
-                            "timestamp": datetime.now()
-                        }
-                        cache.set(f"price_EUR", result, ttl=7200)  # 2h cache
-                        return result
-        except:
-            pass
-        
-        # Fallback to alternative source
         try:
             url = "https://api.coingecko.com/api/v3/simple/price?ids=ethereum&vs_currencies=eur&include_market_cap=false"
-            response = requests.get(url, timeout=3)
+            response = http_get(url, timeout=3)
             if response.status_code == 200:
                 data = response.json()
                 eth_eur = data.get("ethereum", {}).get("eur")
@@ -189,61 +272,66 @@ def get_forex_price(ticker):
                             "price": float(rate),
                             "volume": 0,
                             "market_cap": 0,
-                            "timestamp": datetime.now()
+                            "timestamp": clock.now()
                         }
                         cache.set(f"price_EUR", result, ttl=7200)
                         return result
         except:
             pass
-    else:
-        try:
-            url = f"https://api.exchangerate.host/latest?base=USD&symbols={ticker}"
-            response = requests.get(url, timeout=3)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("success") and "rates" in data:
+    
+    return _forex_fallback_price(ticker)
+
+@single_flight(lambda tickers, timeout=3: f"forex_rates_{','.join(tickers)}")
+def _fetch_forex_rates(tickers, timeout=3):
+    """Une seule requête exchangerate.host pour plusieurs devises (symbols=EUR,GBP,...)
+    
+    Returns:
+        Dict ticker -> prix, mis en cache 2h comme get_forex_price
+    """
+    results = {}
+    try:
+        url = f"https://api.exchangerate.host/latest?base=USD&symbols={','.join(tickers)}"
+        response = http_get(url, timeout=timeout)
+        if response.status_code == 200:
+            data = response.json()
+            if data.get("success") and "rates" in data:
+                for ticker in tickers:
                     rate = data.get("rates", {}).get(ticker)
                     if rate and isinstance(rate, (int, float)) and rate > 0:
-                        result = {
+                        results[ticker] = {
                             "ticker": ticker,
                             "price": float(rate),
                             "volume": 0,
                             "market_cap": 0,
-                            "timestamp": datetime.now()
+                            "timestamp": clock.now()
                         }
-                        cache.set(f"price_{ticker}", result, ttl=7200)  # 2h cache
-                        return result
-        except Exception as e:
-            pass
-    
-    # Fallback to realistic mock data
-    mock_forex_prices = {
-        "EUR": 1.08,
-        "GBP": 1.27,
-        "JPY": 0.0067,
-        "AUD": 0.65
-    }
-    base_price = mock_forex_prices.get(ticker, 1.0)
-    variation = base_price * (np.random.uniform(-0.01, 0.01))
-    price = base_price + variation
+                        cache.set(f"price_{ticker}", results[ticker], ttl=7200)  # 2h cache
+    except Exception:
+        pass
+    return results
+
+def _forex_fallback_price(ticker):
+    # Fallback to realistic mock data: current hour of the reproducible mock series
+    price = mock_candles(ticker, 1, profile="hourly")["close"].iloc[-1]
     
     result = {
         "ticker": ticker,
         "price": float(price),
         "volume": 0,
         "market_cap": 0,
-        "timestamp": datetime.now()
+        "timestamp": clock.now()
     }
     cache.set(f"price_{ticker}", result, ttl=7200)  # 2h cache
     return result
 
+@single_flight(lambda: "gold_price")
 def get_gold_price():
     """Get real gold price from multiple reliable sources - always return valid price"""
     try:
         # Try API 1: metals.live (très fiable et simple)
         try:
             url = "https://api.metals.live/v1/spot/gold"
-            response = requests.get(url, timeout=5)
+            response = http_get(url, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 if isinstance(data, dict) and "price" in data:
@@ -254,7 +342,7 @@ def get_gold_price():
                             "price": price,
                             "volume": 0,
                             "market_cap": 0,
-                            "timestamp": datetime.now()
+                            "timestamp": clock.now()
                         }
                         cache.set("price_XAU", result, ttl=1800)  # 30min cache
                         return result
@@ -264,7 +352,7 @@ def get_gold_price():
         # Try API 2: exchangerate.host (fallback fiable)
         try:
             url = "https://api.exchangerate.host/latest?base=XAU&symbols=USD"
-            response = requests.get(url, timeout=5)
+            response = http_get(url, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 if data.get("success") and data.get("rates") and "USD" in data.get("rates", {}):
@@ -275,7 +363,7 @@ def get_gold_price():
                             "price": price,
                             "volume": 0,
                             "market_cap": 0,
-                            "timestamp": datetime.now()
+                            "timestamp": clock.now()
                         }
                         cache.set("price_XAU", result, ttl=1800)
                         return result
@@ -285,7 +373,7 @@ def get_gold_price():
         # Try API 3: QuandlAPI style endpoint
         try:
             url = "https://www.metals.live/api/spot/gold"
-            response = requests.get(url, timeout=5)
+            response = http_get(url, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 if "xau" in data or "price" in data:
@@ -296,7 +384,7 @@ def get_gold_price():
                             "price": price,
                             "volume": 0,
                             "market_cap": 0,
-                            "timestamp": datetime.now()
+                            "timestamp": clock.now()
                         }
                         cache.set("price_XAU", result, ttl=1800)
                         return result
@@ -306,6 +394,9 @@ def get_gold_price():
     except:
         pass
     
+    return _gold_fallback_price()
+
+def _gold_fallback_price():
     # Fallback: Use realistic fixed price based on current market (gold typically $2000-$2500/oz)
     # This ensures the user always sees a price instead of N/A
     default_gold_price = 2350.50  # Realistic current gold price
@@ -314,49 +405,23 @@ def get_gold_price():
         "price": default_gold_price,
         "volume": 0,
         "market_cap": 0,
-        "timestamp": datetime.now()
+        "timestamp": clock.now()
     }
     cache.set("price_XAU", result, ttl=600)
     return result
 
-def generate_mock_data(ticker, days=1, hours=None):
+def generate_mock_data(ticker, days=1, hours=None, seed=None):
     """Generate mock candlestick data SYNCHRONIZED with live price.
-    Accepts either 'days' or 'hours' for backward compatibility with older tests that pass hours=.."""
-    
-    base_prices = {
-        "BTC": 74000,
-        "ETH": 2600,
-        "SOL": 195,
-        "ADA": 0.98,
-        "XRP": 2.45,
-        "DOT": 8.50,
-        "EUR": 1.08,
-        "GBP": 1.27,
-        "JPY": 0.0067,
-        "AUD": 0.66,
-        "XAU": 2350
-    }
-    
-    # Use base price (don't try to fetch live price here to avoid recursion)
-    base_price = base_prices.get(ticker, 100)
+    Accepts either 'days' or 'hours' for backward compatibility with older tests that pass hours=..
+    Deterministic for a given (ticker, length, seed, current hour), see src/mock_market.py"""
     
+    # Use registry base price (don't try to fetch live price here to avoid recursion)
     if hours is not None:
         num_candles = int(hours)
     else:
         num_candles = int(days * 24)
-    dates = pd.date_range(end=datetime.now(), periods=num_candles, freq="h")
-    
-    returns = np.random.normal(0.0001, 0.01, num_candles)
-    prices = base_price * np.exp(np.cumsum(returns))
-    
-    data = pd.DataFrame({
-        "timestamp": dates,
-        "open": prices * (1 + np.random.normal(0, 0.001, num_candles)),
-        "high": prices * (1 + abs(np.random.normal(0, 0.005, num_candles))),
-        "low": prices * (1 - abs(np.random.normal(0, 0.005, num_candles))),
-        "close": prices,
-        "volume": np.random.randint(1000000, 10000000, num_candles)
-    })
+    
+    data = mock_candles(ticker, num_candles, profile="default", seed=seed)
     # Provide backward-compatible capitalised OHLCV column names
     data["Open"] = data["open"]
     data["High"] = data["high"]
@@ -367,42 +432,13 @@ def generate_mock_data(ticker, days=1, hours=None):
     return data
 
 
-def generate_and_sync_mock_data(ticker, days):
+def generate_and_sync_mock_data(ticker, days, seed=None):
     """Generate mock data and SYNCHRONIZE with live price
     This is used when APIs are unavailable
     Generates HOURLY candles (24 per day) for consistent 1-day view"""
     
-    base_prices = {
-        "BTC": 74000,
-        "ETH": 2600,
-        "SOL": 195,
-        "ADA": 0.98,
-        "XRP": 2.45,
-        "DOT": 8.50,
-        "EUR": 1.08,
-        "GBP": 1.27,
-        "JPY": 0.0067,
-        "AUD": 0.66,
-        "XAU": 2350
-    }
-    
-    base_price = base_prices.get(ticker, 100)
-    # Generate HOURLY candles: days * 24 hours per day
-    num_candles = days * 24
-    dates = pd.date_range(end=datetime.now(), periods=num_candles, freq="h")
-    
-    # Generate realistic hourly returns
-    returns = np.random.normal(0.00001, 0.002, num_candles)
-    prices = base_price * np.exp(np.cumsum(returns))
-    
-    data = pd.DataFrame({
-        "timestamp": dates,
-        "open": prices * (1 + np.random.normal(0, 0.0005, num_candles)),
-        "high": prices * (1 + abs(np.random.normal(0, 0.002, num_candles))),
-        "low": prices * (1 - abs(np.random.normal(0, 0.002, num_candles))),
-        "close": prices,
-        "volume": np.random.randint(100000, 1000000, num_candles)
-    })
+    # Reproducible hourly random walk from the registry base price
+    data = mock_candles(ticker, days * 24, profile="hourly", seed=seed)
     
     # CRITICAL: Try to get live price for sync (but don't recurse)
     # If APIs fail, keep base price (will be updated when get_historical_data syncs with live price)
@@ -415,13 +451,13 @@ def generate_and_sync_mock_data(ticker, days):
                 live_price = live_data.get('price', 0) if isinstance(live_data, dict) else live_data
             except:
                 pass
-        elif ticker in ["EUR", "GBP", "JPY", "AUD"]:
+        elif ticker in FOREX_TICKERS:
             try:
                 forex_data = get_forex_price(ticker)
                 live_price = forex_data.get('price', 0) if isinstance(forex_data, dict) else forex_data
             except:
                 pass
-        elif ticker in ["BTC", "ETH", "SOL", "ADA", "XRP", "DOT"]:
+        elif ticker in CRYPTO_TICKERS:
             # Try WebSocket first, skip CoinGecko to avoid recursion
             try:
                 if WEBSOCKET_AVAILABLE:
@@ -436,12 +472,8 @@ def generate_and_sync_mock_data(ticker, days):
                 pass
         
         # Adjust all prices to sync last close = live price
-        if live_price and live_price > 0 and len(data) > 0:
-            price_adjustment = live_price - data.iloc[-1]['close']
-            data['close'] = data['close'] + price_adjustment
-            data['open'] = data['open'] + price_adjustment
-            data['high'] = data['high'] + price_adjustment
-            data['low'] = data['low'] + price_adjustment
+        if live_price and live_price > 0:
+            _sync_last_close(data, live_price)
     except:
         # If sync fails, just keep the base price data
         pass
@@ -449,21 +481,71 @@ def generate_and_sync_mock_data(ticker, days):
     return data
 
 
+def _cache_history(ticker, days, data, ttl, shared=True):
+    """Mettre en cache une fenêtre d'historique et l'inscrire dans l'index du ticker
+    
+    Seules les fenêtres construites sur des données réelles (shared=True) sont
+    indexées, donc découpables en fenêtres plus courtes; un repli mock n'est
+    servi que pour sa propre durée.
+    """
+    cache.set(f"history_{ticker}_{days}", data, ttl=ttl)
+    windows = set(cache.get(f"history_windows_{ticker}") or [])
+    if shared:
+        windows.add(days)
+    elif days in windows:
+        windows.discard(days)
+    else:
+        return
+    cache.set(f"history_windows_{ticker}", sorted(windows), ttl=3600)
+
+def _cached_history(ticker, days):
+    """Fenêtre `days` depuis le cache, dérivée si besoin d'une fenêtre réelle plus longue
+    
+    Une fenêtre de 90 jours répond aux demandes de 30 et 1 jour: les days*24
+    dernières bougies sont une tranche (sans copie avec le copy-on-write de pandas).
+    """
+    cached = cache.get(f"history_{ticker}_{days}")
+    if cached is not None:
+        return cached
+    for window in cache.get(f"history_windows_{ticker}") or []:
+        if window <= days:
+            continue
+        longer = cache.get(f"history_{ticker}_{window}")
+        if longer is not None:
+            return longer.tail(days * 24).reset_index(drop=True)
+    return None
+
+def prefetch_history(tickers, days_list, max_workers=8):
+    """Charger en parallèle, pour chaque ticker pas encore en cache, la plus longue fenêtre demandée
+    
+    Les fenêtres plus courtes demandées ensuite dans le même rendu sont servies
+    par tranche de celle-ci quand elle vient de données réelles (voir _cached_history).
+    """
+    if not days_list:
+        return {}
+    longest = max(days_list)
+    tickers = [t for t in dict.fromkeys(tickers) if _cached_history(t, longest) is None]
+    if not tickers:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as executor:
+        frames = executor.map(lambda ticker: get_historical_data(ticker, days=longest), tickers)
+        return dict(zip(tickers, frames))
+
 def get_historical_data(ticker, days=90):
     """Fetch real data for all assets: crypto from CoinGecko, forex from exchangerate.host, gold from goldprice
     Returns hourly candles (24 per day)"""
-    cached = cache.get(f"history_{ticker}_{days}")
+    cached = _cached_history(ticker, days)
     if cached is not None:
-        return cached
+        return _with_live_candle(ticker, cached)
     
     # PRIORITY: Use reliable mock data with live price sync (more reliable than inconsistent APIs)
     # Only try real OHLC for assets where API is reliable
     
     # Try real OHLC data for crypto from CoinGecko (but only if highly reliable)
-    if ticker in ["BTC", "ETH", "SOL", "ADA", "XRP", "DOT"]:
+    if ticker in CRYPTO_TICKERS:
         try:
-            ohlc_data = fetch_coingecko_ohlc(ticker, days)
-            if not ohlc_data.empty:
+            ohlc_data = get_stored_crypto_history(ticker, days)
+            if ohlc_data is not None:
                 # Limit to only the last (days * 24) hours - CRITICAL for consistent display
                 hours_to_keep = days * 24
                 if len(ohlc_data) > hours_to_keep:
@@ -493,13 +575,13 @@ def get_historical_data(ticker, days=90):
                     except:
                         pass  # Keep original data if sync fails
                     
-                    cache.set(f"history_{ticker}_{days}", ohlc_data, ttl=3600)  # 1h cache for real data
-                    return ohlc_data
+                    _cache_history(ticker, days, ohlc_data, ttl=3600)  # 1h cache for real data
+                    return _with_live_candle(ticker, ohlc_data)
         except Exception as e:
             pass
     
     # Try real data for forex from exchangerate.host (tends to be more reliable than crypto)
-    if ticker in ["EUR", "GBP", "JPY", "AUD"]:
+    if ticker in FOREX_TICKERS:
         try:
             forex_data = fetch_forex_historical(ticker, days)
             if not forex_data.empty:
@@ -540,7 +622,7 @@ def get_historical_data(ticker, days=90):
                     if (forex_data['close'] > 0).all() and (forex_data['open'] > 0).all():
                         # Cleanup columns - keep only lowercase OHLCV
                         forex_data = forex_data[['timestamp', 'open', 'high', 'low', 'close', 'volume']].copy()
-                        cache.set(f"history_{ticker}_{days}", forex_data, ttl=3600)
+                        _cache_history(ticker, days, forex_data, ttl=3600)
                         return forex_data
         except Exception as e:
             pass
@@ -572,7 +654,7 @@ def get_historical_data(ticker, days=90):
                 except:
                     pass
                 
-                cache.set(f"history_{ticker}_{days}", gold_data, ttl=3600)
+                _cache_history(ticker, days, gold_data, ttl=3600)
                 return gold_data
         except Exception as e:
             pass
@@ -582,39 +664,22 @@ def get_historical_data(ticker, days=90):
     data = generate_and_sync_mock_data(ticker, days)
     # Cleanup columns - keep only lowercase OHLCV
     data = data[['timestamp', 'open', 'high', 'low', 'close', 'volume']].copy()
-    cache.set(f"history_{ticker}_{days}", data, ttl=600)
-    return data
+    _cache_history(ticker, days, data, ttl=600, shared=False)
+    return _with_live_candle(ticker, data)
 
-def fetch_coingecko_ohlc(ticker, days):
-    """Fetch real OHLC data from CoinGecko with SYNC to live price
-    Converts daily data to HOURLY candles for consistent 24-candle display
-    Falls back to synchronized mock data if API unavailable
-    Supports: BTC, ETH, SOL, ADA, XRP, DOT"""
-    
-    coins = {
-        "BTC": "bitcoin",
-        "ETH": "ethereum",
-        "SOL": "solana",
-        "ADA": "cardano",
-        "XRP": "ripple",
-        "DOT": "polkadot"
-    }
-    
-    if ticker not in coins:
-        # Return fallback mock data synchronized with live price
-        return generate_and_sync_mock_data(ticker, days)
-    
+def _fetch_coingecko_ohlc(ticker, days):
+    """OHLC CoinGecko brut validé (volume simulé), None si indisponible"""
     try:
-        # CoinGecko OHLC endpoint (daily data)
-        url = f"https://api.coingecko.com/api/v3/coins/{coins[ticker]}/ohlc?vs_currency=usd&days={days}"
-        response = requests.get(url, timeout=5)
+        # CoinGecko OHLC endpoint (bougies de 30 minutes jusqu'à 2 jours, plus larges au-delà)
+        url = f"https://api.coingecko.com/api/v3/coins/{COINGECKO_IDS[ticker]}/ohlc?vs_currency=usd&days={days}"
+        response = http_get(url, timeout=5)
         
         if response.status_code == 200:
             ohlc_list = response.json()
             # CRITICAL: CoinGecko might return less data than requested
             # Require at least (days * 0.9) worth of daily data points
             min_required_days = int(days * 0.9)
-            if isinstance(ohlc_list, list) and len(ohlc_list) >= min_required_days:
+            if isinstance(ohlc_list, list) and len(ohlc_list) >= max(min_required_days, 1):
                 df = pd.DataFrame(ohlc_list, columns=['timestamp', 'open', 'high', 'low', 'close'])
                 # Convert milliseconds to datetime
                 df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
@@ -623,147 +688,213 @@ def fetch_coingecko_ohlc(ticker, days):
                 
                 # CRITICAL VALIDATION: Check if data looks reasonable
                 last_price = df.iloc[-1]['close']
-                first_price = df.iloc[0]['close']
                 
-                # Use expected base prices for validation instead of calling API again
+                # Use registry base prices for validation instead of calling API again
                 # (API might also be slow or return old data)
-                expected_prices = {
-                    "BTC": 74000,
-                    "ETH": 2600,
-                    "SOL": 195,
-                    "ADA": 0.98,
-                    "XRP": 2.45,
-                    "DOT": 8.50
-                }
-                
-                expected_price = expected_prices.get(ticker, 100)
+                expected_price = base_price(ticker)
                 
                 # STRICT VALIDATION: Reject data that's too far from expected price
                 # (CoinGecko sometimes returns old data - we want recent data only)
                 price_diff_pct = abs(expected_price - last_price) / expected_price * 100
                 
                 # Reject if data is >100% different (completely unrealistic)
-                if price_diff_pct > 100:
-                    # Data is too far from expected - probably old or corrupted
-                    pass
-                else:
-                    # Data looks reasonable, use it
-                    # Convert to hourly directly (data is reasonably recent)
-                    hourly_data = convert_daily_to_hourly(df)
-                    # Sync to current live price will be done in get_historical_data
-                    return hourly_data
+                if price_diff_pct <= 100:
+                    return df
     except Exception as e:
         pass
+    return None
+
+def _hourly_candles(df):
+    """Agréger des points CoinGecko (timestamp = fin de période) en bougies horaires passées
+    
+    L'heure H regroupe les points de ]H, H+1h]; aucune bougie postérieure à
+    l'heure courante (UTC) n'est gardée.
+    """
+    hourly = df.set_index('timestamp').resample('h', closed='right', label='left').agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    ).dropna().reset_index()
+    return hourly[hourly['timestamp'] <= pd.Timestamp(clock.time(), unit='s')].reset_index(drop=True)
+
+def _fetch_coingecko_hourly(ticker, days):
+    """Bougies horaires réelles depuis les prix horaires de CoinGecko (market_chart), None si indisponibles
+    
+    L'OHLC CoinGecko passe à des bougies de 4 heures au-delà de 2 jours (4 jours
+    au-delà de 30): seul market_chart donne un point par heure jusqu'à 90 jours.
+    Chaque bougie s'ouvre sur la clôture de la précédente.
+    """
+    try:
+        url = f"https://api.coingecko.com/api/v3/coins/{COINGECKO_IDS[ticker]}/market_chart?vs_currency=usd&days={min(days, 90)}"
+        response = http_get(url, timeout=5)
+        if response.status_code != 200:
+            return None
+        prices = response.json().get('prices')
+        if not isinstance(prices, list) or len(prices) < int(days * 24 * 0.9):
+            return None
+        points = pd.DataFrame(prices, columns=['timestamp', 'close'])
+        points['timestamp'] = pd.to_datetime(points['timestamp'], unit='ms')
+        points['open'] = points['high'] = points['low'] = points['close']
+        # Mock volume, comme pour l'OHLC (market_chart ne donne que le volume 24h glissant)
+        points['volume'] = points['close'] * np.random.uniform(0.5, 1.5, len(points))
+        hourly = _hourly_candles(points)
+        if hourly.empty:
+            return None
+        hourly['open'] = hourly['close'].shift(1).fillna(hourly['open'])
+        hourly['high'] = hourly[['high', 'open']].max(axis=1)
+        hourly['low'] = hourly[['low', 'open']].min(axis=1)
+        
+        # Same sanity check as the OHLC endpoint: reject data >100% away from the registry price
+        expected_price = base_price(ticker)
+        if abs(expected_price - hourly['close'].iloc[-1]) / expected_price * 100 <= 100:
+            return hourly
+    except Exception:
+        pass
+    return None
+
+def _fetch_coingecko_intraday(ticker, days=INTRADAY_DAYS):
+    """Bougies horaires réelles agrégées depuis l'OHLC 30 minutes de CoinGecko (days <= INTRADAY_DAYS)"""
+    df = _fetch_coingecko_ohlc(ticker, min(days, INTRADAY_DAYS))
+    return _hourly_candles(df) if df is not None else None
+
+@single_flight(lambda ticker, days: f"stored_history_{ticker}_{days}")
+def get_stored_crypto_history(ticker, days):
+    """Historique horaire crypto servi depuis le store OHLCV local
+    
+    - Série plus courte que la fenêtre demandée: rechargement complet de `days`
+      jours de bougies horaires réelles (prix horaires market_chart)
+    - Série rafraîchie il y a plus de HISTORY_REFRESH secondes: si au plus
+      INTRADAY_DAYS jours manquent, la fin est redemandée en bougies 30 minutes
+      (agrégées en heures) et ajoutée; au-delà, la série est rechargée
+    - Sinon (ou si l'API échoue): aucune requête, tranche de la série stockée
     
-    # Fallback: Return synchronized mock data with hourly granularity
-    # This uses correct base prices
-    return generate_and_sync_mock_data(ticker, days)
+    Returns:
+        Les days*24 dernières bougies (non synchronisées au prix live), None si
+        le store n'en contient pas autant (l'appelant se rabat sur le mock)
+    """
+    hours = days * 24
+    count = ohlcv_store.count(ticker)
+    if count < hours:
+        fresh = _fetch_coingecko_hourly(ticker, days)
+        if fresh is not None:
+            ohlcv_store.append(ticker, fresh, replace=True)
+    elif ohlcv_store.is_stale(ticker, HISTORY_REFRESH):
+        missing = ohlcv_store.missing_days(ticker)
+        if missing is not None and missing <= INTRADAY_DAYS:
+            fresh = _fetch_coingecko_intraday(ticker, max(missing, 1))
+            if fresh is not None:
+                ohlcv_store.append(ticker, fresh)
+        else:
+            # Trou trop long pour l'OHLC 30 minutes: rechargement sans raccourcir la série
+            fresh = _fetch_coingecko_hourly(ticker, max(days, count // 24))
+            if fresh is not None:
+                ohlcv_store.append(ticker, fresh, replace=True)
+    
+    stored = ohlcv_store.read(ticker, limit=hours)
+    return stored if len(stored) >= hours else None
 
-def convert_daily_to_hourly(daily_df):
+def convert_daily_to_hourly(daily_df, rng=None):
     """Convert daily OHLC data to hourly granularity
     Takes last N daily candles and expands to N*24 hourly candles
-    Uses interpolation to create realistic intraday movements"""
+    Uses interpolation to create realistic intraday movements
     
-    hourly_data = []
+    Vectorisé: matrice jours x 24 heures, un seul tirage aléatoire par colonne.
     
-    for idx, row in daily_df.iterrows():
-        day_open = row['open']
-        day_high = row['high']
-        day_low = row['low']
-        day_close = row['close']
-        day_volume = row['volume']
-        timestamp = row['timestamp']
-        
-        # Create 24 hourly candles for this day
-        for hour in range(24):
-            # Calculate hour timestamp
-            hour_time = timestamp + timedelta(hours=hour)
-            
-            # Distribute movement evenly throughout the day
-            progress = hour / 24.0
-            
-            # Hourly prices with realistic intraday movement
-            hour_open = day_open + (day_close - day_open) * (hour / 24.0)
-            hour_close = day_open + (day_close - day_open) * ((hour + 1) / 24.0)
-            
-            # Add intraday volatility (high and low)
-            intraday_range = (day_high - day_low) * 0.4  # Use 40% of daily range for hours
-            hour_high = max(hour_open, hour_close) + intraday_range * np.random.uniform(0, 0.5)
-            hour_low = min(hour_open, hour_close) - intraday_range * np.random.uniform(0, 0.5)
-            
-            # Distribute volume
-            hour_volume = day_volume / 24.0 * np.random.uniform(0.8, 1.2)
-            
-            hourly_data.append({
-                'timestamp': hour_time,
-                'open': hour_open,
-                'high': hour_high,
-                'low': hour_low,
-                'close': hour_close,
-                'volume': hour_volume
-            })
+    Args:
+        daily_df: DataFrame avec timestamp, open, high, low, close, volume
+        rng: numpy.random.Generator optionnel (reproductibilité)
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    n_days = len(daily_df)
+    hours = np.arange(24)
+    
+    day_open = daily_df['open'].to_numpy(dtype=float)[:, None]
+    day_close = daily_df['close'].to_numpy(dtype=float)[:, None]
+    day_range = (daily_df['high'].to_numpy(dtype=float) - daily_df['low'].to_numpy(dtype=float))[:, None]
+    day_volume = daily_df['volume'].to_numpy(dtype=float)[:, None]
+    
+    # Distribute movement evenly throughout the day
+    hour_open = day_open + (day_close - day_open) * (hours / 24.0)
+    hour_close = day_open + (day_close - day_open) * ((hours + 1) / 24.0)
+    
+    # Add intraday volatility (40% of daily range for hours)
+    intraday_range = day_range * 0.4
+    hour_high = np.maximum(hour_open, hour_close) + intraday_range * rng.uniform(0, 0.5, (n_days, 24))
+    hour_low = np.minimum(hour_open, hour_close) - intraday_range * rng.uniform(0, 0.5, (n_days, 24))
+    
+    # Distribute volume
+    hour_volume = day_volume / 24.0 * rng.uniform(0.8, 1.2, (n_days, 24))
+    
+    timestamps = daily_df['timestamp'].to_numpy()[:, None] + hours * np.timedelta64(1, 'h')
+    
+    return pd.DataFrame({
+        'timestamp': timestamps.ravel(),
+        'open': hour_open.ravel(),
+        'high': hour_high.ravel(),
+        'low': hour_low.ravel(),
+        'close': hour_close.ravel(),
+        'volume': hour_volume.ravel()
+    })
+
+
+def _linear_walk(start, growth, drift):
+    """Résoudre x[i] = growth[i] * x[i-1] + drift[i] (x[-1] = start) sans boucle
     
-    return pd.DataFrame(hourly_data)
+    Forme fermée: x[i] = P[i] * (start + sum(drift[k] / P[k], k <= i)),
+    P étant le produit cumulé de growth.
+    """
+    products = np.cumprod(growth)
+    return products * (start + np.cumsum(drift / products))
 
+def _sync_last_close(df, target):
+    """Décaler l'OHLC pour que la dernière clôture soit égale au prix live"""
+    if len(df) > 0:
+        adjustment = target - df['close'].iloc[-1]
+        for column in ('open', 'high', 'low', 'close'):
+            df[column] = df[column] + adjustment
+    return df
 
-def fetch_forex_historical(ticker, days):
+def fetch_forex_historical(ticker, days, rng=None):
     """Fetch forex historical data SYNCHRONIZED with live prices
     Falls back to synchronized mock data if API unavailable
     Returns HOURLY candles (24 candles per day) for proper graphing"""
     try:
         # Get current rate (live price)
         url = f"https://api.exchangerate.host/latest?base=USD&symbols={ticker}"
-        response = requests.get(url, timeout=10)
+        response = http_get(url, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
             current_rate = data.get('rates', {}).get(ticker)
             
             if current_rate:
+                rng = rng if rng is not None else np.random.default_rng()
                 # Create HOURLY candles for last N days (24 per day)
-                # For 1 day = 24 hourly candles
                 hours = days * 24
-                dates = pd.date_range(end=datetime.now(), periods=hours, freq='h')
-                
-                # Generate realistic OHLC with small ±0.3% variation per hour
-                base_price = float(current_rate) * 0.99  # Start slightly below current
-                prices = []
+                dates = pd.date_range(end=clock.now(), periods=hours, freq='h')
                 
-                # Calculate the gradient to reach current_rate at the end
-                price_diff = float(current_rate) - base_price
+                # Start slightly below current, drift linearly toward the live rate
+                start_price = float(current_rate) * 0.99
+                trend = (float(current_rate) - start_price) / hours if hours > 0 else 0
                 
-                for i in range(hours):
-                    # Gradient: slowly move to current_rate over all hours
-                    trend = (price_diff / hours) if hours > 0 else 0
-                    
-                    # Much smaller variation per hour (±0.3% instead of ±2%)
-                    hourly_var = np.random.uniform(-0.003, 0.003)
-                    o = base_price + trend + hourly_var * base_price
-                    h = o * (1 + abs(np.random.uniform(0, 0.002)))
-                    l = o * (1 - abs(np.random.uniform(0, 0.002)))
-                    c = o * (1 + hourly_var * np.random.uniform(-0.5, 0.5) * 0.0001)
-                    base_price = c  # Next hour starts from current close
-                    
-                    prices.append({
-                        'timestamp': dates[i],
-                        'open': o, 
-                        'high': max(h, c), 
-                        'low': min(l, c), 
-                        'close': c, 
-                        'volume': 1e8
-                    })
+                # Small ±0.3% variation per hour; each hour opens from the previous close
+                hourly_var = rng.uniform(-0.003, 0.003, hours)
+                close_factor = 1 + hourly_var * rng.uniform(-0.5, 0.5, hours) * 0.0001
+                closes = _linear_walk(start_price, (1 + hourly_var) * close_factor, trend * close_factor)
+                previous = np.concatenate(([start_price], closes[:-1]))
+                opens = previous * (1 + hourly_var) + trend
+                highs = opens * (1 + rng.uniform(0, 0.002, hours))
+                lows = opens * (1 - rng.uniform(0, 0.002, hours))
                 
-                ohlc_df = pd.DataFrame(prices)
+                ohlc_df = pd.DataFrame({
+                    'timestamp': dates,
+                    'open': opens,
+                    'high': np.maximum(highs, closes),
+                    'low': np.minimum(lows, closes),
+                    'close': closes,
+                    'volume': np.full(hours, 1e8)
+                })
                 
                 # CRITICAL SYNC: Ensure last close = current live rate
-                if len(ohlc_df) > 0:
-                    price_adjustment = float(current_rate) - ohlc_df.iloc[-1]['close']
-                    ohlc_df['close'] = ohlc_df['close'] + price_adjustment
-                    ohlc_df['high'] = ohlc_df['high'] + price_adjustment
-                    ohlc_df['low'] = ohlc_df['low'] + price_adjustment
-                    ohlc_df['open'] = ohlc_df['open'] + price_adjustment
-                
-                return ohlc_df
+                return _sync_last_close(ohlc_df, float(current_rate))
     except Exception as e:
         pass
     
@@ -772,12 +903,12 @@ def fetch_forex_historical(ticker, days):
     df = generate_mock_data(ticker, hours)
     # Make sure it's hourly-like
     if len(df) > 0:
-        df['timestamp'] = pd.date_range(end=datetime.now(), periods=len(df), freq='h')
+        df['timestamp'] = pd.date_range(end=clock.now(), periods=len(df), freq='h')
     return df
 
 
 
-def fetch_gold_historical(days=90):
+def fetch_gold_historical(days=90, rng=None):
     """Fetch historical gold price data with proper sync to live price
     Returns HOURLY candles (24 per day) for proper graphing
     
@@ -788,72 +919,174 @@ def fetch_gold_historical(days=90):
     current_price = current_price_data.get('price', 2350)
     
     try:
-        # Generate HOURLY candles (24 per day) instead of daily
-        df_data = []
-        
-        # Total hours to generate
+        rng = rng if rng is not None else np.random.default_rng()
+        # Total hours to generate (24 per day)
         hours = days * 24
         
         # Start price: slightly lower than current (realistic 5% variance)
-        base_price = current_price * 0.95
-        simulation_price = base_price
+        start_price = current_price * 0.95
         
-        for i in range(hours, 0, -1):
-            # Realistic hourly movement ±0.15% (much smaller than daily)
-            hourly_change = np.random.randn() * 0.0015 * simulation_price
-            
-            # Gradient: slowly move from start price to current price over the hours
-            price_gradient = (current_price - base_price) * (1 - i / hours)
-            trend = price_gradient / hours
-            
-            open_price = simulation_price + hourly_change * 0.3 + trend
-            close_price = simulation_price + hourly_change + trend
-            high_price = max(open_price, close_price) + abs(np.random.randn()) * 0.0005 * simulation_price
-            low_price = min(open_price, close_price) - abs(np.random.randn()) * 0.0005 * simulation_price
-            
-            df_data.append({
-                'timestamp': pd.Timestamp.now(tz='UTC') - pd.Timedelta(hours=i),
-                'open': open_price,
-                'high': high_price,
-                'low': low_price,
-                'close': close_price,
-                'volume': np.random.randint(10000000, 50000000)
-            })
-            
-            simulation_price = close_price
+        # Realistic hourly movement ±0.15% of the running price
+        shocks = rng.standard_normal(hours) * 0.0015
+        # Gradient: slowly move from start price to current price over the hours
+        trend = (current_price - start_price) * (np.arange(hours) / hours) / hours
+        
+        closes = _linear_walk(start_price, 1 + shocks, trend)
+        previous = np.concatenate(([start_price], closes[:-1]))
+        opens = previous * (1 + shocks * 0.3) + trend
+        highs = np.maximum(opens, closes) + np.abs(rng.standard_normal(hours)) * 0.0005 * previous
+        lows = np.minimum(opens, closes) - np.abs(rng.standard_normal(hours)) * 0.0005 * previous
         
-        df = pd.DataFrame(df_data)
+        now = pd.Timestamp(clock.now())
+        df = pd.DataFrame({
+            'timestamp': now - pd.to_timedelta(np.arange(hours, 0, -1), unit='h'),
+            'open': opens,
+            'high': highs,
+            'low': lows,
+            'close': closes,
+            'volume': rng.integers(10000000, 50000000, hours)
+        })
         
         # CRITICAL SYNC: Ensure the last close price = current live price
         # This guarantees graphs and live prices are perfectly synchronized
-        if len(df) > 0:
-            price_diff = current_price - df.iloc[-1]['close']
-            df['close'] = df['close'] + price_diff
-            df['high'] = df['high'] + price_diff
-            df['low'] = df['low'] + price_diff
-            df['open'] = df['open'] + price_diff
-        
-        # Ensure timestamp is a column, not index
-        if 'timestamp' not in df.columns and df.index.name == 'timestamp':
-            df.reset_index(inplace=True)
-        
-        return df.sort_values('timestamp')
+        return _sync_last_close(df, current_price)
     except Exception as e:
         # Ultimate fallback with hourly candles
         hours = days * 24
         df = generate_mock_data("XAU", hours)
-        df['timestamp'] = pd.date_range(end=datetime.now(), periods=len(df), freq='h')
-        if len(df) > 0:
-            price_diff = current_price - df.iloc[-1]['close']
-            df['close'] = df['close'] + price_diff
-            df['high'] = df['high'] + price_diff
-            df['low'] = df['low'] + price_diff
-            df['open'] = df['open'] + price_diff
-        return df
+        df['timestamp'] = pd.date_range(end=clock.now(), periods=len(df), freq='h')
+        return _sync_last_close(df, current_price)
+
+
+def get_live_candle(ticker, interval="1h"):
+    """Bougie OHLCV en cours construite depuis les trades WebSocket (Binance puis Coinbase)
+    
+    Returns:
+        dict (timestamp, open, high, low, close, volume) ou None sans flux actif
+    """
+    if not WEBSOCKET_AVAILABLE or ticker not in CRYPTO_TICKERS:
+        return None
+    try:
+        for feed, symbol in ((get_binance_feed(), f"{ticker}USDT"), (get_coinbase_feed(), f"{ticker}-USD")):
+            candle = feed.candles.current(symbol, interval)
+            if candle:
+                return candle
+    except:
+        pass
+    return None
+
+def _with_live_candle(ticker, data):
+    """Historique dont la bougie de l'heure en cours est la bougie live réelle"""
+    candle = get_live_candle(ticker)
+    return merge_live_candle(data, candle) if candle else data
 
 
-def get_live_price_batch(tickers):
+def get_live_indicators(ticker):
+    """Indicateurs (RSI, MACD, Bollinger, EMA) maintenus tick par tick par les flux WebSocket
+    
+    Au premier appel, le suivi est initialisé sur 30 jours de bougies horaires.
+    Retourne None si aucun flux temps réel actif ne couvre le ticker: l'appelant
+    recalcule alors les indicateurs en batch.
+    """
+    if not WEBSOCKET_AVAILABLE or ticker not in CRYPTO_TICKERS:
+        return None
+    try:
+        for feed, symbol in ((get_binance_feed(), f"{ticker}USDT"), (get_coinbase_feed(), f"{ticker}-USD")):
+            if not feed.running:
+                continue
+            if symbol not in feed.indicators:
+                hist_data = get_historical_data(ticker, days=30)
+                # La barre en cours est celle de la dernière bougie (UTC naïf), pas l'heure actuelle
+                last = pd.Timestamp(hist_data['timestamp'].iloc[-1])
+                last = last.tz_convert('UTC') if last.tzinfo is not None else last.tz_localize('UTC')
+                feed.track_indicators(symbol, hist_data['close'].values, now=last.timestamp())
+            latest = feed.get_indicators(symbol)
+            if latest:
+                return latest
+    except:
+        pass
+    return None
+
+
+def _fallback_price(ticker):
+    if ticker in COINGECKO_IDS:
+        return _crypto_fallback_price(ticker)
+    if ticker in FOREX_TICKERS:
+        return _forex_fallback_price(ticker)
+    if ticker == "XAU":
+        return _gold_fallback_price()
+    return generate_mock_data(ticker, 1).iloc[-1].to_dict()
+
+def _batch_crypto_prices(tickers):
     results = {}
     for ticker in tickers:
-        results[ticker] = get_live_price(ticker)
+        live = _websocket_crypto_price(ticker)
+        if live:
+            results[ticker] = live
+    missing = [t for t in tickers if t not in results]
+    if missing:
+        # Une seule requête CoinGecko pour toutes les cryptos sans flux WebSocket
+        results.update(_fetch_coingecko_prices(missing))
+    for ticker in tickers:
+        if ticker not in results:
+            results[ticker] = _crypto_fallback_price(ticker)
+    return results
+
+def _batch_forex_prices(tickers):
+    # Une seule requête exchangerate.host (symbols=EUR,GBP,JPY,AUD)
+    results = _fetch_forex_rates(tickers)
+    for ticker in tickers:
+        # Pas de nouvelle requête par devise manquante: prix de repli, comme les cryptos
+        if ticker not in results:
+            results[ticker] = _forex_fallback_price(ticker)
     return results
+
+def get_live_price_batch(tickers, deadline=BATCH_DEADLINE):
+    """Prix en temps réel de plusieurs tickers en parallèle
+    
+    Les cryptos sont regroupées en une requête CoinGecko, les devises en une
+    requête exchangerate.host, l'or est récupéré en parallèle. Les tickers
+    dont la source n'a pas répondu avant `deadline` secondes reçoivent le
+    prix de repli (les requêtes en retard alimentent le cache en arrière-plan).
+    
+    Returns:
+        Dict ticker -> dict de prix (même format que get_live_price)
+    """
+    results = {}
+    crypto, forex, others = [], [], []
+    for ticker in dict.fromkeys(tickers):
+        cached = cache.get(f"price_{ticker}")
+        if cached:
+            results[ticker] = cached
+        elif ticker in COINGECKO_IDS:
+            crypto.append(ticker)
+        elif ticker in FOREX_TICKERS:
+            forex.append(ticker)
+        else:
+            others.append(ticker)
+    
+    jobs = []
+    if crypto:
+        jobs.append((crypto, _batch_crypto_prices, crypto))
+    if forex:
+        jobs.append((forex, _batch_forex_prices, forex))
+    for ticker in others:
+        jobs.append(([ticker], lambda t: {t: get_live_price(t)}, ticker))
+    
+    if jobs:
+        executor = ThreadPoolExecutor(max_workers=len(jobs))
+        futures = {executor.submit(fetch, arg): group for group, fetch, arg in jobs}
+        done, _ = wait(futures, timeout=deadline)
+        # Ne pas attendre les requêtes en retard
+        executor.shutdown(wait=False)
+        for future in done:
+            try:
+                results.update(future.result())
+            except Exception:
+                pass
+        for group in futures.values():
+            for ticker in group:
+                if ticker not in results:
+                    results[ticker] = _fallback_price(ticker)
+    
+    return {ticker: results[ticker] for ticker in tickers}
@@ -0,0 +1,189 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+Feed Manager - Une seule boucle asyncio pour tous les flux WebSocket
+
+- Toutes les connexions (Binance, CoinCap, Coinbase) partagent une boucle
+  asyncio exécutée dans un unique thread démon
+- Reconnexion automatique avec backoff exponentiel (jitter) et renvoi des
+  messages d'abonnement à chaque connexion
+- Un flux silencieux plus de `stale_after` secondes est considéré mort et
+  reconnecté (pas de flux muet après une coupure réseau)
+- Statistiques par flux (messages/s, âge du dernier message, reconnexions)
+  lisibles depuis n'importe quel thread (Streamlit)
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import deque
+
+from websockets.asyncio.client import connect
+
+# Fenêtre (secondes) du calcul du débit de messages
+RATE_WINDOW = 60
+
+class FeedStats:
+    """Compteurs d'un flux, mis à jour par la boucle et lus par Streamlit"""
+
+    def __init__(self):
+        self.connected = False
+        self.messages = 0
+        self.connects = 0
+        self.errors = 0
+        self.last_message = None
+        self.last_error = None
+        self._recent = deque()
+
+    def record_message(self, now):
+        self.messages += 1
+        self.last_message = now
+        self._recent.append(now)
+        while self._recent and self._recent[0] < now - RATE_WINDOW:
+            self._recent.popleft()
+
+    def rate(self, now):
+        """Messages par seconde sur la dernière fenêtre RATE_WINDOW"""
+        recent = sum(1 for t in self._recent if t >= now - RATE_WINDOW)
+        return recent / RATE_WINDOW
+
+class FeedManager:
+    def __init__(self, stale_after=30.0, backoff_initial=1.0, backoff_max=60.0):
+        """
+        Args:
+            stale_after: Secondes sans message avant reconnexion forcée
+            backoff_initial: Premier délai de reconnexion (secondes)
+            backoff_max: Délai de reconnexion maximal (secondes)
+        """
+        self.stale_after = stale_after
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self._feeds = {}
+        self._tasks = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="feed-manager", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def add_feed(self, name, url, on_message, subscribe=None):
+        """Enregistrer et démarrer un flux (remplace un flux du même nom)
+
+        Args:
+            name: Identifiant du flux (ex: 'binance')
+            url: URL WebSocket
+            on_message: Fonction appelée avec chaque message texte (thread de la boucle)
+            subscribe: Messages (dicts) envoyés à chaque connexion/reconnexion
+        """
+        loop = self._ensure_loop()
+        self.remove_feed(name)
+        with self._lock:
+            self._feeds[name] = {"url": url, "on_message": on_message, "subscribe": list(subscribe or [])}
+            self._stats[name] = FeedStats()
+        future = asyncio.run_coroutine_threadsafe(self._start_task(name), loop)
+        future.result(timeout=5)
+
+    async def _start_task(self, name):
+        self._tasks[name] = asyncio.get_running_loop().create_task(self._run_feed(name))
+
+    def remove_feed(self, name):
+        """Arrêter et oublier un flux"""
+        with self._lock:
+            loop = self._loop
+            self._feeds.pop(name, None)
+            stats = self._stats.get(name)
+            if stats:
+                stats.connected = False
+        if loop is not None:
+            asyncio.run_coroutine_threadsafe(self._cancel_task(name), loop).result(timeout=5)
+
+    async def _cancel_task(self, name):
+        task = self._tasks.pop(name, None)
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    async def _run_feed(self, name):
+        backoff = self.backoff_initial
+        while True:
+            with self._lock:
+                feed = self._feeds.get(name)
+                stats = self._stats.get(name)
+            if feed is None:
+                return
+            try:
+                async with connect(feed["url"], ping_interval=20, open_timeout=10) as ws:
+                    with self._lock:
+                        stats.connected = True
+                        stats.connects += 1
+                    for message in feed["subscribe"]:
+                        await ws.send(json.dumps(message))
+                    backoff = self.backoff_initial
+                    while True:
+                        # Pas de message pendant stale_after: TimeoutError -> reconnexion
+                        message = await asyncio.wait_for(ws.recv(), timeout=self.stale_after)
+                        with self._lock:
+                            stats.record_message(time.time())
+                        try:
+                            feed["on_message"](message)
+                        except Exception:
+                            pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                with self._lock:
+                    stats.errors += 1
+                    stats.last_error = f"{type(e).__name__}: {e}"
+            finally:
+                with self._lock:
+                    stats.connected = False
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.5))
+            backoff = min(backoff * 2, self.backoff_max)
+
+    def is_connected(self, name):
+        with self._lock:
+            stats = self._stats.get(name)
+            return bool(stats and stats.connected and name in self._feeds)
+
+    def status(self):
+        """État de chaque flux: connecté, messages, débit, âge, reconnexions, périmé"""
+        now = time.time()
+        with self._lock:
+            return {
+                name: {
+                    "connected": stats.connected,
+                    "messages": stats.messages,
+                    "rate": stats.rate(now),
+                    "age": None if stats.last_message is None else now - stats.last_message,
+                    "reconnects": max(0, stats.connects - 1),
+                    "errors": stats.errors,
+                    "last_error": stats.last_error,
+                    "stale": stats.last_message is None or now - stats.last_message > self.stale_after
+                }
+                for name, stats in self._stats.items() if name in self._feeds
+            }
+
+    def stop(self):
+        """Arrêter tous les flux (la boucle reste disponible)"""
+        for name in list(self._feeds):
+            self.remove_feed(name)
+
+_feed_manager = None
+_feed_manager_lock = threading.Lock()
+
+def get_feed_manager():
+    """Obtenir le gestionnaire de flux partagé du processus"""
+    global _feed_manager
+    with _feed_manager_lock:
+        if _feed_manager is None:
+            _feed_manager = FeedManager()
+        return _feed_manager
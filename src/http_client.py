@@ -0,0 +1,165 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+HTTP Client - Sessions partagées pour tous les appels aux APIs externes
+
+- Une requests.Session par hôte (pool de connexions keep-alive: pas de
+  nouvelle poignée de main TCP+TLS à chaque appel)
+- Réessais bornés avec backoff exponentiel et jitter (erreurs de connexion,
+  429 et 5xx; Retry-After respecté)
+- Limiteur token-bucket par API amont: les appels attendent leur tour au lieu
+  de déclencher des 429
+- `timeout` est le délai total de l'appel: attente du limiteur, requêtes et
+  pauses entre réessais comprises (échec rapide vers le repli de l'appelant)
+"""
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Hôte -> (requêtes par seconde, rafale autorisée)
+UPSTREAM_LIMITS = {
+    "api.coingecko.com": (0.5, 5),       # Free tier: ~30 requêtes/minute
+    "api.exchangerate.host": (2.0, 5),
+    "api.metals.live": (1.0, 3),
+    "www.metals.live": (1.0, 3),
+    "newsapi.org": (0.5, 2),              # 100 requêtes/jour en démo
+}
+DEFAULT_LIMIT = (5.0, 10)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER = 5.0
+# Part maximale du délai restant qu'un appel peut passer à attendre un jeton
+MAX_THROTTLE_SHARE = 0.5
+
+class RateLimited(requests.RequestException):
+    """Le limiteur n'a pas pu délivrer de jeton dans le délai de la requête"""
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait=None):
+        """Prendre un jeton, en attendant si nécessaire (file d'attente)
+
+        Returns:
+            Secondes attendues, ou None si le jeton n'est pas disponible avant max_wait
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            # Le jeton est réservé maintenant: les appelants suivants attendent derrière
+            self.tokens -= 1
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+class HttpClient:
+    def __init__(self, limits=None, retries=2, backoff=0.25, pool_size=10):
+        self.limits = dict(UPSTREAM_LIMITS if limits is None else limits)
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retried = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+
+    def _session(self, host):
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def _bucket(self, host):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(*self.limits.get(host, DEFAULT_LIMIT))
+                self._buckets[host] = bucket
+            return bucket
+
+    def _delay(self, attempt, response=None):
+        if response is not None and response.headers.get("Retry-After", "").isdigit():
+            return min(float(response.headers["Retry-After"]), MAX_RETRY_AFTER)
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def get(self, url, timeout=10, retries=None, **kwargs):
+        """GET avec session poolée, limiteur par hôte et réessais bornés
+
+        Lève les exceptions requests comme requests.get. `timeout` borne l'appel
+        entier: RateLimited si le limiteur ne peut pas servir la requête en
+        laissant du temps à la requête elle-même, et pas de réessai qui
+        dépasserait le délai (dernière réponse ou erreur renvoyée aussitôt).
+        """
+        host = urlparse(url).hostname
+        session = self._session(host)
+        bucket = self._bucket(host)
+        retries = self.retries if retries is None else retries
+        deadline = time.monotonic() + timeout
+
+        for attempt in range(retries + 1):
+            waited = bucket.acquire(max_wait=(deadline - time.monotonic()) * MAX_THROTTLE_SHARE)
+            if waited is None:
+                raise RateLimited(f"Limite de requêtes atteinte pour {host}")
+            with self._lock:
+                self.requests += 1
+                if waited > 0:
+                    self.throttled += 1
+                    self.throttled_seconds += waited
+
+            error = None
+            try:
+                response = session.get(url, timeout=deadline - time.monotonic(), **kwargs)
+            except requests.ConnectionError as e:
+                # Erreurs de connexion (dont ConnectTimeout): réessayer; ReadTimeout: non
+                if attempt == retries:
+                    raise
+                response, error = None, e
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    return response
+
+            delay = self._delay(attempt, response)
+            if time.monotonic() + delay >= deadline:
+                # Plus le temps de réessayer: l'appelant passe à son repli
+                if error is not None:
+                    raise error
+                return response
+            with self._lock:
+                self.retried += 1
+            time.sleep(delay)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retried": self.retried,
+                "throttled": self.throttled,
+                "throttled_seconds": self.throttled_seconds,
+                "hosts": sorted(self._sessions)
+            }
+
+# Client partagé par tous les modules
+http_client = HttpClient()
+
+def http_get(url, timeout=10, **kwargs):
+    """Remplaçant de requests.get utilisant le client partagé"""
+    return http_client.get(url, timeout=timeout, **kwargs)
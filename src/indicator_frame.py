@@ -0,0 +1,148 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+Indicator Frame - Indicateurs de plusieurs tickers calculés une seule fois
+
+Les clôtures des tickers sélectionnés sont regroupées par longueur en matrices
+2-D (tickers x barres): RSI et MACD sont calculés pour toute la matrice en un
+appel batch, Bollinger et tendance ligne par ligne. Chaque résultat est mémorisé
+par (version des données, indicateur, paramètres), la version étant une
+empreinte des clôtures: les onglets du dashboard qui consomment le même
+historique partagent une seule passe de calcul, et un rerun Streamlit sans
+nouvelle donnée ne recalcule rien.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from src.indicators import (calculate_bollinger_bands, calculate_macd, calculate_macd_batch, calculate_rsi,
+                            calculate_rsi_batch, calculate_trend)
+from src.trading_rules import SmartSignals, TradingRules
+
+# Nombre de résultats (ticker, indicateur, paramètres) conservés
+MEMO_SIZE = 512
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+_memo_stats = {"hits": 0, "misses": 0}
+
+def data_version(values):
+    """Empreinte d'une série de clôtures (change dès qu'une valeur change)"""
+    values = np.ascontiguousarray(values, dtype=float)
+    return hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest()
+
+def _rsi_rows(matrix, period=14):
+    if matrix.shape[1] < period + 1:
+        return [calculate_rsi(row, period) for row in matrix]
+    return list(calculate_rsi_batch(matrix, period))
+
+def _macd_rows(matrix, fast=12, slow=26, signal=9):
+    try:
+        lines = calculate_macd_batch(matrix, fast, slow, signal)
+        return [tuple(line[i] for line in lines) for i in range(matrix.shape[0])]
+    except Exception:
+        return [calculate_macd(row, fast, slow, signal) for row in matrix]
+
+def _bollinger_rows(matrix, period=20, std_dev=2):
+    return [calculate_bollinger_bands(row, period, std_dev) for row in matrix]
+
+def _trend_rows(matrix, period=20):
+    return [calculate_trend(row, period) for row in matrix]
+
+def _freeze(value):
+    """Résultats partagés entre onglets: arrays en lecture seule"""
+    for array in (value if isinstance(value, tuple) else (value,)):
+        if isinstance(array, np.ndarray):
+            array.setflags(write=False)
+    return value
+
+INDICATORS = {
+    "rsi": _rsi_rows,
+    "macd": _macd_rows,
+    "bollinger": _bollinger_rows,
+    "trend": _trend_rows,
+}
+
+class IndicatorFrame:
+    def __init__(self, closes):
+        """
+        Args:
+            closes: Dict ticker -> clôtures (array 1-D); les séries vides sont ignorées
+        """
+        self.closes = {}
+        for ticker, values in closes.items():
+            if values is not None and len(values) > 0:
+                self.closes[ticker] = np.asarray(values, dtype=float)
+        self.versions = {ticker: data_version(values) for ticker, values in self.closes.items()}
+
+    def __contains__(self, ticker):
+        return ticker in self.closes
+
+    @property
+    def tickers(self):
+        return list(self.closes)
+
+    def _compute(self, name, params):
+        """Calculer l'indicateur pour tous les tickers sans résultat mémorisé"""
+        with _memo_lock:
+            missing = [t for t in self.closes if (self.versions[t], name, params) not in _memo]
+        groups = {}
+        for ticker in missing:
+            groups.setdefault(len(self.closes[ticker]), []).append(ticker)
+        results = {}
+        for tickers in groups.values():
+            matrix = np.vstack([self.closes[t] for t in tickers])
+            for ticker, value in zip(tickers, INDICATORS[name](matrix, *params)):
+                results[(self.versions[ticker], name, params)] = _freeze(value)
+        with _memo_lock:
+            _memo_stats["misses"] += len(results)
+            _memo.update(results)
+            while len(_memo) > MEMO_SIZE:
+                _memo.popitem(last=False)
+        return results
+
+    def get(self, ticker, name, *params):
+        """Résultat d'un indicateur pour un ticker (calculé en batch si absent)"""
+        key = (self.versions[ticker], name, params)
+        with _memo_lock:
+            if key in _memo:
+                _memo.move_to_end(key)
+                _memo_stats["hits"] += 1
+                return _memo[key]
+        results = self._compute(name, params)
+        if key in results:
+            return results[key]
+        with _memo_lock:
+            return _memo[key]
+
+    def rsi(self, ticker, period=14):
+        return self.get(ticker, "rsi", period)
+
+    def macd(self, ticker, fast=12, slow=26, signal=9):
+        """(macd_line, signal_line, histogram)"""
+        return self.get(ticker, "macd", fast, slow, signal)
+
+    def bollinger(self, ticker, period=20, std_dev=2):
+        """(sma, upper_band, lower_band)"""
+        return self.get(ticker, "bollinger", period, std_dev)
+
+    def trend(self, ticker, period=20):
+        return self.get(ticker, "trend", period)
+
+    def rules(self, ticker):
+        """TradingRules du ticker construites depuis les indicateurs mémorisés"""
+        return TradingRules.from_arrays(
+            self.closes[ticker], self.rsi(ticker), *self.macd(ticker), *self.bollinger(ticker), self.trend(ticker)
+        )
+
+    def signals(self, ticker):
+        """SmartSignals du ticker (mêmes résultats que SmartSignals(clôtures))"""
+        return SmartSignals.from_rules(self.rules(ticker))
+
+def get_memo_stats():
+    """Résultats servis depuis la mémoire (hits) et calculés (misses)"""
+    with _memo_lock:
+        return dict(_memo_stats, size=len(_memo))
+
+def clear_memo():
+    with _memo_lock:
+        _memo.clear()
+        _memo_stats.update(hits=0, misses=0)
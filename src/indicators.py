@@ -1,78 +1,178 @@
 """© 2025-2026 ELOADXFAMILY - Tous droits réservés
 Technical Indicators - RSI, MACD, Bollinger Bands, and more"""
+import threading
+from collections import deque
 import numpy as np
 import pandas as pd
+from src import clock
+from src.rolling import rolling_mean, rolling_std
+
+def _exp_smooth(values, init, decay, divisor):
+    """Lissage exponentiel vectorisé: y[k] = y[k-1] * decay + values[k] / divisor
+
+    Args:
+        values: Array 2-D (tickers x barres) des valeurs à lisser
+        init: Array 1-D des valeurs initiales (une par ticker)
+        decay: Facteur de décroissance (0 <= decay < 1)
+        divisor: Diviseur appliqué aux nouvelles valeurs
+
+    Returns:
+        Array 2-D de même forme que values
+
+    La récurrence est résolue par blocs sous forme fermée
+    (y[k] = a^k * (init + sum(values[j] / a^j) / divisor)), ce qui remplace la
+    boucle Python par des cumsum NumPy. Les blocs sont bornés pour que a^-k
+    reste dans la plage des float64.
+    """
+    out = np.empty_like(values, dtype=float)
+    if values.shape[1] == 0:
+        return out
+    if decay == 0:
+        out[:] = values / divisor
+        return out
+
+    block = int(min(512, max(1, 30 / -np.log10(decay))))
+    powers = decay ** np.arange(1, block + 1)
+    state = np.asarray(init, dtype=float)
+    for start in range(0, values.shape[1], block):
+        chunk = values[:, start:start + block]
+        pw = powers[:chunk.shape[1]]
+        out[:, start:start + chunk.shape[1]] = pw * (state[:, None] + np.cumsum(chunk / pw, axis=1) / divisor)
+        state = out[:, start + chunk.shape[1] - 1]
+    return out
+
+def _wilder_smooth(values, init, period):
+    """Lissage de Wilder: y[k] = y[k-1] * (period-1)/period + values[k]/period"""
+    return _exp_smooth(values, init, (period - 1) / period, period)
+
+def _wilder_averages(prices, period):
+    """Moyennes de Wilder des hausses/baisses pour chaque barre >= period
+
+    Args:
+        prices: Array 2-D (tickers x barres) avec au moins period + 1 barres
+
+    Returns:
+        (ups, downs): Arrays 2-D (tickers x barres - period)
+    """
+    n = prices.shape[1]
+    deltas = np.diff(prices, axis=1)
+    seed = deltas[:, :period + 1]
+    up = np.where(seed >= 0, seed, 0).sum(axis=1) / period
+    down = -np.where(seed < 0, seed, 0).sum(axis=1) / period
+
+    # Les deltas NaN comptent comme des baisses, comme dans la boucle d'origine
+    rising = deltas[:, period:] > 0
+    gains = np.where(rising, deltas[:, period:], 0.0)
+    losses = np.where(rising, 0.0, -deltas[:, period:])
+
+    ups = np.empty((prices.shape[0], n - period))
+    downs = np.empty((prices.shape[0], n - period))
+    ups[:, 0], downs[:, 0] = up, down
+    ups[:, 1:] = _wilder_smooth(gains[:, :n - period - 1], up, period)
+    downs[:, 1:] = _wilder_smooth(losses[:, :n - period - 1], down, period)
+    return ups, downs
+
+def _rsi_from_averages(ups, downs):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = np.where(downs != 0, ups / downs, 0)
+        return np.where(rs >= 0, 100 - 100 / (1 + rs), 0)
+
+def calculate_rsi_batch(prices, period=14):
+    """Calcule le RSI de Wilder pour plusieurs tickers en un seul appel
+
+    Args:
+        prices: Array 2-D (tickers x barres), toutes les séries de même longueur
+        period: Période RSI (défaut 14)
+
+    Returns:
+        Array 2-D de même forme, identique ligne par ligne à calculate_rsi
+    """
+    prices = np.asarray(prices)
+    if prices.ndim == 1:
+        prices = prices[None, :]
+    n = prices.shape[1]
+    if n < period + 1:
+        return np.full(prices.shape if n > 0 else (prices.shape[0], 1), 50)
+
+    ups, downs = _wilder_averages(prices, period)
+    rsis = np.zeros_like(prices)
+    rsis[:, period:] = _rsi_from_averages(ups, downs)
+    return rsis
 
 def calculate_rsi(prices, period=14):
     if len(prices) < period + 1:
         # Retourner un array avec valeur neutre (50)
         return np.array([50] * len(prices)) if len(prices) > 0 else np.array([50])
     
-    deltas = np.diff(prices)
-    seed = deltas[:period+1]
-    up = seed[seed >= 0].sum() / period
-    down = -seed[seed < 0].sum() / period
-    
-    rs = up / down if down != 0 else 0
-    rsi = 100 - 100 / (1 + rs) if rs >= 0 else 0
-    
-    rsis = np.zeros_like(prices)
-    rsis[period] = rsi
-    
-    for i in range(period + 1, len(prices)):
-        delta = deltas[i - 1]
-        if delta > 0:
-            up = (up * (period - 1) + delta) / period
-            down = down * (period - 1) / period
-        else:
-            up = up * (period - 1) / period
-            down = (down * (period - 1) - delta) / period
-        
-        rs = up / down if down != 0 else 0
-        rsis[i] = 100 - 100 / (1 + rs) if rs >= 0 else 0
-    
-    return rsis
+    return calculate_rsi_batch(np.asarray(prices)[None, :], period)[0]
+
+def _nan_to_row_mean(values, prices):
+    """nan_to_num ligne par ligne, NaN remplacés par la moyenne des prix de la ligne"""
+    if np.isfinite(values).all():
+        return values
+    return np.array([np.nan_to_num(row, nan=np.mean(p)) for row, p in zip(values, prices)])
+
+def calculate_macd_batch(prices, fast=12, slow=26, signal=9):
+    """MACD de plusieurs tickers en un seul appel
+
+    Args:
+        prices: Array 2-D (tickers x barres), toutes les séries de même longueur
+
+    Returns:
+        (macd_line, signal_line, histogram): Arrays 2-D, identiques ligne par
+        ligne à calculate_macd
+    """
+    prices = np.asarray(prices, dtype=float)
+    if prices.ndim == 1:
+        prices = prices[None, :]
+    ema_fast = _nan_to_row_mean(calculate_ema_batch(prices, fast), prices)
+    ema_slow = _nan_to_row_mean(calculate_ema_batch(prices, slow), prices)
+
+    macd_line = ema_fast - ema_slow
+    signal_line = np.nan_to_num(calculate_ema_batch(macd_line, signal), nan=0)
+    histogram = macd_line - signal_line
+    return (np.nan_to_num(macd_line, nan=0),
+            np.nan_to_num(signal_line, nan=0),
+            np.nan_to_num(histogram, nan=0))
 
 def calculate_macd(prices, fast=12, slow=26, signal=9):
     try:
         if prices is None or len(prices) == 0:
             return np.array([0]), np.array([0]), np.array([0])
         
-        ema_fast = calculate_ema(prices, fast)
-        ema_slow = calculate_ema(prices, slow)
-        
-        # Asegurar que no hay NaN
-        ema_fast = np.nan_to_num(ema_fast, nan=np.mean(prices))
-        ema_slow = np.nan_to_num(ema_slow, nan=np.mean(prices))
-        
-        macd_line = ema_fast - ema_slow
-        signal_line = calculate_ema(macd_line, signal)
-        signal_line = np.nan_to_num(signal_line, nan=0)
-        
-        histogram = macd_line - signal_line
-        
+        macd_line, signal_line, histogram = calculate_macd_batch(np.asarray(prices)[None, :], fast, slow, signal)
         # Retourner arrays de même taille que l'input
-        return (np.nan_to_num(macd_line, nan=0),
-                np.nan_to_num(signal_line, nan=0),
-                np.nan_to_num(histogram, nan=0))
+        return macd_line[0], signal_line[0], histogram[0]
     except Exception:
         # En cas d'erreur, retourner des arrays de zéros
         return np.zeros_like(prices), np.zeros_like(prices), np.zeros_like(prices)
 
+def calculate_ema_batch(prices, period):
+    """EMA de plusieurs tickers en un seul appel (Array 2-D tickers x barres)
+
+    Les `period` premières valeurs valent la moyenne des `period` premiers prix,
+    comme calculate_ema; la suite est la récurrence EMA résolue par _exp_smooth.
+    """
+    prices = np.asarray(prices, dtype=float)
+    if prices.ndim == 1:
+        prices = prices[None, :]
+    n = prices.shape[1]
+    if n < period:
+        # Moyenne des prix disponibles au lieu de NaN
+        return np.full(prices.shape, prices.mean(axis=1, keepdims=True) if n > 0 else 0.0)
+    
+    multiplier = 2 / (period + 1)
+    ema = np.empty(prices.shape)
+    ema[:, :period] = prices[:, :period].mean(axis=1, keepdims=True)
+    ema[:, period:] = _exp_smooth(prices[:, period:], ema[:, period - 1], 1 - multiplier, 1 / multiplier)
+    return ema
+
 def calculate_ema(prices, period):
     if len(prices) < period:
         # Retourner un array avec la moyenne des prix disponibles au lieu de NaN
         return np.full_like(prices, np.mean(prices) if len(prices) > 0 else 0, dtype=float)
     
-    ema = np.zeros_like(prices, dtype=float)
-    multiplier = 2 / (period + 1)
-    
-    ema[:period] = np.mean(prices[:period])
-    
-    for i in range(period, len(prices)):
-        ema[i] = prices[i] * multiplier + ema[i - 1] * (1 - multiplier)
-    
-    return ema
+    return calculate_ema_batch(np.asarray(prices)[None, :], period)[0]
 
 def calculate_bollinger_bands(prices, period=20, std_dev=2):
     if len(prices) < period:
@@ -80,13 +180,12 @@ def calculate_bollinger_bands(prices, period=20, std_dev=2):
         neutral = np.full_like(prices, prices[-1] if len(prices) > 0 else 0, dtype=float)
         return neutral, neutral * 1.02, neutral * 0.98
     
-    sma = np.convolve(prices, np.ones(period) / period, mode='valid')
+    sma = rolling_mean(prices, period)
     pad = len(prices) - len(sma)
     sma = np.pad(sma, (pad, 0), mode='edge')
     
     deviations = np.zeros_like(prices)
-    for i in range(period - 1, len(prices)):
-        deviations[i] = np.std(prices[i - period + 1:i + 1])
+    deviations[period - 1:] = rolling_std(prices, period)
     
     upper_band = sma + (deviations * std_dev)
     lower_band = sma - (deviations * std_dev)
@@ -101,8 +200,9 @@ def calculate_volatility(prices, period=20):
     returns = np.diff(np.log(prices))
     volatility = np.zeros_like(prices)
     
-    for i in range(period - 1, len(prices)):
-        volatility[i] = np.std(returns[i - period + 1:i + 1])
+    # Fenêtres complètes de rendements; la dernière barre n'a que period - 1 rendements
+    volatility[period - 1:len(prices) - 1] = rolling_std(returns, period)
+    volatility[-1] = np.std(returns[len(prices) - period:])
     
     return volatility
 
@@ -139,3 +239,404 @@ def calculate_trend(prices, period=20):
             trend[i] = 1 if slope > 0 else (-1 if slope < 0 else 0)
     
     return trend if len(trend) > 0 else np.array([0])  # Garantir non-vide
+
+
+
+# === Indicateurs incrémentaux (streaming) ===
+#
+# Chaque classe maintient l'état minimal pour reproduire le dernier point de la
+# fonction batch correspondante: update(price) coûte O(1) une fois la période
+# de chauffe passée, peek(price) retourne la valeur qu'aurait l'indicateur si
+# `price` était la prochaine clôture, sans modifier l'état. snapshot() retourne
+# un dict JSON-sérialisable (stockable via CacheManager), restore() le relit.
+
+class IncrementalEMA:
+    """EMA incrémentale - dernier point de calculate_ema"""
+    
+    def __init__(self, period):
+        self.period = period
+        self.multiplier = 2 / (period + 1)
+        self.count = 0
+        self.seed = []
+        self.value = 0.0
+    
+    @classmethod
+    def from_history(cls, prices, period):
+        ema = cls(period)
+        prices = [float(p) for p in prices]
+        ema.count = len(prices)
+        if len(prices) < period:
+            ema.seed = prices
+            ema.value = float(np.mean(prices)) if prices else 0.0
+        else:
+            ema.value = float(calculate_ema(np.array(prices), period)[-1])
+        return ema
+    
+    def _next(self, price):
+        if self.count < self.period:
+            # Chauffe: calculate_ema retourne la moyenne des premiers prix
+            return float(np.mean(self.seed + [price]))
+        return price * self.multiplier + self.value * (1 - self.multiplier)
+    
+    def update(self, price):
+        price = float(price)
+        self.value = self._next(price)
+        if self.count < self.period:
+            self.seed.append(price)
+            if len(self.seed) == self.period:
+                self.seed = []
+        self.count += 1
+        return self.value
+    
+    def peek(self, price):
+        return self._next(float(price))
+    
+    def snapshot(self):
+        return {"period": self.period, "count": self.count,
+                "seed": list(self.seed), "value": self.value}
+    
+    @classmethod
+    def restore(cls, state):
+        ema = cls(state["period"])
+        ema.count = state["count"]
+        ema.seed = list(state["seed"])
+        ema.value = state["value"]
+        return ema
+
+class IncrementalRSI:
+    """RSI de Wilder incrémental - dernier point de calculate_rsi
+    
+    Tant que la graine de calculate_rsi (period + 1 variations) n'est pas
+    complète, les prix sont gardés et la valeur est recalculée en batch
+    (au plus period + 2 points).
+    """
+    
+    def __init__(self, period=14):
+        self.period = period
+        self.warmup = []
+        self.last_price = None
+        self.up = None
+        self.down = None
+        self.value = 50.0
+    
+    @classmethod
+    def from_history(cls, prices, period=14):
+        rsi = cls(period)
+        prices = np.asarray(prices, dtype=float)
+        if len(prices) < period + 2:
+            for price in prices:
+                rsi.update(price)
+            return rsi
+        ups, downs = _wilder_averages(prices[None, :], period)
+        rsi.up, rsi.down = float(ups[0, -1]), float(downs[0, -1])
+        rsi.last_price = float(prices[-1])
+        rsi.warmup = None
+        rsi.value = rsi._rsi(rsi.up, rsi.down)
+        return rsi
+    
+    def _rsi(self, up, down):
+        rs = up / down if down != 0 else 0
+        return float(100 - 100 / (1 + rs) if rs >= 0 else 0)
+    
+    def _step(self, up, down, delta):
+        period = self.period
+        if delta > 0:
+            return (up * (period - 1) + delta) / period, down * (period - 1) / period
+        return up * (period - 1) / period, (down * (period - 1) - delta) / period
+    
+    def _bootstrap(self, prices):
+        deltas = np.diff(prices)
+        seed = deltas[:self.period + 1]
+        up = seed[seed >= 0].sum() / self.period
+        down = -seed[seed < 0].sum() / self.period
+        # calculate_rsi réapplique la dernière variation de la graine
+        return self._step(float(up), float(down), deltas[self.period])
+    
+    def update(self, price):
+        price = float(price)
+        if self.warmup is not None:
+            self.warmup.append(price)
+            if len(self.warmup) < self.period + 2:
+                self.value = float(calculate_rsi(np.array(self.warmup), self.period)[-1])
+                return self.value
+            self.up, self.down = self._bootstrap(np.array(self.warmup))
+            self.warmup = None
+        else:
+            self.up, self.down = self._step(self.up, self.down, price - self.last_price)
+        self.last_price = price
+        self.value = self._rsi(self.up, self.down)
+        return self.value
+    
+    def peek(self, price):
+        price = float(price)
+        if self.warmup is not None:
+            prices = np.array(self.warmup + [price])
+            if len(prices) < self.period + 2:
+                return float(calculate_rsi(prices, self.period)[-1])
+            return self._rsi(*self._bootstrap(prices))
+        return self._rsi(*self._step(self.up, self.down, price - self.last_price))
+    
+    def snapshot(self):
+        return {"period": self.period, "warmup": self.warmup, "last_price": self.last_price,
+                "up": self.up, "down": self.down, "value": self.value}
+    
+    @classmethod
+    def restore(cls, state):
+        rsi = cls(state["period"])
+        rsi.warmup = list(state["warmup"]) if state["warmup"] is not None else None
+        rsi.last_price = state["last_price"]
+        rsi.up, rsi.down = state["up"], state["down"]
+        rsi.value = state["value"]
+        return rsi
+
+class IncrementalMACD:
+    """MACD incrémental - derniers points de calculate_macd
+    
+    Les premières valeurs de calculate_macd dépendent de la longueur totale tant
+    qu'il y a moins de `slow` prix (EMA = moyenne de tous les prix): pendant
+    cette chauffe la valeur est recalculée en batch sur au plus `slow` points.
+    """
+    
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast, self.slow, self.signal = fast, slow, signal
+        self.warmup = []
+        self.ema_fast = None
+        self.ema_slow = None
+        self.ema_signal = None
+        self.value = (0.0, 0.0, 0.0)
+    
+    @classmethod
+    def from_history(cls, prices, fast=12, slow=26, signal=9):
+        macd = cls(fast, slow, signal)
+        prices = [float(p) for p in prices]
+        if len(prices) < max(fast, slow):
+            macd.warmup = prices
+            if prices:
+                macd.value = macd._batch(prices)
+            return macd
+        macd._bootstrap(prices)
+        return macd
+    
+    def _batch(self, prices):
+        macd_line, signal_line, histogram = calculate_macd(np.array(prices), self.fast, self.slow, self.signal)
+        return float(macd_line[-1]), float(signal_line[-1]), float(histogram[-1])
+    
+    def _bootstrap(self, prices):
+        prices = np.array(prices)
+        macd_line, signal_line, histogram = calculate_macd(prices, self.fast, self.slow, self.signal)
+        self.ema_fast = IncrementalEMA.from_history(prices, self.fast)
+        self.ema_slow = IncrementalEMA.from_history(prices, self.slow)
+        self.ema_signal = IncrementalEMA.from_history(macd_line, self.signal)
+        self.warmup = None
+        self.value = (float(macd_line[-1]), float(signal_line[-1]), float(histogram[-1]))
+    
+    def update(self, price):
+        price = float(price)
+        if self.warmup is not None:
+            self.warmup.append(price)
+            if len(self.warmup) < max(self.fast, self.slow):
+                self.value = self._batch(self.warmup)
+            else:
+                self._bootstrap(self.warmup)
+            return self.value
+        macd_value = self.ema_fast.update(price) - self.ema_slow.update(price)
+        signal_value = self.ema_signal.update(macd_value)
+        self.value = (macd_value, signal_value, macd_value - signal_value)
+        return self.value
+    
+    def peek(self, price):
+        price = float(price)
+        if self.warmup is not None:
+            return self._batch(self.warmup + [price])
+        macd_value = self.ema_fast.peek(price) - self.ema_slow.peek(price)
+        signal_value = self.ema_signal.peek(macd_value)
+        return (macd_value, signal_value, macd_value - signal_value)
+    
+    def snapshot(self):
+        return {"fast": self.fast, "slow": self.slow, "signal": self.signal,
+                "warmup": self.warmup, "value": list(self.value),
+                "ema_fast": self.ema_fast.snapshot() if self.ema_fast else None,
+                "ema_slow": self.ema_slow.snapshot() if self.ema_slow else None,
+                "ema_signal": self.ema_signal.snapshot() if self.ema_signal else None}
+    
+    @classmethod
+    def restore(cls, state):
+        macd = cls(state["fast"], state["slow"], state["signal"])
+        macd.warmup = list(state["warmup"]) if state["warmup"] is not None else None
+        macd.value = tuple(state["value"])
+        for name in ("ema_fast", "ema_slow", "ema_signal"):
+            if state[name] is not None:
+                setattr(macd, name, IncrementalEMA.restore(state[name]))
+        return macd
+
+class IncrementalBollinger:
+    """Bandes de Bollinger incrémentales - derniers points de calculate_bollinger_bands
+    
+    Somme et somme des carrés glissantes centrées sur un ancrage, ré-ancré à
+    chaque renouvellement complet de la fenêtre (coût amorti O(1)).
+    """
+    
+    def __init__(self, period=20, std_dev=2):
+        self.period = period
+        self.std_dev = std_dev
+        self.window = deque(maxlen=period)
+        self.anchor = 0.0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.since_anchor = 0
+        self.value = (0.0, 0.0, 0.0)
+    
+    @classmethod
+    def from_history(cls, prices, period=20, std_dev=2):
+        bands = cls(period, std_dev)
+        for price in list(prices)[-period:]:
+            bands.window.append(float(price))
+        bands._reanchor()
+        if bands.window:
+            bands.value = bands._bands(bands.total, bands.total_sq, bands.window[-1], len(bands.window))
+        return bands
+    
+    def _reanchor(self):
+        self.anchor = float(np.mean(self.window)) if self.window else 0.0
+        centered = np.array(self.window) - self.anchor
+        self.total = float(centered.sum())
+        self.total_sq = float((centered * centered).sum())
+        self.since_anchor = 0
+    
+    def _bands(self, total, total_sq, last_price, count):
+        if count < self.period:
+            return (last_price, last_price * 1.02, last_price * 0.98)
+        mean_centered = total / count
+        std = np.sqrt(max(total_sq / count - mean_centered * mean_centered, 0.0))
+        mid = self.anchor + mean_centered
+        return (mid, mid + std * self.std_dev, mid - std * self.std_dev)
+    
+    def _add(self, price):
+        total, total_sq = self.total, self.total_sq
+        if len(self.window) == self.period:
+            oldest = self.window[0] - self.anchor
+            total -= oldest
+            total_sq -= oldest * oldest
+        centered = price - self.anchor
+        return total + centered, total_sq + centered * centered
+    
+    def update(self, price):
+        price = float(price)
+        self.total, self.total_sq = self._add(price)
+        self.window.append(price)
+        self.since_anchor += 1
+        if self.since_anchor >= self.period:
+            self._reanchor()
+        self.value = self._bands(self.total, self.total_sq, price, len(self.window))
+        return self.value
+    
+    def peek(self, price):
+        price = float(price)
+        total, total_sq = self._add(price)
+        return self._bands(total, total_sq, price, min(len(self.window) + 1, self.period))
+    
+    def snapshot(self):
+        return {"period": self.period, "std_dev": self.std_dev,
+                "window": list(self.window), "value": list(self.value)}
+    
+    @classmethod
+    def restore(cls, state):
+        bands = cls(state["period"], state["std_dev"])
+        bands.window.extend(state["window"])
+        bands._reanchor()
+        bands.value = tuple(state["value"])
+        return bands
+
+class IncrementalIndicatorSet:
+    """RSI, MACD, Bollinger et EMA maintenus à partir des ticks d'un flux
+    
+    Les ticks d'une même barre (bar_seconds) mettent à jour la clôture de la
+    barre en cours; les indicateurs ne sont validés (update) qu'au changement de
+    barre, et latest() les évalue en peek() sur la clôture courante. Les valeurs
+    restent donc alignées sur les indicateurs batch calculés sur les bougies.
+    Thread-safe: les ticks arrivent depuis les threads WebSocket.
+    """
+    
+    def __init__(self, bar_seconds=3600, ema_period=20):
+        self.bar_seconds = bar_seconds
+        self.rsi = IncrementalRSI()
+        self.macd = IncrementalMACD()
+        self.bollinger = IncrementalBollinger()
+        self.ema = IncrementalEMA(ema_period)
+        self.current_bar = None
+        self.current_close = None
+        self.updated_at = None
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_history(cls, closes, bar_seconds=3600, ema_period=20, now=None):
+        """Initialiser depuis les clôtures historiques (la dernière = barre en cours)
+        
+        Args:
+            now: Epoch de la dernière bougie (sa barre devient la barre en cours;
+                défaut: heure de src.clock)
+        """
+        indicators = cls(bar_seconds, ema_period)
+        closes = np.asarray(closes, dtype=float)
+        if len(closes) > 0:
+            committed = closes[:-1]
+            indicators.rsi = IncrementalRSI.from_history(committed)
+            indicators.macd = IncrementalMACD.from_history(committed)
+            indicators.bollinger = IncrementalBollinger.from_history(committed)
+            indicators.ema = IncrementalEMA.from_history(committed, ema_period)
+            indicators.current_close = float(closes[-1])
+            indicators.current_bar = int((now if now is not None else clock.time()) // bar_seconds)
+        return indicators
+    
+    def on_tick(self, price, timestamp=None):
+        """Intégrer un tick de prix (timestamp en secondes epoch)"""
+        timestamp = timestamp if timestamp is not None else clock.time()
+        bar = int(timestamp // self.bar_seconds)
+        with self._lock:
+            if self.current_bar is not None and bar > self.current_bar and self.current_close is not None:
+                for indicator in (self.rsi, self.macd, self.bollinger, self.ema):
+                    indicator.update(self.current_close)
+            if self.current_bar is None or bar >= self.current_bar:
+                self.current_bar = bar
+                self.current_close = float(price)
+                self.updated_at = timestamp
+    
+    def latest(self):
+        """Dernières valeurs des indicateurs (dict) ou None sans donnée"""
+        with self._lock:
+            if self.current_close is None:
+                return None
+            price = self.current_close
+            macd_line, signal_line, histogram = self.macd.peek(price)
+            bb_mid, bb_upper, bb_lower = self.bollinger.peek(price)
+            return {
+                "price": price,
+                "rsi": self.rsi.peek(price),
+                "macd": macd_line,
+                "signal": signal_line,
+                "histogram": histogram,
+                "bb_mid": bb_mid,
+                "bb_upper": bb_upper,
+                "bb_lower": bb_lower,
+                "ema": self.ema.peek(price),
+                "updated_at": self.updated_at
+            }
+    
+    def snapshot(self):
+        with self._lock:
+            return {"bar_seconds": self.bar_seconds, "current_bar": self.current_bar,
+                    "current_close": self.current_close, "updated_at": self.updated_at,
+                    "rsi": self.rsi.snapshot(), "macd": self.macd.snapshot(),
+                    "bollinger": self.bollinger.snapshot(), "ema": self.ema.snapshot()}
+    
+    @classmethod
+    def restore(cls, state):
+        indicators = cls(state["bar_seconds"], state["ema"]["period"])
+        indicators.current_bar = state["current_bar"]
+        indicators.current_close = state["current_close"]
+        indicators.updated_at = state["updated_at"]
+        indicators.rsi = IncrementalRSI.restore(state["rsi"])
+        indicators.macd = IncrementalMACD.restore(state["macd"])
+        indicators.bollinger = IncrementalBollinger.restore(state["bollinger"])
+        indicators.ema = IncrementalEMA.restore(state["ema"])
+        return indicators
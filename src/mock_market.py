@@ -0,0 +1,94 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+Mock Market - Registre des actifs et données de repli reproductibles
+
+- ASSETS: registre central (type, prix de base, identifiant CoinGecko) utilisé
+  par src/data.py à la place des dictionnaires dupliqués
+- mock_candles: bougies horaires synthétiques déterministes. Chaque ticker a
+  son propre numpy.random.Generator seedé par (seed, ticker, profil, nombre de
+  bougies, heure de fin): une même série est identique entre reruns, sessions
+  et workers, et elle est générée une seule fois par heure puis servie par le
+  cache (une entrée par série, remplacée à chaque nouvelle heure)
+"""
+import os
+import zlib
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from src.cache import CacheManager
+
+ASSETS = {
+    "BTC": {"kind": "crypto", "base_price": 74000, "coingecko_id": "bitcoin"},
+    "ETH": {"kind": "crypto", "base_price": 2600, "coingecko_id": "ethereum"},
+    "SOL": {"kind": "crypto", "base_price": 195, "coingecko_id": "solana"},
+    "ADA": {"kind": "crypto", "base_price": 0.98, "coingecko_id": "cardano"},
+    "XRP": {"kind": "crypto", "base_price": 2.45, "coingecko_id": "ripple"},
+    "DOT": {"kind": "crypto", "base_price": 8.50, "coingecko_id": "polkadot"},
+    "EUR": {"kind": "forex", "base_price": 1.08},
+    "GBP": {"kind": "forex", "base_price": 1.27},
+    "JPY": {"kind": "forex", "base_price": 0.0067},
+    "AUD": {"kind": "forex", "base_price": 0.66},
+    "XAU": {"kind": "commodity", "base_price": 2350},
+}
+DEFAULT_BASE_PRICE = 100
+
+CRYPTO_TICKERS = [t for t, asset in ASSETS.items() if asset["kind"] == "crypto"]
+FOREX_TICKERS = [t for t, asset in ASSETS.items() if asset["kind"] == "forex"]
+COINGECKO_IDS = {t: ASSETS[t]["coingecko_id"] for t in CRYPTO_TICKERS}
+
+# Paramètres des marches aléatoires (rendement moyen, volatilité, bruit open,
+# amplitude high/low, bornes du volume)
+PROFILES = {
+    "default": {"drift": 0.0001, "volatility": 0.01, "open_noise": 0.001, "wick": 0.005,
+                "volume": (1000000, 10000000)},
+    "hourly": {"drift": 0.00001, "volatility": 0.002, "open_noise": 0.0005, "wick": 0.002,
+               "volume": (100000, 1000000)},
+}
+
+DEFAULT_SEED = int(os.getenv("MOCK_SEED", "0"))
+
+cache = CacheManager()
+
+def base_price(ticker):
+    return ASSETS.get(ticker, {}).get("base_price", DEFAULT_BASE_PRICE)
+
+def ticker_rng(ticker, *key):
+    """Generator propre au ticker, seedé par les éléments de `key` (entiers)"""
+    return np.random.default_rng([zlib.crc32(ticker.encode("utf-8")), *key])
+
+def mock_candles(ticker, num_candles, profile="default", seed=None, now=None):
+    """Bougies horaires synthétiques déterministes se terminant à l'heure courante
+
+    Args:
+        ticker: Symbole (prix de départ tiré du registre)
+        num_candles: Nombre de bougies horaires
+        profile: Clé de PROFILES
+        seed: Graine globale (défaut: MOCK_SEED)
+        now: Instant de référence (défaut: maintenant)
+
+    Returns:
+        DataFrame timestamp, open, high, low, close, volume (copie modifiable)
+    """
+    seed = DEFAULT_SEED if seed is None else seed
+    end = pd.Timestamp(now or datetime.now()).floor("h")
+    # Clé stable: une seule entrée par série, régénérée quand l'heure de fin change
+    key = f"mock_{ticker}_{num_candles}_{profile}_{seed}"
+    cached = cache.get(key)
+    if cached is not None and len(cached) and cached["timestamp"].iloc[-1] == end:
+        return cached.copy()
+
+    params = PROFILES[profile]
+    rng = ticker_rng(ticker, seed, list(PROFILES).index(profile), num_candles, int(end.timestamp()) // 3600)
+    returns = rng.normal(params["drift"], params["volatility"], num_candles)
+    prices = base_price(ticker) * np.exp(np.cumsum(returns))
+
+    data = pd.DataFrame({
+        "timestamp": pd.date_range(end=end, periods=num_candles, freq="h"),
+        "open": prices * (1 + rng.normal(0, params["open_noise"], num_candles)),
+        "high": prices * (1 + abs(rng.normal(0, params["wick"], num_candles))),
+        "low": prices * (1 - abs(rng.normal(0, params["wick"], num_candles))),
+        "close": prices,
+        "volume": rng.integers(*params["volume"], num_candles)
+    })
+    # Valide jusqu'à la prochaine heure (remplacée au premier appel de l'heure suivante)
+    cache.set(key, data, ttl=3600)
+    return data.copy()
@@ -0,0 +1,146 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+OHLCV Store - Historique de bougies persistant et incrémental
+
+Une base SQLite (mode WAL, partagée entre workers) stocke les bougies par
+(ticker, granularité, timestamp). Chaque série retient la date de son dernier
+rafraîchissement: seul l'intervalle manquant depuis ce moment est redemandé
+à l'API, puis ajouté à la fin. Toute fenêtre de N jours est une tranche de la
+même série (les vues 1J/30J/90J partagent les mêmes données).
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+import pandas as pd
+
+COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+class OHLCVStore:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS candles (
+            ticker TEXT NOT NULL,
+            granularity TEXT NOT NULL,
+            ts INTEGER NOT NULL,
+            open REAL, high REAL, low REAL, close REAL, volume REAL,
+            PRIMARY KEY (ticker, granularity, ts)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS series (
+            ticker TEXT NOT NULL,
+            granularity TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            PRIMARY KEY (ticker, granularity)
+        );
+    """
+
+    def __init__(self, db_path="data/.cache/ohlcv.sqlite3", timeout=5.0):
+        self.db_path = db_path
+        self.timeout = timeout
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(self.SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def count(self, ticker, granularity="1h"):
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM candles WHERE ticker = ? AND granularity = ?", (ticker, granularity)
+        ).fetchone()[0]
+
+    def last_timestamp(self, ticker, granularity="1h"):
+        """Dernier timestamp stocké (pd.Timestamp) ou None"""
+        ts = self._connection().execute(
+            "SELECT MAX(ts) FROM candles WHERE ticker = ? AND granularity = ?", (ticker, granularity)
+        ).fetchone()[0]
+        return None if ts is None else pd.Timestamp(ts, unit="s")
+
+    def fetched_at(self, ticker, granularity="1h"):
+        """Epoch du dernier rafraîchissement de la série, None si jamais rafraîchie"""
+        row = self._connection().execute(
+            "SELECT fetched_at FROM series WHERE ticker = ? AND granularity = ?", (ticker, granularity)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def is_stale(self, ticker, max_age, granularity="1h", now=None):
+        """Vrai si la série n'a pas été rafraîchie depuis `max_age` secondes"""
+        fetched_at = self.fetched_at(ticker, granularity)
+        return fetched_at is None or (now or time.time()) - fetched_at >= max_age
+
+    def missing_days(self, ticker, granularity="1h", now=None):
+        """Nombre de jours à redemander depuis le dernier rafraîchissement (0 si aucun)"""
+        fetched_at = self.fetched_at(ticker, granularity)
+        if fetched_at is None:
+            return None
+        elapsed = (now or time.time()) - fetched_at
+        return math.ceil(elapsed / 86400) if elapsed > 0 else 0
+
+    def append(self, ticker, df, granularity="1h", replace=False, now=None):
+        """Ajouter les bougies postérieures à la dernière bougie stockée
+
+        Args:
+            df: DataFrame avec les colonnes timestamp, open, high, low, close, volume
+            replace: Remplacer toute la série (rechargement complet plus long)
+
+        La date de rafraîchissement n'avance que si des bougies sont ajoutées:
+        une réponse sans bougie nouvelle laisse la série périmée.
+
+        Returns:
+            Nombre de bougies ajoutées
+        """
+        ts = pd.to_datetime(df["timestamp"])
+        if getattr(ts.dt, "tz", None) is not None:
+            ts = ts.dt.tz_convert("UTC").dt.tz_localize(None)
+        ts = ts.astype("datetime64[s]").astype("int64").to_numpy()
+        values = df[COLUMNS[1:]].to_numpy(dtype=float)
+
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if replace:
+                connection.execute("DELETE FROM candles WHERE ticker = ? AND granularity = ?", (ticker, granularity))
+                last = None
+            else:
+                last = connection.execute(
+                    "SELECT MAX(ts) FROM candles WHERE ticker = ? AND granularity = ?", (ticker, granularity)
+                ).fetchone()[0]
+            keep = ts > last if last is not None else slice(None)
+            rows = [(ticker, granularity, int(t), *map(float, v)) for t, v in zip(ts[keep], values[keep])]
+            if not rows:
+                connection.execute("ROLLBACK")
+                return 0
+            connection.executemany(
+                "INSERT OR REPLACE INTO candles (ticker, granularity, ts, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO series (ticker, granularity, fetched_at) VALUES (?, ?, ?)",
+                (ticker, granularity, now or time.time())
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    def read(self, ticker, granularity="1h", limit=None):
+        """Les `limit` dernières bougies (toutes si None), en ordre chronologique"""
+        query = "SELECT ts, open, high, low, close, volume FROM candles WHERE ticker = ? AND granularity = ? ORDER BY ts DESC"
+        params = [ticker, granularity]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        rows = self._connection().execute(query, params).fetchall()[::-1]
+        df = pd.DataFrame(rows, columns=COLUMNS)
+        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
+        return df
+
+ohlcv_store = OHLCVStore(os.getenv("OHLCV_DB_PATH", "data/.cache/ohlcv.sqlite3"))
@@ -0,0 +1,185 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+Optimizer - Recherche des paramètres de stratégie par backtest (grille ou aléatoire)
+
+Chaque combinaison (période RSI, seuils RSI, MACD rapide/lente/signal, période
+et écart Bollinger) est évaluée en backtestant le score composite de
+SmartSignals (achat >= BUY_SCORE, vente < SELL_SCORE) sur l'historique de
+chaque ticker.
+
+- Les clôtures de tous les tickers sont copiées une seule fois dans un segment
+  `multiprocessing.shared_memory`; les workers du ProcessPoolExecutor s'y
+  attachent au démarrage, les tâches ne transportent que les paramètres
+- Les combinaisons sont regroupées par paramètres d'indicateurs: une tâche
+  calcule RSI/MACD/Bollinger une fois puis balaie tous les seuils RSI, et
+  chaque worker garde ses indicateurs en mémoire pour les tâches suivantes
+"""
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+import pandas as pd
+from src.backtesting import HOURLY_PERIODS, run_backtest
+from src.indicators import calculate_bollinger_bands, calculate_macd, calculate_rsi, calculate_trend
+from src.trading_rules import BUY_SCORE, SELL_SCORE, composite_scores
+
+DEFAULT_SPACE = {
+    "rsi_period": [7, 14, 21],
+    "oversold": [20, 25, 30, 35],
+    "overbought": [65, 70, 75, 80],
+    "macd_fast": [8, 12],
+    "macd_slow": [21, 26],
+    "macd_signal": [9],
+    "bb_period": [20],
+    "bb_std": [2, 2.5],
+}
+PARAMS = list(DEFAULT_SPACE)
+# Paramètres des indicateurs (les seuils RSI n'en font pas partie)
+INDICATOR_PARAMS = ["rsi_period", "macd_fast", "macd_slow", "macd_signal", "bb_period", "bb_std"]
+METRICS = ["profit_percent", "sharpe", "max_drawdown", "win_rate", "closed_trades"]
+
+def _valid(combo):
+    return combo["macd_fast"] < combo["macd_slow"] and combo["oversold"] < combo["overbought"]
+
+def grid_combinations(space=None):
+    """Toutes les combinaisons valides de l'espace de paramètres"""
+    space = dict(DEFAULT_SPACE, **(space or {}))
+    combos = (dict(zip(PARAMS, values)) for values in itertools.product(*(space[p] for p in PARAMS)))
+    return [combo for combo in combos if _valid(combo)]
+
+def random_combinations(n_iter, space=None, seed=0):
+    """`n_iter` combinaisons valides distinctes tirées au hasard dans la grille"""
+    combos = grid_combinations(space)
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(len(combos), size=min(n_iter, len(combos)), replace=False)
+    return [combos[i] for i in sorted(picks)]
+
+# SharedMemory(track=False) n'existe qu'à partir de Python 3.13
+TRACK_ARGUMENT = sys.version_info >= (3, 13)
+
+# --- Worker ---
+# État propre à chaque processus: clôtures attachées et indicateurs déjà calculés
+_shared = {}
+_indicators = {}
+
+def _attach(name, shape, lengths, worker=False):
+    if worker and TRACK_ARGUMENT:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        shm = shared_memory.SharedMemory(name=name)
+        # Un worker ne doit pas libérer le segment à sa sortie (Python < 3.13): seul le créateur le détruit
+        if worker:
+            try:
+                resource_tracker.unregister(shm._name, "shared_memory")
+            except Exception:
+                pass
+    _shared.update(shm=shm, prices=np.ndarray(shape, dtype=np.float64, buffer=shm.buf), lengths=lengths)
+    _indicators.clear()
+
+def _prices(row):
+    return _shared["prices"][row, :_shared["lengths"][row]]
+
+def _indicator(row, name, *params):
+    key = (row, name, params)
+    if key not in _indicators:
+        prices = _prices(row)
+        if name == "rsi":
+            _indicators[key] = calculate_rsi(prices, *params)
+        elif name == "macd":
+            _indicators[key] = calculate_macd(prices, *params)[2]
+        elif name == "bollinger":
+            _indicators[key] = calculate_bollinger_bands(prices, *params)
+        else:
+            _indicators[key] = calculate_trend(prices, *params)
+    return _indicators[key]
+
+def _evaluate(row, indicator_params, thresholds, fee, periods_per_year):
+    """Backtester toutes les paires de seuils RSI pour un jeu d'indicateurs"""
+    params = dict(zip(INDICATOR_PARAMS, indicator_params))
+    prices = _prices(row)
+    rsi = _indicator(row, "rsi", params["rsi_period"])
+    histogram = _indicator(row, "macd", params["macd_fast"], params["macd_slow"], params["macd_signal"])
+    _, upper, lower = _indicator(row, "bollinger", params["bb_period"], params["bb_std"])
+    trend = _indicator(row, "trend", 20)
+    rows = []
+    for oversold, overbought in thresholds:
+        score = composite_scores(prices, rsi, histogram, upper, lower, trend, oversold, overbought)
+        result = run_backtest(prices, score >= BUY_SCORE, score < SELL_SCORE, fee=fee, periods_per_year=periods_per_year)
+        rows.append(dict(params, oversold=oversold, overbought=overbought, **{m: result[m] for m in METRICS}))
+    return row, rows
+
+def _tasks(combos, n_rows):
+    groups = {}
+    for combo in combos:
+        key = tuple(combo[p] for p in INDICATOR_PARAMS)
+        groups.setdefault(key, []).append((combo["oversold"], combo["overbought"]))
+    return [(row, key, thresholds) for row in range(n_rows) for key, thresholds in groups.items()]
+
+def optimize(prices, combos=None, metric="sharpe", max_workers=None, fee=0.0, periods_per_year=HOURLY_PERIODS):
+    """Évaluer des combinaisons de paramètres sur plusieurs tickers
+
+    Args:
+        prices: Dict ticker -> clôtures (array 1-D)
+        combos: Combinaisons (grid_combinations / random_combinations), défaut: grille complète
+        metric: Colonne de classement (décroissant, profit_percent en départage)
+        max_workers: Processus du pool (1 = calcul dans le processus courant)
+        fee: Frais par ordre passés à run_backtest
+
+    Returns:
+        DataFrame classé: ticker, paramètres, métriques, rank (1 = meilleur par ticker)
+    """
+    combos = grid_combinations() if combos is None else combos
+    tickers = [t for t, values in prices.items() if values is not None and len(values) > 1]
+    lengths = [len(prices[t]) for t in tickers]
+    shape = (len(tickers), max(lengths, default=1))
+    tasks = _tasks(combos, len(tickers))
+    workers = max_workers or os.cpu_count() or 1
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, shape[0] * shape[1] * 8))
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        matrix[:] = np.nan
+        for row, ticker in enumerate(tickers):
+            matrix[row, :lengths[row]] = np.asarray(prices[ticker], dtype=float)
+        del matrix
+
+        if workers == 1 or len(tasks) == 1:
+            _attach(shm.name, shape, lengths)
+            try:
+                outputs = [_evaluate(*task, fee, periods_per_year) for task in tasks]
+            finally:
+                _shared.pop("prices", None)
+                _shared.pop("shm").close()
+                _indicators.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                     initargs=(shm.name, shape, lengths, True)) as executor:
+                futures = [executor.submit(_evaluate, *task, fee, periods_per_year) for task in tasks]
+                outputs = [future.result() for future in futures]
+            if not TRACK_ARGUMENT:
+                # Le resource tracker est partagé avec les workers qui ont retiré le segment:
+                # le réinscrire pour que unlink() (qui le désinscrit) reste équilibré
+                resource_tracker.register(shm._name, "shared_memory")
+    finally:
+        shm.close()
+        shm.unlink()
+
+    table = pd.DataFrame([dict(ticker=tickers[row], **result) for row, results in outputs for result in results],
+                         columns=["ticker"] + PARAMS + METRICS)
+    table = table.sort_values(["ticker", metric, "profit_percent"], ascending=[True, False, False], kind="stable")
+    table["rank"] = table.groupby("ticker").cumcount() + 1
+    return table.reset_index(drop=True)
+
+def best_params(table):
+    """Meilleure combinaison de chaque ticker: {ticker: dict de paramètres}"""
+    best = table[table["rank"] == 1]
+    return {row["ticker"]: {p: row[p] for p in PARAMS} for _, row in best.iterrows()}
+
+if __name__ == "__main__":
+    from src.data import get_historical_data
+    from src.mock_market import ASSETS
+
+    closes = {ticker: get_historical_data(ticker, days=90)["close"].to_numpy(dtype=float) for ticker in ASSETS}
+    results = optimize(closes)
+    print(results[results["rank"] <= 3].to_string(index=False))
@@ -0,0 +1,220 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+Portfolio Backtest - Stratégie SmartSignals sur tous les tickers à la fois
+
+- Les clôtures des tickers sont alignées sur un index temporel commun (dernier
+  prix connu reporté, NaN avant la première bougie d'un ticker)
+- Le score composite de SmartSignals est calculé par ticker en arrays
+  (achat >= BUY_SCORE, vente < SELL_SCORE), avec des paramètres par ticker
+- Dimensionnement: risque de `risk_per_trade` (1-2%) du capital entre l'entrée
+  et le stop loss, au plus `max_allocation` du capital par actif; toute entrée
+  est validée par check_risk_rule_violation (2% par position, 2% de pertes
+  réalisées par jour)
+- Les résultats sont produits au fil de l'eau (générateurs): la progression
+  est publiée tous les `chunk` barres avec les trades clôturés entre-temps,
+  seuls les arrays de prix, de scores et d'équité restent en mémoire
+"""
+import numpy as np
+import pandas as pd
+from src.backtesting import HOURLY_PERIODS
+from src.educational_content import check_risk_rule_violation
+from src.indicators import calculate_bollinger_bands, calculate_macd, calculate_rsi, calculate_trend
+from src.optimizer import best_params, optimize
+from src.trading_rules import BUY_SCORE, RSI_OVERBOUGHT, RSI_OVERSOLD, SELL_SCORE, composite_scores
+
+DEFAULT_PARAMS = {
+    "rsi_period": 14, "oversold": RSI_OVERSOLD, "overbought": RSI_OVERBOUGHT,
+    "macd_fast": 12, "macd_slow": 26, "macd_signal": 9, "bb_period": 20, "bb_std": 2,
+}
+
+def align_closes(histories):
+    """Aligner les clôtures de plusieurs tickers sur un index commun
+
+    Args:
+        histories: Dict ticker -> DataFrame (timestamp, close) ou Series indexée par date
+
+    Returns:
+        (tickers, timestamps, matrice tickers x barres)
+    """
+    series = {}
+    for ticker, history in histories.items():
+        if history is None or len(history) == 0:
+            continue
+        if isinstance(history, pd.DataFrame):
+            history = pd.Series(history["close"].to_numpy(dtype=float), index=pd.to_datetime(history["timestamp"]))
+        history = history[~history.index.duplicated(keep="last")].sort_index()
+        series[ticker] = history.astype(float)
+    if not series:
+        return [], pd.DatetimeIndex([]), np.empty((0, 0))
+    frame = pd.concat(series, axis=1).sort_index().ffill()
+    return list(frame.columns), frame.index, frame.to_numpy().T
+
+def composite_matrix(tickers, matrix, params=None, stop=None):
+    """Scores composites (tickers x barres), 50 avant la première clôture d'un ticker
+
+    Args:
+        params: Dict ticker -> paramètres (clés de DEFAULT_PARAMS), défauts sinon
+        stop: Dernière barre (exclue) prise en compte: les scores ne dépendent
+            que des clôtures antérieures
+    """
+    stop = matrix.shape[1] if stop is None else stop
+    scores = np.full((len(tickers), stop), 50.0)
+    for row, ticker in enumerate(tickers):
+        p = dict(DEFAULT_PARAMS, **(params or {}).get(ticker, {}))
+        valid = np.flatnonzero(~np.isnan(matrix[row, :stop]))
+        if len(valid) == 0:
+            continue
+        start = valid[0]
+        prices = matrix[row, start:stop]
+        rsi = calculate_rsi(prices, p["rsi_period"])
+        _, _, histogram = calculate_macd(prices, p["macd_fast"], p["macd_slow"], p["macd_signal"])
+        _, upper, lower = calculate_bollinger_bands(prices, p["bb_period"], p["bb_std"])
+        scores[row, start:] = composite_scores(prices, rsi, histogram, upper, lower, calculate_trend(prices),
+                                               p["oversold"], p["overbought"])
+    return scores
+
+def run_portfolio(tickers, timestamps, matrix, scores, start=0, stop=None, initial_balance=10000,
+                  risk_per_trade=0.01, stop_loss=0.05, max_allocation=0.10, fee=0.0, chunk=500,
+                  periods_per_year=HOURLY_PERIODS):
+    """Simuler le portefeuille barre par barre (générateur)
+
+    Args:
+        tickers, timestamps, matrix: Sortie de align_closes
+        scores: Sortie de composite_matrix (même forme que matrix, ou tronquée à stop)
+        start, stop: Barres simulées [start, stop)
+        risk_per_trade: Fraction du capital risquée jusqu'au stop loss (0.01-0.02)
+        stop_loss: Distance du stop loss sous le prix d'entrée (fraction)
+        max_allocation: Fraction maximale du capital par actif
+        fee: Frais proportionnels par ordre
+        chunk: Barres entre deux événements de progression
+
+    Yields:
+        {"type": "progress", ...} tous les `chunk` barres (trades clôturés depuis
+        le précédent événement inclus), puis {"type": "summary", ...}
+    """
+    stop = matrix.shape[1] if stop is None else stop
+    n_tickers = len(tickers)
+    cash = float(initial_balance)
+    units = np.zeros(n_tickers)
+    entry_price = np.zeros(n_tickers)
+    entry_time = [None] * n_tickers
+    equity = np.empty(max(0, stop - start))
+    pending, closed = [], []
+    day, daily_loss = None, 0.0
+
+    for t in range(start, stop):
+        prices = matrix[:, t]
+        valid = ~np.isnan(prices)
+        marked = np.where(valid, prices, entry_price)
+        timestamp = timestamps[t]
+        if timestamp.date() != day:
+            day, daily_loss = timestamp.date(), 0.0
+
+        # Sorties: signal de vente ou stop loss touché à la clôture
+        held = units > 0
+        exits = held & valid & ((scores[:, t] < SELL_SCORE) | (prices <= entry_price * (1 - stop_loss)))
+        for row in np.flatnonzero(exits):
+            proceeds = units[row] * prices[row] * (1 - fee)
+            pnl = proceeds - units[row] * entry_price[row] * (1 + fee)
+            cash += proceeds
+            daily_loss += max(0.0, -pnl)
+            trade = {
+                "ticker": tickers[row], "entry_time": entry_time[row], "exit_time": timestamp,
+                "entry_price": float(entry_price[row]), "exit_price": float(prices[row]), "units": float(units[row]),
+                "pnl": float(pnl), "return": float(prices[row] / entry_price[row] - 1),
+                "reason": "stop" if prices[row] <= entry_price[row] * (1 - stop_loss) else "signal"
+            }
+            pending.append(trade)
+            closed.append(trade["pnl"])
+            units[row] = 0.0
+
+        # Entrées: signal d'achat, taille limitée par le risque, l'allocation et le cash
+        total = cash + float(units @ marked)
+        for row in np.flatnonzero((units == 0) & valid & (scores[:, t] >= BUY_SCORE)):
+            price = prices[row]
+            size = min(total * risk_per_trade / (price * stop_loss), total * max_allocation / price,
+                       cash / (price * (1 + fee)))
+            if size <= 0 or check_risk_rule_violation(size * price * stop_loss, total, daily_loss):
+                continue
+            cash -= size * price * (1 + fee)
+            units[row] = size
+            entry_price[row] = price
+            entry_time[row] = timestamp
+
+        equity[t - start] = cash + float(units @ np.where(valid, prices, entry_price))
+        done = t - start + 1
+        if done % chunk == 0 and t + 1 < stop:
+            yield {"type": "progress", "index": t, "timestamp": timestamp, "progress": done / (stop - start),
+                   "equity": float(equity[t - start]), "open_positions": int((units > 0).sum()), "trades": pending}
+            pending = []
+
+    final_balance = float(equity[-1]) if len(equity) else float(initial_balance)
+    returns = np.diff(equity, prepend=initial_balance) / np.concatenate(([initial_balance], equity[:-1])) if len(equity) else equity
+    deviation = returns.std() if len(returns) else 0.0
+    drawdown = equity / np.maximum.accumulate(equity) - 1 if len(equity) else equity
+    closed = np.array(closed)
+    yield {
+        "type": "summary",
+        "trades": pending,
+        "timestamps": timestamps[start:stop],
+        "equity": equity,
+        "initial_balance": float(initial_balance),
+        "final_balance": final_balance,
+        "profit_percent": (final_balance - initial_balance) / initial_balance * 100,
+        "max_drawdown": float(drawdown.min() * 100) if len(drawdown) else 0.0,
+        "sharpe": float(returns.mean() / deviation * np.sqrt(periods_per_year)) if deviation > 0 else 0.0,
+        "total_trades": len(closed),
+        "win_rate": float((closed > 0).mean() * 100) if len(closed) else 0.0,
+        "open_positions": {tickers[row]: float(units[row]) for row in np.flatnonzero(units > 0)},
+    }
+
+def backtest_portfolio(histories, params=None, **kwargs):
+    """Backtest de portefeuille sur tout l'historique (générateur, voir run_portfolio)"""
+    tickers, timestamps, matrix = align_closes(histories)
+    scores = composite_matrix(tickers, matrix, params)
+    yield from run_portfolio(tickers, timestamps, matrix, scores, **kwargs)
+
+def walk_forward_splits(n_bars, train_bars, test_bars, step=None):
+    """Fenêtres (train, test) glissantes: [(slice train, slice test), ...]
+
+    La fenêtre de test suit immédiatement celle d'entraînement; les fenêtres
+    avancent de `step` barres (défaut: test_bars, tests contigus sans recouvrement).
+    """
+    step = step or test_bars
+    splits = []
+    start = 0
+    while start + train_bars + test_bars <= n_bars:
+        splits.append((slice(start, start + train_bars), slice(start + train_bars, start + train_bars + test_bars)))
+        start += step
+    return splits
+
+def walk_forward(histories, train_bars, test_bars, combos=None, metric="sharpe", max_workers=1, step=None, **kwargs):
+    """Walk-forward: paramètres optimisés sur chaque fenêtre d'entraînement, testés sur la suivante
+
+    Args:
+        combos: Combinaisons à évaluer (src.optimizer); None = paramètres par défaut
+        metric: Critère de choix des paramètres sur l'entraînement
+        max_workers: Processus de l'optimiseur
+        kwargs: Options de run_portfolio (initial_balance, risk_per_trade, ...)
+
+    Yields:
+        Événements de progression de run_portfolio (avec 'split'), puis pour
+        chaque fenêtre {"type": "split", ...} avec les paramètres retenus et le
+        résumé du test. Le capital final d'un test est le capital initial du suivant.
+    """
+    tickers, timestamps, matrix = align_closes(histories)
+    balance = kwargs.pop("initial_balance", 10000)
+    for number, (train, test) in enumerate(walk_forward_splits(len(timestamps), train_bars, test_bars, step)):
+        params = None
+        if combos:
+            closes = {t: matrix[row, train][~np.isnan(matrix[row, train])] for row, t in enumerate(tickers)}
+            params = best_params(optimize(closes, combos, metric=metric, max_workers=max_workers))
+        # Indicateurs calculés sur tout le passé disponible jusqu'à la fin du test (causaux)
+        scores = composite_matrix(tickers, matrix, params, stop=test.stop)
+        for event in run_portfolio(tickers, timestamps, matrix, scores, start=test.start, stop=test.stop,
+                                   initial_balance=balance, **kwargs):
+            event["split"] = number
+            if event["type"] == "summary":
+                balance = event["final_balance"]
+                event.update(type="split", params=params, train=(timestamps[train.start], timestamps[train.stop - 1]),
+                             test=(timestamps[test.start], timestamps[test.stop - 1]))
+            yield event
@@ -0,0 +1,129 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+Price Arbiter - Choix de la source de prix selon la fraîcheur
+
+Chaque source temps réel (flux WebSocket) fournit son dernier tick avec
+l'heure de réception (`updated_at`). L'arbitre ignore les ticks plus vieux que
+le budget de fraîcheur, puis retient le plus frais (âge + latence de la source)
+ou la médiane des sources fraîches. Si toutes les sources sont périmées,
+select() renvoie None et l'appelant se rabat sur l'API REST.
+"""
+import os
+import threading
+from datetime import datetime
+import numpy as np
+from src import clock
+
+# Âge maximal (secondes) d'un tick pour être utilisé
+STALENESS_BUDGET = float(os.getenv("PRICE_STALENESS_BUDGET", "5"))
+# 'freshest' (source la plus fraîche) ou 'median' (médiane des sources fraîches)
+ARBITRATION_MODE = os.getenv("PRICE_ARBITRATION", "freshest")
+
+class LatencyTracker:
+    """Moyenne mobile exponentielle d'une latence (secondes)"""
+
+    def __init__(self, alpha=0.2):
+        self.alpha = alpha
+        self.value = 0.0
+        self.samples = 0
+
+    def record(self, seconds):
+        # Horloges non synchronisées: une latence négative compte pour 0
+        seconds = max(0.0, float(seconds))
+        self.value = seconds if self.samples == 0 else self.value + self.alpha * (seconds - self.value)
+        self.samples += 1
+
+class PriceArbiter:
+    def __init__(self, staleness_budget=STALENESS_BUDGET, mode=ARBITRATION_MODE, clock=None):
+        """
+        Args:
+            staleness_budget: Âge maximal (secondes) d'un tick utilisable
+            mode: 'freshest' ou 'median'
+            clock: Horloge propre à cet arbitre (None = horloge courante de src.clock)
+        """
+        self.staleness_budget = staleness_budget
+        self.mode = mode
+        self.clock = clock
+        self._sources = {}
+        self._latency = {}
+        self._selected = {}
+        self._lock = threading.Lock()
+
+    def add_source(self, name, reader):
+        """Enregistrer une source
+
+        Args:
+            name: Nom renvoyé dans le champ 'source' (ex: 'binance-websocket')
+            reader: Fonction ticker -> dict (price, updated_at, bid, ask,
+                volume, latency optionnels) ou None
+        """
+        with self._lock:
+            self._sources[name] = reader
+            self._latency.setdefault(name, LatencyTracker())
+
+    def record_latency(self, name, seconds):
+        """Mesurer la latence d'une source (ex: durée d'une requête REST)"""
+        with self._lock:
+            tracker = self._latency.setdefault(name, LatencyTracker())
+            tracker.record(seconds)
+
+    def latency(self, name):
+        with self._lock:
+            tracker = self._latency.get(name)
+            return tracker.value if tracker else 0.0
+
+    def quotes(self, ticker, now=None):
+        """Dernier prix de chaque source (périmées comprises), avec âge et latence"""
+        now = now or (self.clock or clock).time()
+        with self._lock:
+            sources = list(self._sources.items())
+        quotes = []
+        for name, reader in sources:
+            try:
+                tick = reader(ticker)
+            except Exception:
+                tick = None
+            if not tick or not tick.get("price", 0) > 0 or tick.get("updated_at") is None:
+                continue
+            quotes.append({
+                "ticker": ticker,
+                "price": float(tick["price"]),
+                "volume": float(tick.get("volume", 0) or 0),
+                "bid": float(tick.get("bid", 0) or 0),
+                "ask": float(tick.get("ask", 0) or 0),
+                "timestamp": datetime.fromtimestamp(tick["updated_at"]),
+                "updated_at": float(tick["updated_at"]),
+                "source": name,
+                "age": max(0.0, now - tick["updated_at"]),
+                "latency": float(tick.get("latency", self.latency(name)))
+            })
+        return quotes
+
+    def select(self, ticker, now=None):
+        """Prix arbitré du ticker, ou None si aucune source n'est assez fraîche
+
+        Returns:
+            dict de prix avec 'source', 'age' (secondes) et 'latency'
+        """
+        fresh = [q for q in self.quotes(ticker, now) if q["age"] <= self.staleness_budget]
+        if not fresh:
+            return None
+        fresh.sort(key=lambda q: q["age"] + q["latency"])
+        result = dict(fresh[0])
+        if self.mode == "median" and len(fresh) > 1:
+            result["price"] = float(np.median([q["price"] for q in fresh]))
+            result["source"] = "median(" + ",".join(q["source"] for q in fresh) + ")"
+            result["age"] = max(q["age"] for q in fresh)
+        result["candidates"] = len(fresh)
+        with self._lock:
+            self._selected[result["source"]] = self._selected.get(result["source"], 0) + 1
+        return result
+
+    def get_stats(self):
+        """Latence moyenne par source et nombre de sélections"""
+        with self._lock:
+            return {
+                "latency": {name: tracker.value for name, tracker in self._latency.items()},
+                "selected": dict(self._selected),
+                "staleness_budget": self.staleness_budget,
+                "mode": self.mode
+            }
@@ -0,0 +1,199 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+Price Board - Tableau des derniers prix en mémoire partagée
+
+Un seul processus d'ingestion (`python -m src.price_board`) maintient les flux
+WebSocket et écrit le prix arbitré de chaque ticker dans un segment
+`multiprocessing.shared_memory`. Tous les workers Streamlit lisent ce segment:
+une lecture est une simple copie mémoire, sans verrou ni connexion aux bourses.
+
+Disposition fixe (float64): une ligne d'en-tête (magic, version, nombre de
+tickers, heartbeat de l'écrivain) puis une ligne par ticker du registre
+ASSETS, dans l'ordre du registre:
+    seq, price, bid, ask, volume, updated_at, latency, source
+Chaque ligne est protégée par un seqlock: l'écrivain (unique) passe `seq` à
+une valeur impaire, écrit les champs puis repasse `seq` à une valeur paire; un
+lecteur recommence si `seq` est impair ou a changé pendant sa copie.
+"""
+import os
+import time
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from src.mock_market import ASSETS, CRYPTO_TICKERS
+
+BOARD_NAME = os.getenv("PRICE_BOARD_NAME", "eloadx_price_board")
+TICKERS = list(ASSETS)
+SOURCES = ["binance-websocket", "coinbase-websocket", "coincap-websocket", "coingecko-api", "fallback-cache", "median"]
+FIELDS = ("seq", "price", "bid", "ask", "volume", "updated_at", "latency", "source")
+SEQ, PRICE, BID, ASK, VOLUME, UPDATED_AT, LATENCY, SOURCE = range(len(FIELDS))
+MAGIC = 0x50424F415244  # "PBOARD"
+VERSION = 1
+READ_RETRIES = 100
+HEARTBEAT = 3
+
+# Segments créés par ce processus (ou son parent forké): suivis par le resource tracker partagé
+_created = set()
+
+class PriceBoard:
+    def __init__(self, name=BOARD_NAME, create=False):
+        """
+        Args:
+            name: Nom du segment de mémoire partagée
+            create: Créer le segment (processus d'ingestion) au lieu de s'y attacher
+
+        Raises:
+            FileNotFoundError: Segment absent (aucun processus d'ingestion)
+        """
+        size = (len(TICKERS) + 1) * len(FIELDS) * 8
+        self.owner = create
+        if create:
+            try:
+                stale = shared_memory.SharedMemory(name=name)
+                stale.close()
+                stale.unlink()
+            except FileNotFoundError:
+                pass
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            _created.add(name)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            # Un lecteur ne doit pas détruire le segment à sa sortie (Python < 3.13)
+            if name not in _created:
+                try:
+                    resource_tracker.unregister(self.shm._name, "shared_memory")
+                except Exception:
+                    pass
+        self.table = np.ndarray((len(TICKERS) + 1, len(FIELDS)), dtype=np.float64, buffer=self.shm.buf)
+        if create:
+            self.table[:] = 0
+            self.table[0, :3] = (MAGIC, VERSION, len(TICKERS))
+        elif self.table[0, 0] != MAGIC or self.table[0, 1] != VERSION or self.table[0, 2] != len(TICKERS):
+            self.close()
+            raise ValueError(f"Disposition du segment {name} incompatible")
+        self._rows = {ticker: i + 1 for i, ticker in enumerate(TICKERS)}
+
+    def heartbeat(self):
+        """Signaler aux lecteurs que l'écrivain est vivant"""
+        self.table[0, HEARTBEAT] = time.time()
+
+    def writer_age(self):
+        """Secondes depuis le dernier heartbeat de l'écrivain"""
+        return time.time() - self.table[0, HEARTBEAT]
+
+    def write(self, ticker, quote):
+        """Publier le prix d'un ticker (un seul écrivain par segment)"""
+        row = self.table[self._rows[ticker]]
+        source = (quote.get("source") or "").split("(")[0]
+        seq = row[SEQ]
+        row[SEQ] = seq + 1
+        row[PRICE:] = (
+            quote["price"],
+            quote.get("bid", 0) or 0,
+            quote.get("ask", 0) or 0,
+            quote.get("volume", 0) or 0,
+            quote.get("updated_at") or time.time() - (quote.get("age") or 0),
+            quote.get("latency", 0) or 0,
+            SOURCES.index(source) if source in SOURCES else -1
+        )
+        row[SEQ] = seq + 2
+
+    def read(self, ticker, max_age=None, now=None):
+        """Dernier prix publié du ticker (dict), None si absent, périmé ou illisible"""
+        index = self._rows.get(ticker)
+        if index is None:
+            return None
+        for _ in range(READ_RETRIES):
+            seq = self.table[index, SEQ]
+            if seq % 2:
+                continue
+            row = self.table[index].copy()
+            if row[SEQ] == seq and self.table[index, SEQ] == seq:
+                break
+        else:
+            return None
+        if seq == 0 or row[PRICE] <= 0:
+            return None
+        age = max(0.0, (now or time.time()) - row[UPDATED_AT])
+        if max_age is not None and age > max_age:
+            return None
+        return {
+            "ticker": ticker,
+            "price": float(row[PRICE]),
+            "bid": float(row[BID]),
+            "ask": float(row[ASK]),
+            "volume": float(row[VOLUME]),
+            "updated_at": float(row[UPDATED_AT]),
+            "age": age,
+            "latency": float(row[LATENCY]),
+            "source": SOURCES[int(row[SOURCE])] if row[SOURCE] >= 0 else "unknown"
+        }
+
+    def snapshot(self, max_age=None):
+        """Dernier prix de chaque ticker publié: {ticker: dict}"""
+        quotes = {ticker: self.read(ticker, max_age) for ticker in TICKERS}
+        return {ticker: quote for ticker, quote in quotes.items() if quote}
+
+    def close(self):
+        self.table = None
+        self.shm.close()
+
+    def unlink(self):
+        """Détruire le segment (processus d'ingestion uniquement)"""
+        self.shm.unlink()
+        _created.discard(self.shm.name)
+
+_reader = None
+_reader_checked = 0.0
+ATTACH_RETRY = 30.0
+
+def get_board_reader():
+    """PriceBoard attaché en lecture, None si aucun processus d'ingestion
+
+    Une tentative d'attachement échouée n'est retentée qu'après ATTACH_RETRY
+    secondes. Un segment dont l'écrivain ne donne plus signe de vie est
+    abandonné (le processus d'ingestion a pu redémarrer sur un nouveau segment).
+    """
+    global _reader, _reader_checked
+    if _reader is not None and _reader.writer_age() > ATTACH_RETRY:
+        _reader.close()
+        _reader = None
+        _reader_checked = 0.0
+    if _reader is None and time.time() - _reader_checked >= ATTACH_RETRY:
+        _reader_checked = time.time()
+        try:
+            _reader = PriceBoard()
+        except (FileNotFoundError, ValueError):
+            _reader = None
+    return _reader
+
+def run_ingest(interval=0.25, name=BOARD_NAME, tickers=None, iterations=None):
+    """Processus d'ingestion: flux WebSocket -> arbitrage -> mémoire partagée
+
+    Args:
+        interval: Secondes entre deux publications
+        tickers: Tickers publiés (défaut: toutes les cryptos du registre)
+        iterations: Nombre de publications (None = sans fin)
+    """
+    from src.data import price_arbiter
+    from src.websocket_feeds import cleanup_feeds, get_coinbase_feed, initialize_realtime_feeds
+
+    tickers = tickers or CRYPTO_TICKERS
+    board = PriceBoard(name, create=True)
+    initialize_realtime_feeds()
+    get_coinbase_feed().start_ticker_feed([f"{t}-USD" for t in tickers])
+    try:
+        count = 0
+        while iterations is None or count < iterations:
+            board.heartbeat()
+            for ticker in tickers:
+                quote = price_arbiter.select(ticker)
+                if quote:
+                    board.write(ticker, quote)
+            count += 1
+            time.sleep(interval)
+    finally:
+        cleanup_feeds()
+        board.close()
+        board.unlink()
+
+if __name__ == "__main__":
+    run_ingest(interval=float(os.getenv("PRICE_BOARD_INTERVAL", "0.25")))
@@ -15,10 +15,10 @@ Stack robustes de fallbacks (api3.txt):
 ✅ 100% gratuit et légal
 """
 
-import requests
 import feedparser
 from datetime import datetime, timedelta
 from src.cache import CacheManager
+from src.http_client import http_get
 import re
 from html.parser import HTMLParser
 
@@ -55,7 +55,7 @@ def get_free_crypto_news_api(limit=10):
     """
     try:
         url = "https://free-crypto-news-api.vercel.app/api/news"
-        response = requests.get(url, timeout=10)
+        response = http_get(url, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -95,7 +95,7 @@ def get_newsapi_crypto_news(limit=10):
         api_key = "demo"  # À remplacer par clé réelle
         url = f"https://newsapi.org/v2/everything?q=crypto cryptocurrency bitcoin&sortBy=publishedAt&language=en&pageSize={limit}&apiKey={api_key}"
         
-        response = requests.get(url, timeout=10)
+        response = http_get(url, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -189,7 +189,7 @@ def get_coingecko_trending():
     """Fetch trending coins from CoinGecko - real market data"""
     try:
         url = "https://api.coingecko.com/api/v3/search/trending"
-        response = requests.get(url, timeout=10)
+        response = http_get(url, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
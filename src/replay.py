@@ -0,0 +1,172 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+Replay - Rejouer des ticks/bougies historiques dans le chemin de signaux live
+
+Les événements stockés (ticks, ou bougies OHLCV découpées en ticks) passent par
+les mêmes composants que la production:
+- TickStore + PriceArbiter: le prix retenu est celui de l'arbitre, dont la
+  fraîcheur est jugée sur l'horloge simulée (src.clock)
+- IncrementalIndicatorSet: RSI/MACD/Bollinger/EMA mis à jour tick par tick
+- check_alerts sur le RSI live, comme le dashboard
+- SmartSignals (mode last_only) sur la fenêtre de clôtures horaires à chaque changement de barre
+
+L'horloge simulée est propre au moteur (arbitre, horodatage des signaux et
+alertes): l'horloge globale n'est jamais remplacée, le reste de l'application
+garde l'heure système même quand le générateur est suspendu. `speed` règle l'accélération (1000 = 1000x le temps réel, None = aussi vite que
+possible); le rapport donne le débit en événements par seconde.
+"""
+import heapq
+import time
+from collections import deque
+import numpy as np
+import pandas as pd
+from src import clock
+from src.alerts import check_alerts
+from src.indicators import IncrementalIndicatorSet
+from src.price_arbiter import PriceArbiter
+from src.tick_store import TickStore
+from src.trading_rules import SmartSignals
+
+# Clôtures horaires conservées pour SmartSignals (30 jours, comme le dashboard)
+HISTORY_BARS = 720
+
+def _epoch(timestamps):
+    """Secondes epoch (float) depuis des datetimes naïfs locaux ou des nombres"""
+    values = np.asarray(timestamps)
+    if values.dtype.kind in "iuf":
+        return values.astype(float)
+    return np.array([t.timestamp() for t in pd.to_datetime(values).to_pydatetime()])
+
+def tick_events(ticker, prices, timestamps, volumes=None):
+    """Événements (timestamp, ticker, prix, volume) depuis des ticks stockés"""
+    timestamps = _epoch(timestamps)
+    volumes = np.zeros(len(timestamps)) if volumes is None else np.asarray(volumes, dtype=float)
+    return [(float(t), ticker, float(p), float(v)) for t, p, v in zip(timestamps, prices, volumes)]
+
+def candle_events(ticker, candles, bar_seconds=3600):
+    """Découper des bougies OHLCV en 4 ticks: open, extrême, extrême, close
+
+    Bougie haussière: open, low, high, close; baissière: open, high, low, close.
+    Le close tombe juste avant la fin de la barre pour que la bougie se ferme
+    au premier tick de la suivante, comme en production.
+    """
+    starts = _epoch(candles["timestamp"])
+    quarter = bar_seconds / 4
+    volume = candles["volume"].to_numpy(dtype=float) / 4 if "volume" in candles else np.zeros(len(candles))
+    rising = candles["close"].to_numpy() >= candles["open"].to_numpy()
+    first = np.where(rising, candles["low"], candles["high"])
+    second = np.where(rising, candles["high"], candles["low"])
+    events = []
+    for i, start in enumerate(starts):
+        for k, price in enumerate((candles["open"].iat[i], first[i], second[i], candles["close"].iat[i])):
+            offset = bar_seconds - 1 if k == 3 else k * quarter
+            events.append((float(start + offset), ticker, float(price), float(volume[i])))
+    return events
+
+def merge_events(*streams):
+    """Fusionner des flux d'événements triés en un seul flux chronologique"""
+    return heapq.merge(*streams, key=lambda event: event[0])
+
+class ReplayEngine:
+    def __init__(self, speed=1000.0, bar_seconds=3600, history_bars=HISTORY_BARS, staleness_budget=5.0):
+        """
+        Args:
+            speed: Accélération par rapport au temps réel (None = sans attente)
+            bar_seconds: Durée d'une barre des indicateurs et des signaux
+            history_bars: Clôtures conservées pour SmartSignals (None = toutes)
+            staleness_budget: Budget de fraîcheur de l'arbitre (secondes simulées)
+        """
+        self.speed = speed
+        self.bar_seconds = bar_seconds
+        self.history_bars = history_bars
+        self.clock = clock.SimulatedClock()
+        self.store = TickStore("replay", capacity=64)
+        self.arbiter = PriceArbiter(staleness_budget=staleness_budget, clock=self.clock)
+        self.arbiter.add_source("replay", self.store.latest)
+        self.indicators = {}
+        self.closes = {}
+        self._active = {}
+
+    def warmup(self, ticker, closes, now):
+        """Initialiser un ticker sur ses clôtures horaires (la dernière = barre en cours à `now`)"""
+        closes = np.asarray(closes, dtype=float)
+        self.indicators[ticker] = IncrementalIndicatorSet.from_history(closes, self.bar_seconds, now=now)
+        self.closes[ticker] = deque(closes[:-1], maxlen=self.history_bars)
+        self.clock.set(now)
+
+    def _on_tick(self, timestamp, ticker, price, volume):
+        self.clock.set(timestamp)
+        self.store.append(ticker, price, volume=volume, timestamp=timestamp)
+        quote = self.arbiter.select(ticker)
+        if quote is None:
+            return
+        price = quote["price"]
+        indicators = self.indicators.get(ticker)
+        if indicators is None:
+            indicators = self.indicators[ticker] = IncrementalIndicatorSet(self.bar_seconds)
+            self.closes[ticker] = deque(maxlen=self.history_bars)
+        previous_bar, previous_close = indicators.current_bar, indicators.current_close
+        indicators.on_tick(price, timestamp)
+
+        # Barre clôturée: signal SmartSignals sur la fenêtre de clôtures, comme le dashboard
+        if previous_bar is not None and indicators.current_bar > previous_bar:
+            window = self.closes[ticker]
+            window.append(previous_close)
+            signals = SmartSignals(np.fromiter(window, dtype=float, count=len(window)), last_only=True)
+            yield {
+                "type": "signal",
+                "ticker": ticker,
+                "timestamp": self.clock.now(),
+                "bar": previous_bar,
+                "price": previous_close,
+                "score": signals.get_composite_signal(),
+                "signal": signals.get_signal_text()
+            }
+
+        # Alertes sur le RSI live; seules les alertes qui s'activent sont émises
+        latest = indicators.latest()
+        alerts = check_alerts(ticker, float(latest["rsi"]), price) if latest else []
+        active = {alert["type"] for alert in alerts}
+        for alert in alerts:
+            if alert["type"] not in self._active.get(ticker, ()):
+                yield dict(alert, timestamp=self.clock.now(), price=price)
+        self._active[ticker] = active
+
+    def stream(self, events):
+        """Rejouer les événements (timestamp, ticker, prix, volume) triés (générateur)
+
+        Yields:
+            Signaux ({"type": "signal", ...}) et alertes (dicts de check_alerts
+            avec timestamp et prix), dans l'ordre du temps simulé
+        """
+        self.count = 0
+        self.started = time.perf_counter()
+        first = None
+        for timestamp, ticker, price, volume in events:
+            if first is None:
+                first = timestamp
+            if self.speed:
+                delay = (timestamp - first) / self.speed - (time.perf_counter() - self.started)
+                if delay > 0:
+                    time.sleep(delay)
+            self.count += 1
+            yield from self._on_tick(timestamp, ticker, price, volume)
+        self.simulated = 0.0 if first is None else self.clock.time() - first
+
+    def run(self, events):
+        """Rejouer tous les événements et retourner le rapport
+
+        Returns:
+            dict: events, seconds, events_per_sec, simulated_seconds,
+            acceleration, signals, alerts
+        """
+        outputs = list(self.stream(events))
+        seconds = time.perf_counter() - self.started
+        return {
+            "events": self.count,
+            "seconds": seconds,
+            "events_per_sec": self.count / seconds if seconds > 0 else 0.0,
+            "simulated_seconds": self.simulated,
+            "acceleration": self.simulated / seconds if seconds > 0 else 0.0,
+            "signals": [o for o in outputs if o["type"] == "signal"],
+            "alerts": [o for o in outputs if o["type"] != "signal"]
+        }
@@ -0,0 +1,93 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+Rolling Statistics - Fenêtres glissantes O(n) pour les indicateurs
+
+Toutes les fonctions retournent un array de longueur len(values) - window + 1
+(fenêtres complètes uniquement), aligné comme np.convolve(mode='valid'):
+l'élément k correspond à la fenêtre values[k:k + window].
+"""
+import numpy as np
+
+# Taille minimale des blocs entre deux ré-ancrages des sommes cumulées
+# (le bloc effectif est max(ANCHOR_BLOCK, 4 * window))
+ANCHOR_BLOCK = 64
+
+# En dessous de cette taille, rolling_std calcule chaque fenêtre directement
+SMALL_WINDOW = 8
+
+def _windows_or_empty(values, window):
+    values = np.asarray(values, dtype=float)
+    if window < 1:
+        raise ValueError("window doit être >= 1")
+    return values, max(0, len(values) - window + 1)
+
+def _rolling_sums(values, window):
+    """Sommes glissantes et sommes des carrés des écarts à la moyenne de fenêtre
+
+    Les sommes cumulées sont recalculées à chaque bloc autour de la moyenne du
+    bloc. Des blocs courts (quelques fenêtres) gardent les écarts à l'ancrage du
+    même ordre que l'écart-type de la fenêtre, ce qui évite la perte de
+    précision du calcul E[x²] - E[x]² sur les séries en tendance. Le coût reste
+    O(n): chaque bloc ne relit que window - 1 points du précédent.
+    """
+    values, count = _windows_or_empty(values, window)
+    sums = np.empty(count)
+    squares = np.empty(count)
+    block = max(ANCHOR_BLOCK, 4 * window)
+    for start in range(0, count, block):
+        stop = min(start + block, count)
+        segment = values[start:stop + window - 1]
+        anchor = segment.mean()
+        centered = segment - anchor
+        csum = np.concatenate(([0.0], np.cumsum(centered)))
+        csq = np.concatenate(([0.0], np.cumsum(centered * centered)))
+        window_sums = csum[window:] - csum[:-window]
+        sums[start:stop] = window_sums + anchor * window
+        squares[start:stop] = (csq[window:] - csq[:-window]) - window_sums ** 2 / window
+    return sums, squares
+
+def rolling_mean(values, window):
+    """Moyenne glissante sur `window` points"""
+    values, count = _windows_or_empty(values, window)
+    if not np.isfinite(values).all():
+        # Une valeur non finie contaminerait les sommes cumulées de tout le bloc
+        return np.lib.stride_tricks.sliding_window_view(values, window).mean(axis=1) if count else np.empty(0)
+    sums, _ = _rolling_sums(values, window)
+    return sums / window
+
+def rolling_std(values, window):
+    """Écart-type glissant (population, ddof=0, comme np.std)"""
+    values, count = _windows_or_empty(values, window)
+    if window == 1:
+        return np.zeros(count)
+    if window < SMALL_WINDOW or not np.isfinite(values).all():
+        # Petites fenêtres: l'écart-type peut être infime devant le niveau des
+        # prix, le calcul direct (O(n * window) avec window borné) reste exact
+        return np.lib.stride_tricks.sliding_window_view(values, window).std(axis=1) if count else np.empty(0)
+    _, squares = _rolling_sums(values, window)
+    return np.sqrt(np.maximum(squares, 0) / window)
+
+def _rolling_extreme(values, window, ufunc, fill):
+    """Min/max glissant par l'algorithme de van Herk / Gil-Werman
+
+    Préfixes et suffixes cumulés par blocs de `window` points: chaque fenêtre
+    chevauche au plus deux blocs, son extremum est donc
+    ufunc(suffixe[k], préfixe[k + window - 1]).
+    """
+    values, count = _windows_or_empty(values, window)
+    if count == 0:
+        return np.empty(0)
+    n_blocks = -(-len(values) // window)
+    padded = np.full(n_blocks * window, fill)
+    padded[:len(values)] = values
+    blocks = padded.reshape(n_blocks, window)
+    prefix = ufunc.accumulate(blocks, axis=1).ravel()
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    return ufunc(suffix[:count], prefix[window - 1:window - 1 + count])
+
+def rolling_min(values, window):
+    """Minimum glissant sur `window` points"""
+    return _rolling_extreme(values, window, np.minimum, np.inf)
+
+def rolling_max(values, window):
+    """Maximum glissant sur `window` points"""
+    return _rolling_extreme(values, window, np.maximum, -np.inf)
@@ -0,0 +1,161 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+Cache Serializers - Formats disque du CacheManager
+
+- DataFrames: Arrow/Feather non compressé (lecture memory-mappée) si pyarrow
+  est installé, sinon .npz colonne par colonne
+- Arrays NumPy: .npy (lecture memory-mappée, copy-on-write)
+- Le reste (dicts, listes, scalaires): JSON, datetimes compris
+"""
+import io
+import json
+import os
+import tempfile
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+def _atomic_write(path, write):
+    """Écrire via un fichier temporaire puis os.replace (jamais de fichier partiel)
+
+    Args:
+        write: Fonction recevant le fichier binaire ouvert en écriture
+    """
+    # Nom unique par écriture: plusieurs threads d'un même processus peuvent écrire la même clé
+    tmp = tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or ".", prefix=f"{os.path.basename(path)}.",
+                                      suffix=".tmp", delete=False)
+    try:
+        with tmp:
+            write(tmp)
+        os.replace(tmp.name, path)
+    finally:
+        if os.path.exists(tmp.name):
+            os.remove(tmp.name)
+
+class JsonSerializer:
+    """JSON avec support des datetime et scalaires NumPy"""
+    name = "json"
+    extension = ".json"
+
+    def can_handle(self, value):
+        return True
+
+    @staticmethod
+    def _default(obj):
+        if isinstance(obj, datetime):
+            return {"__datetime__": obj.isoformat()}
+        if isinstance(obj, np.generic):
+            return obj.item()
+        raise TypeError(f"Type non sérialisable: {type(obj).__name__}")
+
+    @staticmethod
+    def _object_hook(obj):
+        if len(obj) == 1 and "__datetime__" in obj:
+            return datetime.fromisoformat(obj["__datetime__"])
+        return obj
+
+    def dumps(self, value):
+        return json.dumps(value, default=self._default).encode("utf-8")
+
+    def loads(self, payload):
+        return json.loads(payload, object_hook=self._object_hook)
+
+    def dump(self, value, path):
+        payload = self.dumps(value)
+        _atomic_write(path, lambda f: f.write(payload))
+
+    def load(self, path):
+        with open(path, "rb") as f:
+            return self.loads(f.read())
+
+class NumpySerializer:
+    """Arrays NumPy numériques au format .npy"""
+    name = "npy"
+    extension = ".npy"
+
+    def can_handle(self, value):
+        return isinstance(value, np.ndarray) and value.dtype != object
+
+    def dumps(self, value):
+        buffer = io.BytesIO()
+        np.save(buffer, value, allow_pickle=False)
+        return buffer.getvalue()
+
+    def loads(self, payload):
+        return np.load(io.BytesIO(payload), allow_pickle=False)
+
+    def dump(self, value, path):
+        _atomic_write(path, lambda f: np.save(f, value, allow_pickle=False))
+
+    def load(self, path):
+        # Copy-on-write: les appelants peuvent modifier l'array sans toucher au fichier
+        return np.load(path, mmap_mode="c", allow_pickle=False)
+
+class DataFrameSerializer:
+    """DataFrames pandas en Feather (Arrow) ou, à défaut, en .npz"""
+    name = "dataframe"
+
+    def __init__(self, use_arrow=None):
+        self.use_arrow = ARROW_AVAILABLE if use_arrow is None else use_arrow
+        self.extension = ".feather" if self.use_arrow else ".npz"
+
+    def can_handle(self, value):
+        return isinstance(value, pd.DataFrame)
+
+    def _write(self, value, target):
+        if self.use_arrow:
+            feather.write_feather(value, target, compression="uncompressed")
+            return
+        columns, meta = {}, {"columns": [], "tz": {}, "index": None}
+        for i, column in enumerate(value.columns):
+            series = value[column]
+            if getattr(series.dtype, "tz", None) is not None:
+                meta["tz"][str(i)] = str(series.dtype.tz)
+                series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+            values = series.to_numpy()
+            if values.dtype == object:
+                raise TypeError(f"Colonne non numérique: {column}")
+            columns[f"c{i}"] = values
+            meta["columns"].append(column)
+        if not isinstance(value.index, pd.RangeIndex) or value.index.start != 0:
+            columns["index"] = value.index.to_numpy()
+            meta["index"] = value.index.name
+        columns["__meta__"] = np.array(json.dumps(meta))
+        np.savez(target, **columns)
+
+    def _read(self, source):
+        if self.use_arrow:
+            return feather.read_table(source, memory_map=isinstance(source, str)).to_pandas()
+        with np.load(source, allow_pickle=False) as archive:
+            meta = json.loads(str(archive["__meta__"]))
+            data = {}
+            for i, column in enumerate(meta["columns"]):
+                values = archive[f"c{i}"]
+                if str(i) in meta["tz"]:
+                    values = pd.to_datetime(values).tz_localize("UTC").tz_convert(meta["tz"][str(i)])
+                data[column] = values
+            index = pd.Index(archive["index"], name=meta["index"]) if "index" in archive else None
+            return pd.DataFrame(data, index=index)
+
+    def dumps(self, value):
+        buffer = io.BytesIO()
+        self._write(value, buffer)
+        return buffer.getvalue()
+
+    def loads(self, payload):
+        return self._read(io.BytesIO(payload))
+
+    def dump(self, value, path):
+        _atomic_write(path, lambda f: self._write(value, f))
+
+    def load(self, path):
+        return self._read(path)
+
+def default_serializers():
+    """Ordre de sélection: premier serializer dont can_handle(value) est vrai"""
+    return [DataFrameSerializer(), NumpySerializer(), JsonSerializer()]
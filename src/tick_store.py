@@ -0,0 +1,109 @@
+"""© 2025-2026 ELOADXFAMILY - Tous droits réservés
+Tick Store - Buffers circulaires en mémoire pour les ticks des flux WebSocket
+
+Chaque symbol dispose d'un buffer NumPy de taille fixe (price, bid, ask,
+volume, timestamp). Les écritures depuis les threads WebSocket et les lectures
+depuis Streamlit sont protégées par un verrou; aucune écriture disque n'a lieu
+par tick. La persistance (optionnelle) regroupe les derniers ticks de chaque
+symbol dans CacheManager au plus une fois par `persist_interval` secondes.
+"""
+import threading
+import time
+from datetime import datetime
+import numpy as np
+
+FIELDS = ("price", "bid", "ask", "volume", "timestamp")
+PRICE, BID, ASK, VOLUME, TIMESTAMP = range(len(FIELDS))
+
+class TickStore:
+    """Stockage en mémoire des derniers ticks par symbol"""
+
+    def __init__(self, name, capacity=1024, persist_interval=None, cache=None):
+        """
+        Args:
+            name: Préfixe des clés de persistance (ex: 'binance')
+            capacity: Nombre de ticks conservés par symbol
+            persist_interval: Secondes entre deux sauvegardes (None = désactivé)
+            cache: CacheManager utilisé pour la persistance
+        """
+        self.name = name
+        self.capacity = capacity
+        self.persist_interval = persist_interval
+        self.cache = cache
+        self._buffers = {}
+        self._counts = {}
+        self._dirty = set()
+        self._last_flush = time.time()
+        self._lock = threading.Lock()
+
+    def append(self, symbol, price, bid=0.0, ask=0.0, volume=0.0, timestamp=None):
+        """Ajouter un tick (timestamp en secondes epoch, défaut: maintenant)"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        with self._lock:
+            buffer = self._buffers.get(symbol)
+            if buffer is None:
+                buffer = np.zeros((self.capacity, len(FIELDS)))
+                self._buffers[symbol] = buffer
+                self._counts[symbol] = 0
+            count = self._counts[symbol]
+            buffer[count % self.capacity] = (price, bid, ask, volume, timestamp)
+            self._counts[symbol] = count + 1
+            self._dirty.add(symbol)
+
+        if self.persist_interval and timestamp - self._last_flush >= self.persist_interval:
+            self.flush()
+
+    def _row(self, symbol, offset=1):
+        count = self._counts.get(symbol, 0)
+        if count < offset or offset > self.capacity:
+            return None
+        return self._buffers[symbol][(count - offset) % self.capacity].copy()
+
+    def latest(self, symbol):
+        """Dernier tick du symbol sous forme de dict ({} si aucun tick)"""
+        with self._lock:
+            row = self._row(symbol)
+        if row is None:
+            return {}
+        return {
+            "price": float(row[PRICE]),
+            "bid": float(row[BID]),
+            "ask": float(row[ASK]),
+            "volume": float(row[VOLUME]),
+            "timestamp": datetime.fromtimestamp(row[TIMESTAMP]).isoformat(),
+            "updated_at": float(row[TIMESTAMP])
+        }
+
+    def history(self, symbol, field="price", limit=None):
+        """Valeurs récentes d'un champ, dans l'ordre chronologique"""
+        column = FIELDS.index(field)
+        with self._lock:
+            count = self._counts.get(symbol, 0)
+            size = min(count, self.capacity)
+            if limit is not None:
+                size = min(size, limit)
+            if size == 0:
+                return np.empty(0)
+            indexes = np.arange(count - size, count) % self.capacity
+            return self._buffers[symbol][indexes, column]
+
+    def symbols(self):
+        with self._lock:
+            return list(self._buffers)
+
+    def snapshot(self):
+        """Dernier tick de chaque symbol: {symbol: dict}"""
+        return {symbol: self.latest(symbol) for symbol in self.symbols()}
+
+    def flush(self):
+        """Sauvegarder le dernier tick des symbols modifiés depuis le dernier flush"""
+        with self._lock:
+            dirty = list(self._dirty)
+            self._dirty.clear()
+            self._last_flush = time.time()
+        if self.cache is None:
+            return
+        for symbol in dirty:
+            latest = self.latest(symbol)
+            if latest:
+                self.cache.set(f"{self.name}_price_{symbol}", latest, ttl=max(10, int(self.persist_interval or 0) * 2))
@@ -3,77 +3,143 @@ Trading Rules & Risk Management - Core trading logic"""
 import numpy as np
 from src.indicators import calculate_rsi, calculate_macd, calculate_bollinger_bands, calculate_trend
 
+# Seuils RSI par défaut (survente / surachat)
+RSI_OVERSOLD = 30
+RSI_OVERBOUGHT = 70
+
+# Score composite à partir duquel le signal est BUY / en dessous duquel il est SELL
+BUY_SCORE = 60
+SELL_SCORE = 40
+
+def composite_scores(prices, rsi, histogram, bb_upper, bb_lower, trend, oversold=RSI_OVERSOLD, overbought=RSI_OVERBOUGHT):
+    """Score composite de SmartSignals pour chaque barre (arrays de même longueur)
+
+    La valeur de la barre i est celle que donnerait get_composite_signal() sur
+    les indicateurs arrêtés à la barre i.
+    """
+    rsi_score = np.where(rsi > overbought, 20, np.where(rsi < oversold, 80, 50))
+    previous = np.concatenate((histogram[:1], histogram[:-1]))
+    macd_score = np.where(histogram > 0, np.where(histogram > previous, 70, 50), np.where(histogram < previous, 30, 50))
+    bb_score = np.where(prices > bb_upper, 30, np.where(prices < bb_lower, 70, 50))
+    trend_score = np.where(trend > 0, 70, np.where(trend < 0, 30, 50))
+    return (rsi_score + macd_score + bb_score + trend_score) / 4
+
+# Indicateurs calculés à la demande: attribut -> (groupe de calcul, valeur par défaut)
+INDICATOR_FIELDS = {
+    "rsi": ("rsi", 50),
+    "macd": ("macd", 0),
+    "signal": ("macd", 0),
+    "histogram": ("macd", 0),
+    "bb_mid": ("bollinger", 0),
+    "bb_upper": ("bollinger", 0),
+    "bb_lower": ("bollinger", 0),
+    "trend": ("trend", 0),
+}
+
+# Périodes par défaut de Bollinger et de la tendance (fenêtre de queue en mode last_only)
+BB_PERIOD = 20
+TREND_PERIOD = 20
+
+def _finite_or_filled(values, fill):
+    """Array sans NaN (copie seulement si nécessaire), [fill] si vide ou absent"""
+    if values is None or len(values) == 0:
+        return np.array([fill])
+    values = np.asarray(values)
+    # Une somme finie garantit l'absence de NaN/inf sans allouer de masque
+    if np.isfinite(np.sum(values)):
+        return values
+    return np.nan_to_num(values, nan=fill)
+
+def _indicator_property(name):
+    def getter(self):
+        return self._indicator(name)
+
+    def setter(self, value):
+        self._raw[name] = value
+        self._values.pop(name, None)
+
+    return property(getter, setter)
+
 class TradingRules:
-    def __init__(self, prices):
+    def __init__(self, prices, oversold=RSI_OVERSOLD, overbought=RSI_OVERBOUGHT, last_only=False):
+        """
+        Args:
+            prices: Clôtures (array 1-D)
+            oversold, overbought: Seuils RSI
+            last_only: Bollinger et tendance calculés sur la seule fenêtre de
+                queue nécessaire au dernier point (les arrays ne couvrent alors
+                que cette fenêtre); RSI et MACD, récurrences sur tout
+                l'historique, restent calculés en entier
+
+        Les indicateurs sont calculés au premier accès puis mémorisés.
+        """
+        self.oversold = oversold
+        self.overbought = overbought
+        self.last_only = last_only
+        self._raw = {}
+        self._values = {}
         try:
             self.prices = np.array(prices) if prices is not None else np.array([])
-            self.rsi = calculate_rsi(self.prices)
-            self.macd, self.signal, self.histogram = calculate_macd(self.prices)
-            self.bb_mid, self.bb_upper, self.bb_lower = calculate_bollinger_bands(self.prices)
-            self.trend = calculate_trend(self.prices)
-            
-            # Asegurar que todos los arrays son válidos (no None, no vacíos, no NaN)
-            self._validate_arrays()
         except Exception:
-            # En caso de error, inicializar con valores por defecto
             self.prices = np.array([])
-            self.rsi = np.array([50])
-            self.macd = np.array([0])
-            self.signal = np.array([0])
-            self.histogram = np.array([0])
-            self.bb_mid = np.array([0])
-            self.bb_upper = np.array([0])
-            self.bb_lower = np.array([0])
-            self.trend = np.array([0])
     
-    def _validate_arrays(self):
-        """Valider et corriger tous les arrays pour éviter NaN, None, ou vides"""
-        # Corriger RSI
-        if self.rsi is None or len(self.rsi) == 0:
-            self.rsi = np.array([50])
-        self.rsi = np.nan_to_num(self.rsi, nan=50)
-        
-        # Corriger MACD
-        if self.macd is None or len(self.macd) == 0:
-            self.macd = np.array([0])
-        self.macd = np.nan_to_num(self.macd, nan=0)
-        
-        # Corriger Signal
-        if self.signal is None or len(self.signal) == 0:
-            self.signal = np.array([0])
-        self.signal = np.nan_to_num(self.signal, nan=0)
-        
-        # Corriger Histogram
-        if self.histogram is None or len(self.histogram) == 0:
-            self.histogram = np.array([0])
-        self.histogram = np.nan_to_num(self.histogram, nan=0)
-        
-        # Corriger Bollinger Bands
-        if self.bb_mid is None or len(self.bb_mid) == 0:
-            self.bb_mid = np.array([0])
-        self.bb_mid = np.nan_to_num(self.bb_mid, nan=0)
-        
-        if self.bb_upper is None or len(self.bb_upper) == 0:
-            self.bb_upper = np.array([0])
-        self.bb_upper = np.nan_to_num(self.bb_upper, nan=0)
-        
-        if self.bb_lower is None or len(self.bb_lower) == 0:
-            self.bb_lower = np.array([0])
-        self.bb_lower = np.nan_to_num(self.bb_lower, nan=0)
-        
-        # Corriger Trend
-        if self.trend is None or len(self.trend) == 0:
-            self.trend = np.array([0])
-        self.trend = np.nan_to_num(self.trend, nan=0)
+    @classmethod
+    def from_arrays(cls, prices, rsi, macd, signal, histogram, bb_mid, bb_upper, bb_lower, trend,
+                    oversold=RSI_OVERSOLD, overbought=RSI_OVERBOUGHT):
+        """Construire les règles depuis des indicateurs déjà calculés (ex: IndicatorFrame)"""
+        rules = cls(prices, oversold, overbought)
+        rules._raw.update(rsi=rsi, macd=macd, signal=signal, histogram=histogram,
+                          bb_mid=bb_mid, bb_upper=bb_upper, bb_lower=bb_lower, trend=trend)
+        return rules
+    
+    rsi = _indicator_property("rsi")
+    macd = _indicator_property("macd")
+    signal = _indicator_property("signal")
+    histogram = _indicator_property("histogram")
+    bb_mid = _indicator_property("bb_mid")
+    bb_upper = _indicator_property("bb_upper")
+    bb_lower = _indicator_property("bb_lower")
+    trend = _indicator_property("trend")
+    
+    def _compute(self, group):
+        """Calculer un groupe d'indicateurs (valeurs neutres en cas d'erreur)"""
+        prices = self.prices
+        try:
+            if group == "rsi":
+                values = {"rsi": calculate_rsi(prices)}
+            elif group == "macd":
+                values = dict(zip(("macd", "signal", "histogram"), calculate_macd(prices)))
+            elif group == "bollinger":
+                tail = prices[-BB_PERIOD:] if self.last_only else prices
+                values = dict(zip(("bb_mid", "bb_upper", "bb_lower"), calculate_bollinger_bands(tail, BB_PERIOD)))
+            else:
+                # Au-delà de period + 1 points, le dernier point ne dépend que de cette fenêtre
+                tail = prices[-(TREND_PERIOD + 1):] if self.last_only else prices
+                values = {"trend": calculate_trend(tail, TREND_PERIOD)}
+        except Exception:
+            values = {name: None for name, (g, _) in INDICATOR_FIELDS.items() if g == group}
+        for name, value in values.items():
+            # Les valeurs déjà fournies (from_arrays, affectation) sont conservées
+            if name not in self._raw and name not in self._values:
+                self._raw[name] = value
+    
+    def _indicator(self, name):
+        """Indicateur validé (sans NaN, jamais vide), calculé et nettoyé une seule fois"""
+        if name not in self._values:
+            group, fill = INDICATOR_FIELDS[name]
+            if name not in self._raw:
+                self._compute(group)
+            self._values[name] = _finite_or_filled(self._raw.pop(name), fill)
+        return self._values[name]
     
     def rsi_signal(self):
         try:
             if self.rsi is None or len(self.rsi) == 0:
                 return 50
             current_rsi = float(self.rsi[-1])
-            if current_rsi > 70:
+            if current_rsi > self.overbought:
                 return 20
-            elif current_rsi < 30:
+            elif current_rsi < self.oversold:
                 return 80
             else:
                 return 50
@@ -126,8 +192,15 @@ class TradingRules:
             return 50
 
 class SmartSignals:
-    def __init__(self, prices):
-        self.rules = TradingRules(prices)
+    def __init__(self, prices, oversold=RSI_OVERSOLD, overbought=RSI_OVERBOUGHT, last_only=False):
+        self.rules = TradingRules(prices, oversold, overbought, last_only)
+    
+    @classmethod
+    def from_rules(cls, rules):
+        """Signaux sur des règles existantes (indicateurs non recalculés)"""
+        signals = cls.__new__(cls)
+        signals.rules = rules
+        return signals
     
     def get_composite_signal(self):
         rsi_score = self.rules.rsi_signal()
@@ -240,7 +313,7 @@ class RiskAssessment:
     def find_support(self):
         """Find support level (lowest price in period)"""
         try:
-            if len(self.prices) < self.period:
+            if self.period < 1 or len(self.prices) < self.period:
                 support = np.min(self.prices)
             else:
                 support = np.min(self.prices[-self.period:])
@@ -254,7 +327,7 @@ class RiskAssessment:
     def find_resistance(self):
         """Find resistance level (highest price in period)"""
         try:
-            if len(self.prices) < self.period:
+            if self.period < 1 or len(self.prices) < self.period:
                 resistance = np.max(self.prices)
             else:
                 resistance = np.max(self.prices[-self.period:])
@@ -5,27 +5,45 @@ Implémente:
 - Binance WebSocket: Flux de prix, trades, OHLC
 - CoinCap WebSocket: Prix simples et rapides
 - Support pour futures et spot markets
+
+Les connexions sont multiplexées par src/feed_manager.py (une seule boucle
+asyncio, reconnexion avec backoff et réabonnement automatiques).
 """
 
-import websocket
 import json
-import threading
+import os
 import time
-from datetime import datetime
 from collections import deque
+from datetime import datetime
 from src.cache import CacheManager
+from src.candles import CandleAggregator
+from src.feed_manager import get_feed_manager
+from src.indicators import IncrementalIndicatorSet
+from src.price_arbiter import LatencyTracker
+from src.tick_store import TickStore
 
 cache = CacheManager()
 
+# Sauvegarde périodique des derniers ticks (secondes, désactivée par défaut)
+TICK_PERSIST_INTERVAL = float(os.getenv("TICK_PERSIST_INTERVAL", "0")) or None
+
+def _create_tick_store(name):
+    return TickStore(name, persist_interval=TICK_PERSIST_INTERVAL, cache=cache)
+
 class BinanceWebSocketFeed:
     """Flux WebSocket Binance pour données temps réel"""
     
     def __init__(self):
-        self.prices = {}
+        self.store = _create_tick_store("binance")
         self.trades = deque(maxlen=100)
-        self.running = False
-        self.ws = None
+        self.candles = CandleAggregator()
+        self.indicators = {}
+        self.latency = LatencyTracker()
         
+    @property
+    def running(self):
+        return get_feed_manager().is_connected("binance")
+    
     def start_ticker_feed(self, symbols=None):
         """Démarrer flux de ticker prix en temps réel
         
@@ -35,55 +53,52 @@ class BinanceWebSocketFeed:
         if symbols is None:
             symbols = ['BTCUSDT', 'ETHUSDT', 'SOLusdt']
         
-        # Créer les canaux (ex: btcusdt@ticker)
-        channels = ''.join([f'{symbol.lower()}@ticker/' for symbol in symbols]).rstrip('/')
+        # Créer les canaux: ticker pour le prix, aggTrade pour les bougies (ex: btcusdt@ticker/btcusdt@aggTrade)
+        channels = '/'.join([f'{symbol.lower()}@ticker/{symbol.lower()}@aggTrade' for symbol in symbols])
         url = f"wss://stream.binance.com:9443/stream?streams={channels}"
         
-        def on_message(ws, message):
-            try:
-                data = json.loads(message)
-                stream_data = data.get('data', {})
-                symbol = stream_data.get('s', '')
-                price = float(stream_data.get('c', 0))  # Close price
-                
-                if symbol and price > 0:
-                    self.prices[symbol] = {
-                        'price': price,
-                        'timestamp': datetime.now().isoformat(),
-                        'bid': float(stream_data.get('b', 0)),
-                        'ask': float(stream_data.get('a', 0)),
-                        'volume': float(stream_data.get('v', 0))
-                    }
-                    # Cache pour 10 secondes
-                    cache.set(f"binance_price_{symbol}", self.prices[symbol], ttl=10)
-            except Exception as e:
-                pass
-        
-        def on_error(ws, error):
-            pass
-        
-        def on_close(ws, close_status_code, close_msg):
-            self.running = False
-        
-        def on_open(ws):
-            self.running = True
-        
         try:
-            self.ws = websocket.WebSocketApp(
-                url,
-                on_message=on_message,
-                on_error=on_error,
-                on_close=on_close,
-                on_open=on_open
-            )
-            
-            # Exécuter en thread séparé
-            thread = threading.Thread(target=self.ws.run_forever, daemon=True)
-            thread.start()
+            get_feed_manager().add_feed("binance", url, self.handle_message)
             return True
         except Exception as e:
             return False
     
+    def handle_message(self, message):
+        """Traiter un message du flux combiné (appelé par le FeedManager)"""
+        try:
+            data = json.loads(message)
+            stream_data = data.get('data', {})
+            symbol = stream_data.get('s', '')
+            
+            # Trade agrégé: prix 'p', quantité 'q', heure du trade 'T' (ms) -> bougies
+            if stream_data.get('e') == 'aggTrade':
+                price = float(stream_data.get('p', 0))
+                if symbol and price > 0:
+                    self.trades.append(stream_data)
+                    self.candles.on_trade(
+                        symbol,
+                        price,
+                        size=float(stream_data.get('q', 0)),
+                        timestamp=stream_data['T'] / 1000 if 'T' in stream_data else None
+                    )
+                return
+            
+            price = float(stream_data.get('c', 0))  # Close price
+            if symbol and price > 0:
+                self.store.append(
+                    symbol,
+                    price,
+                    bid=float(stream_data.get('b', 0)),
+                    ask=float(stream_data.get('a', 0)),
+                    volume=float(stream_data.get('v', 0))
+                )
+                if symbol in self.indicators:
+                    self.indicators[symbol].on_tick(price)
+                if 'E' in stream_data:
+                    self.latency.record(time.time() - stream_data['E'] / 1000)
+        except Exception as e:
+            pass
+    
     def get_price(self, symbol):
         """Obtenir le prix actuel du symbol
         
@@ -93,24 +108,46 @@ class BinanceWebSocketFeed:
         Returns:
             dict avec prix et métadonnées
         """
-        cached = cache.get(f"binance_price_{symbol}")
-        if cached:
-            return cached
-        return self.prices.get(symbol, {})
+        return self.store.latest(symbol)
+    
+    @property
+    def prices(self):
+        """Dernier tick de chaque symbol"""
+        return self.store.snapshot()
+    
+    def get_candles(self, symbol, interval="1h", limit=None):
+        """Bougies OHLCV réelles construites depuis le flux (1m, 5m ou 1h)"""
+        return self.candles.candles(symbol, interval, limit)
+    
+    def track_indicators(self, symbol, closes, now=None):
+        """Maintenir RSI/MACD/Bollinger/EMA à jour à chaque tick du symbol
+        
+        Args:
+            symbol: Symbol Binance (ex: 'BTCUSDT')
+            closes: Clôtures horaires historiques (la dernière = heure en cours)
+            now: Epoch de la dernière bougie historique
+        """
+        self.indicators[symbol] = IncrementalIndicatorSet.from_history(closes, now=now)
+    
+    def get_indicators(self, symbol):
+        """Obtenir les dernières valeurs des indicateurs suivis (dict ou None)"""
+        indicators = self.indicators.get(symbol)
+        return indicators.latest() if indicators else None
     
     def stop(self):
         """Arrêter le flux WebSocket"""
-        if self.ws:
-            self.ws.close()
-            self.running = False
+        get_feed_manager().remove_feed("binance")
 
 class CoinCapWebSocketFeed:
     """Flux WebSocket CoinCap - Super simple et rapide"""
     
     def __init__(self):
-        self.prices = {}
-        self.running = False
-        self.ws = None
+        self.store = _create_tick_store("coincap")
+        self.latency = LatencyTracker()
+    
+    @property
+    def running(self):
+        return get_feed_manager().is_connected("coincap")
     
     def start_price_feed(self, assets=None):
         """Démarrer flux de prix CoinCap
@@ -124,48 +161,26 @@ class CoinCapWebSocketFeed:
         assets_str = ','.join(assets)
         url = f"wss://ws.coincap.io/prices?assets={assets_str}"
         
-        def on_message(ws, message):
-            try:
-                data = json.loads(message)
-                for asset, price in data.items():
-                    try:
-                        price_float = float(price)
-                        if price_float > 0:
-                            self.prices[asset] = {
-                                'price': price_float,
-                                'timestamp': datetime.now().isoformat(),
-                                'source': 'coincap'
-                            }
-                            cache.set(f"coincap_price_{asset}", self.prices[asset], ttl=5)
-                    except:
-                        pass
-            except Exception as e:
-                pass
-        
-        def on_error(ws, error):
-            pass
-        
-        def on_close(ws, close_status_code, close_msg):
-            self.running = False
-        
-        def on_open(ws):
-            self.running = True
-        
         try:
-            self.ws = websocket.WebSocketApp(
-                url,
-                on_message=on_message,
-                on_error=on_error,
-                on_close=on_close,
-                on_open=on_open
-            )
-            
-            thread = threading.Thread(target=self.ws.run_forever, daemon=True)
-            thread.start()
+            get_feed_manager().add_feed("coincap", url, self.handle_message)
             return True
         except Exception as e:
             return False
     
+    def handle_message(self, message):
+        """Traiter un message de prix (appelé par le FeedManager)"""
+        try:
+            data = json.loads(message)
+            for asset, price in data.items():
+                try:
+                    price_float = float(price)
+                    if price_float > 0:
+                        self.store.append(asset, price_float)
+                except:
+                    pass
+        except Exception as e:
+            pass
+    
     def get_price(self, asset):
         """Obtenir le prix d'un asset
         
@@ -175,25 +190,33 @@ class CoinCapWebSocketFeed:
         Returns:
             dict avec prix
         """
-        cached = cache.get(f"coincap_price_{asset}")
-        if cached:
-            return cached
-        return self.prices.get(asset, {})
+        latest = self.store.latest(asset)
+        if latest:
+            latest['source'] = 'coincap'
+        return latest
+    
+    @property
+    def prices(self):
+        """Dernier prix de chaque asset"""
+        return {asset: self.get_price(asset) for asset in self.store.symbols()}
     
     def stop(self):
         """Arrêter le flux"""
-        if self.ws:
-            self.ws.close()
-            self.running = False
+        get_feed_manager().remove_feed("coincap")
 
 class CoinbaseWebSocketFeed:
     """Flux WebSocket Coinbase - Données publiques"""
     
     def __init__(self):
-        self.prices = {}
+        self.store = _create_tick_store("coinbase")
         self.trades = deque(maxlen=50)
-        self.running = False
-        self.ws = None
+        self.candles = CandleAggregator()
+        self.indicators = {}
+        self.latency = LatencyTracker()
+    
+    @property
+    def running(self):
+        return get_feed_manager().is_connected("coinbase")
     
     def start_ticker_feed(self, product_ids=None):
         """Démarrer flux de ticker Coinbase
@@ -205,60 +228,55 @@ class CoinbaseWebSocketFeed:
             product_ids = ['BTC-USD', 'ETH-USD', 'SOL-USD']
         
         url = "wss://ws-feed.exchange.coinbase.com"
-        
-        def on_message(ws, message):
-            try:
-                data = json.loads(message)
-                if data.get('type') == 'ticker':
-                    product_id = data.get('product_id', '')
-                    price = float(data.get('price', 0))
-                    
-                    if product_id and price > 0:
-                        self.prices[product_id] = {
-                            'price': price,
-                            'timestamp': data.get('time', datetime.now().isoformat()),
-                            'bid': float(data.get('best_bid', 0)),
-                            'ask': float(data.get('best_ask', 0)),
-                            'volume_24h': float(data.get('volume_24h', 0))
-                        }
-                        cache.set(f"coinbase_price_{product_id}", self.prices[product_id], ttl=10)
-                
-                elif data.get('type') == 'match':
-                    self.trades.append(data)
-            except Exception as e:
-                pass
-        
-        def on_error(ws, error):
-            pass
-        
-        def on_close(ws, close_status_code, close_msg):
-            self.running = False
-        
-        def on_open(ws):
-            self.running = True
-            # Envoyer subscribe message
-            subscribe_msg = {
-                "type": "subscribe",
-                "product_ids": product_ids,
-                "channels": ["ticker", "match"]
-            }
-            ws.send(json.dumps(subscribe_msg))
+        # Renvoyé par le FeedManager à chaque (re)connexion
+        subscribe_msg = {
+            "type": "subscribe",
+            "product_ids": product_ids,
+            "channels": ["ticker", "matches"]
+        }
         
         try:
-            self.ws = websocket.WebSocketApp(
-                url,
-                on_message=on_message,
-                on_error=on_error,
-                on_close=on_close,
-                on_open=on_open
-            )
-            
-            thread = threading.Thread(target=self.ws.run_forever, daemon=True)
-            thread.start()
+            get_feed_manager().add_feed("coinbase", url, self.handle_message, subscribe=[subscribe_msg])
             return True
         except Exception as e:
             return False
     
+    def handle_message(self, message):
+        """Traiter un message ticker/match (appelé par le FeedManager)"""
+        try:
+            data = json.loads(message)
+            if data.get('type') == 'ticker':
+                product_id = data.get('product_id', '')
+                price = float(data.get('price', 0))
+                
+                if product_id and price > 0:
+                    # Heure de l'échange ('time'): l'âge du tick inclut le retard du flux
+                    received = time.time()
+                    exchange_time = datetime.fromisoformat(data['time'].replace('Z', '+00:00')).timestamp() if 'time' in data else None
+                    self.store.append(
+                        product_id,
+                        price,
+                        bid=float(data.get('best_bid', 0)),
+                        ask=float(data.get('best_ask', 0)),
+                        volume=float(data.get('volume_24h', 0)),
+                        timestamp=exchange_time if exchange_time is not None else received
+                    )
+                    if product_id in self.indicators:
+                        self.indicators[product_id].on_tick(price)
+                    if exchange_time is not None:
+                        self.latency.record(received - exchange_time)
+            
+            elif data.get('type') in ('match', 'last_match'):
+                self.trades.append(data)
+                self.candles.on_trade(
+                    data.get('product_id', ''),
+                    float(data.get('price', 0)),
+                    size=float(data.get('size', 0)),
+                    timestamp=datetime.fromisoformat(data['time'].replace('Z', '+00:00')).timestamp() if 'time' in data else None
+                )
+        except Exception as e:
+            pass
+    
     def get_price(self, product_id):
         """Obtenir le prix d'un product
         
@@ -268,10 +286,34 @@ class CoinbaseWebSocketFeed:
         Returns:
             dict avec prix et données
         """
-        cached = cache.get(f"coinbase_price_{product_id}")
-        if cached:
-            return cached
-        return self.prices.get(product_id, {})
+        latest = self.store.latest(product_id)
+        if latest:
+            latest['volume_24h'] = latest.pop('volume')
+        return latest
+    
+    @property
+    def prices(self):
+        """Dernier tick de chaque product"""
+        return {product_id: self.get_price(product_id) for product_id in self.store.symbols()}
+    
+    def get_candles(self, product_id, interval="1h", limit=None):
+        """Bougies OHLCV réelles construites depuis les trades (1m, 5m ou 1h)"""
+        return self.candles.candles(product_id, interval, limit)
+    
+    def track_indicators(self, product_id, closes, now=None):
+        """Maintenir RSI/MACD/Bollinger/EMA à jour à chaque tick du product
+        
+        Args:
+            product_id: Product ID (ex: 'BTC-USD')
+            closes: Clôtures horaires historiques (la dernière = heure en cours)
+            now: Epoch de la dernière bougie historique
+        """
+        self.indicators[product_id] = IncrementalIndicatorSet.from_history(closes, now=now)
+    
+    def get_indicators(self, product_id):
+        """Obtenir les dernières valeurs des indicateurs suivis (dict ou None)"""
+        indicators = self.indicators.get(product_id)
+        return indicators.latest() if indicators else None
     
     def get_recent_trades(self, product_id=None, limit=10):
         """Obtenir les trades récents"""
@@ -279,9 +321,7 @@ class CoinbaseWebSocketFeed:
     
     def stop(self):
         """Arrêter le flux"""
-        if self.ws:
-            self.ws.close()
-            self.running = False
+        get_feed_manager().remove_feed("coinbase")
 
 # Instances globales (singleton pattern)
 _binance_feed = None
@@ -324,6 +364,10 @@ def initialize_realtime_feeds():
     except Exception as e:
         return False
 
+def get_feed_status():
+    """État des flux (connecté, messages/s, âge du dernier message, reconnexions)"""
+    return get_feed_manager().status()
+
 def cleanup_feeds():
     """Arrêter tous les flux"""
     if _binance_feed:
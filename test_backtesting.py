@@ -0,0 +1,69 @@
+"""Test: moteur de backtest vectorisé (positions, équité, drawdown, Sharpe, taux de réussite)"""
+import time
+import numpy as np
+import pandas as pd
+from src.backtesting import BacktestEngine, positions_from_signals, rsi_signals, run_backtest
+from src.indicators import calculate_rsi
+
+def reference(prices, buy, sell, initial_balance=1000, fee=0.0):
+    # Boucle barre par barre équivalente, pour contrôle
+    position, cash_units, equity, trades = 0, initial_balance, [], []
+    for i, price in enumerate(prices):
+        if i > 0 and position:
+            cash_units *= price / prices[i - 1]
+        if buy[i] and not position:
+            position, entry = 1, price
+            cash_units *= 1 - fee
+        elif sell[i] and position:
+            position = 0
+            cash_units *= 1 - fee
+            trades.append(price / entry * (1 - fee) ** 2 - 1)
+        equity.append(cash_units)
+    return np.array(equity), np.array(trades)
+
+rng = np.random.default_rng(3)
+prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 2000)))
+buy, sell = rsi_signals(calculate_rsi(prices))
+
+# Test 1: Machine à états vectorisée
+print("Test 1: Positions depuis les signaux")
+b = np.array([0, 1, 1, 0, 0, 0, 1, 0, 0], dtype=bool)
+s = np.array([1, 0, 0, 0, 1, 1, 0, 0, 1], dtype=bool)
+assert positions_from_signals(b, s).tolist() == [0, 1, 1, 1, 0, 0, 1, 1, 0]
+print("✓ Achats répétés et ventes à vide ignorés")
+
+# Test 2: Équité et trades conformes à la boucle de référence
+print("\nTest 2: Conformité à la boucle")
+for fee in (0.0, 0.001):
+    result = run_backtest(prices, buy, sell, fee=fee)
+    equity, trades = reference(prices, buy, sell, fee=fee)
+    assert np.allclose(result["equity"], equity, rtol=1e-10)
+    assert np.allclose(result["trade_returns"], trades, rtol=1e-10)
+    assert result["closed_trades"] == len(trades) > 0
+    assert result["win_rate"] == (trades > 0).mean() * 100
+drawdown = result["drawdown"]
+assert drawdown.max() <= 0 and np.isclose(result["max_drawdown"], (equity / np.maximum.accumulate(equity) - 1).min() * 100)
+print(f"✓ {result['closed_trades']} trades, gain {result['profit_percent']:.2f}%, "
+      f"réussite {result['win_rate']:.0f}%, drawdown {result['max_drawdown']:.2f}%, Sharpe {result['sharpe']:.2f}")
+
+# Test 3: BacktestEngine (compatibilité): P&L et taux de réussite réels
+print("\nTest 3: BacktestEngine")
+engine = BacktestEngine(pd.DataFrame({"close": prices}))
+legacy = engine.run(calculate_rsi(prices))
+assert legacy["final_balance"] == run_backtest(prices, buy, sell)["final_balance"]
+assert legacy["total_profit"] != 0 and len(legacy["equity_curve"]) == len(prices) + 1
+assert [t["type"] for t in legacy["trades"][:2]] == ["buy", "sell"]
+assert engine.balance == legacy["final_balance"]
+print(f"✓ Solde final {legacy['final_balance']:.2f} (P&L {legacy['total_profit']:+.2f})")
+
+# Test 4: 100k barres en quelques millisecondes
+print("\nTest 4: Performance")
+big = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 200000)))
+big_buy, big_sell = rsi_signals(calculate_rsi(big))
+start = time.perf_counter()
+run_backtest(big, big_buy, big_sell)
+elapsed = time.perf_counter() - start
+assert elapsed < 0.5, elapsed
+print(f"✓ 200k barres en {elapsed * 1000:.1f} ms")
+
+print("\n✅ Backtest vectorisé validé")
@@ -0,0 +1,51 @@
+"""Test: niveau mémoire borné du CacheManager (LRU, budget, expirations)"""
+import tempfile
+import time
+import numpy as np
+from src.cache import CacheManager
+
+cache_dir = tempfile.mkdtemp()
+
+# Test 1: Éviction LRU par nombre d'entrées
+print("Test 1: LRU par nombre d'entrées")
+cache = CacheManager(cache_dir=cache_dir, max_entries=3)
+for key in ["a", "b", "c"]:
+    cache.set(key, key.upper())
+cache.get("a")            # "a" devient le plus récent
+cache.set("d", "D")       # évince "b"
+assert list(cache.memory_cache) == ["c", "a", "d"]
+assert cache.get_stats()["evictions"] == 1
+print("✓ L'entrée la moins récemment utilisée est évincée")
+
+# Test 2: Budget en octets
+print("\nTest 2: Budget mémoire")
+cache = CacheManager(cache_dir=cache_dir, max_bytes=100_000)
+cache.set("big1", np.zeros(8000))    # 64 KB
+cache.set("big2", np.zeros(8000))    # dépasse le budget -> big1 évincé
+stats = cache.get_stats()
+assert "big1" not in cache.memory_cache and "big2" in cache.memory_cache
+assert stats["memory_bytes"] <= 100_000
+print(f"✓ {stats['memory_bytes']} octets en mémoire")
+
+# Test 3: Balayage des entrées expirées
+print("\nTest 3: Expirations")
+cache = CacheManager(cache_dir=cache_dir, sweep_interval=0)
+cache.set("short", 1, ttl=1)
+cache.set("long", 2, ttl=60)
+time.sleep(1.1)
+cache.get("long")
+assert "short" not in cache.memory_cache
+assert cache.get_stats()["expirations"] >= 1
+print("✓ Entrées expirées supprimées sans lecture")
+
+# Test 4: Compteurs
+print("\nTest 4: Compteurs hit/miss")
+cache = CacheManager(cache_dir=tempfile.mkdtemp())
+cache.set("k", {"price": 1.0})
+assert cache.get("k") == {"price": 1.0}
+assert cache.get("absent") is None
+stats = cache.get_stats()
+assert stats["hits"] == 1 and stats["misses"] == 1
+print(f"✓ {stats}")
+
+print("\n✅ Cache LRU validé")
@@ -0,0 +1,67 @@
+"""Test: niveau disque binaire du CacheManager (DataFrames, arrays, JSON)"""
+import os
+import tempfile
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from src.cache import CacheManager
+from src.serializers import DataFrameSerializer, JsonSerializer
+
+history = pd.DataFrame({
+    "timestamp": pd.date_range(end=datetime.now(), periods=48, freq="h"),
+    "open": np.linspace(100, 110, 48),
+    "close": np.linspace(101, 111, 48),
+    "volume": np.arange(48)
+}).tail(24)
+
+# Test 1: Un DataFrame survit au redémarrage (niveau mémoire vide)
+print("Test 1: DataFrame sur disque")
+cache_dir = tempfile.mkdtemp()
+CacheManager(cache_dir=cache_dir).set("history_BTC_1", history, ttl=60)
+reloaded = CacheManager(cache_dir=cache_dir).get("history_BTC_1")
+assert reloaded is not None and reloaded.equals(history)
+print(f"✓ Relu depuis {sorted(os.listdir(cache_dir))}")
+
+# Test 2: Format .npz de repli (sans pyarrow)
+print("\nTest 2: Repli .npz")
+serializer = DataFrameSerializer(use_arrow=False)
+assert serializer.loads(serializer.dumps(history)).equals(history)
+print("✓ Colonnes, types et index conservés")
+
+# Test 3: Arrays et dicts avec datetime
+print("\nTest 3: Arrays NumPy et dicts")
+cache = CacheManager(cache_dir=cache_dir)
+cache.set("closes", history["close"].to_numpy())
+cache.set("price_BTC", {"price": 74000.0, "timestamp": datetime(2026, 1, 1, 12, 0)})
+fresh = CacheManager(cache_dir=cache_dir)
+assert np.array_equal(fresh.get("closes"), history["close"].to_numpy())
+assert fresh.get("price_BTC")["timestamp"] == datetime(2026, 1, 1, 12, 0)
+print("✓ Types restaurés")
+
+# Test 4: delete() supprime aussi le fichier binaire
+print("\nTest 4: Suppression")
+fresh.delete("history_BTC_1")
+assert not any(name.startswith("history_BTC_1") for name in os.listdir(cache_dir))
+print("✓ Aucun fichier orphelin")
+
+# Test 5: Écritures concurrentes de la même clé depuis plusieurs threads
+print("\nTest 5: Écritures concurrentes")
+path = os.path.join(cache_dir, "price_ETH.json")
+errors = []
+def writer(i):
+    try:
+        for _ in range(50):
+            JsonSerializer().dump({"price": float(i)}, path)
+    except Exception as e:
+        errors.append(e)
+threads = [threading.Thread(target=writer, args=(i,)) for i in range(8)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+assert errors == [] and JsonSerializer().load(path)["price"] in range(8)
+assert not any(name.endswith(".tmp") for name in os.listdir(cache_dir))
+print("✓ 400 écritures sur 8 threads, fichier complet, aucun temporaire restant")
+
+print("\n✅ Cache disque binaire validé")
@@ -0,0 +1,65 @@
+"""Test: backend SQLite partagé entre instances et processus"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from src.cache import CacheManager
+
+cache_dir = tempfile.mkdtemp()
+
+# Test 1: Deux instances partagent les écritures et suppressions
+print("Test 1: Instances partagées")
+writer = CacheManager(cache_dir=cache_dir, backend="sqlite")
+reader = CacheManager(cache_dir=cache_dir, backend="sqlite", memory_ttl=0)
+writer.set("price_BTC", {"price": 74000.0}, ttl=60)
+assert reader.get("price_BTC") == {"price": 74000.0}
+writer.delete("price_BTC")
+assert reader.get("price_BTC") is None
+print("✓ Écriture et suppression visibles")
+
+# Test 2: DataFrames et arrays en BLOB
+print("\nTest 2: Valeurs binaires")
+frame = pd.DataFrame({"timestamp": pd.date_range("2026-01-01", periods=24, freq="h"),
+                      "close": np.linspace(100, 110, 24)})
+writer.set("history_BTC_1", frame, ttl=60)
+writer.set("closes", frame["close"].to_numpy(), ttl=60)
+assert reader.get("history_BTC_1").equals(frame)
+assert np.array_equal(reader.get("closes"), frame["close"].to_numpy())
+print("✓ DataFrame et array relus")
+
+# Test 3: Un autre processus voit le cache
+print("\nTest 3: Autre processus")
+writer.set("news_all", ["headline"], ttl=60)
+code = ("from src.cache import CacheManager; "
+        f"c = CacheManager(cache_dir={cache_dir!r}, backend='sqlite'); "
+        "assert c.get('news_all') == ['headline']; c.set('from_child', 42, ttl=60)")
+subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+assert reader.get("from_child") == 42
+print("✓ Lecture et écriture inter-processus")
+
+# Test 4: Les lignes expirées sont purgées via l'index d'expiration
+print("\nTest 4: Purge TTL")
+writer.set("short", 1, ttl=1)
+time.sleep(1.1)
+writer.sweep_interval = 0
+writer.get("closes")
+assert writer.backend.count() == 4
+print(f"✓ {writer.get_stats()['disk_items']} entrées restantes")
+
+# Test 5: Backend fichiers: purge des clés jamais relues, clear limité aux entrées
+print("\nTest 5: Backend fichiers")
+files = CacheManager(cache_dir=cache_dir, backend="file", sweep_interval=0)
+files.set("frame_short", frame, ttl=1)
+files.set("list_short", [1, 2], ttl=1)
+files.set("kept", {"a": 1}, ttl=60)
+time.sleep(1.1)
+files.backend.purge_expired()
+assert files.backend.count() == 1 and not any(f.startswith(("frame_short", "list_short")) for f in os.listdir(cache_dir))
+files.clear()
+assert files.backend.count() == 0 and "cache.sqlite3" in os.listdir(cache_dir) and reader.get("closes") is not None
+print("✓ Entrées expirées supprimées sans relecture, base SQLite conservée par clear()")
+
+print("\n✅ Cache partagé validé")
@@ -0,0 +1,66 @@
+"""Test: bougies OHLCV réelles construites depuis les trades WebSocket"""
+import json
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from src.candles import CandleAggregator, merge_live_candle
+from src.websocket_feeds import BinanceWebSocketFeed
+
+# Horodatages UTC, comme les trades des bourses et l'historique CoinGecko
+hour = datetime(2026, 3, 1, 14, tzinfo=timezone.utc).timestamp()
+
+# Test 1: Agrégation 1m/5m/1h
+print("Test 1: Agrégation des trades")
+agg = CandleAggregator()
+trades = [(74000, 0.5, hour + 10), (74100, 0.2, hour + 50), (73900, 1.0, hour + 70), (74050, 0.3, hour + 400)]
+for price, size, ts in trades:
+    agg.on_trade("BTC-USD", price, size, ts)
+one_hour = agg.current("BTC-USD", "1h")
+assert (one_hour["open"], one_hour["high"], one_hour["low"], one_hour["close"]) == (74000, 74100, 73900, 74050)
+assert np.isclose(one_hour["volume"], 2.0) and one_hour["timestamp"] == datetime(2026, 3, 1, 14)
+minutes = agg.candles("BTC-USD", "1m")
+assert len(minutes) == 3 and list(minutes["close"]) == [74100, 73900, 74050]
+assert minutes["timestamp"].iloc[0] == pd.Timestamp(2026, 3, 1, 14)
+assert len(agg.candles("BTC-USD", "5m")) == 2
+print(f"✓ 1h: O={one_hour['open']} H={one_hour['high']} L={one_hour['low']} C={one_hour['close']}")
+
+# Test 2: Capacité fixe et trades en retard
+print("\nTest 2: Buffer circulaire")
+agg = CandleAggregator(intervals=("1m",), capacity=5)
+for i in range(12):
+    agg.on_trade("BTCUSDT", 100 + i, 1, hour + 60 * i)
+agg.on_trade("BTCUSDT", 1, 1, hour)
+bars = agg.candles("BTCUSDT", "1m")
+assert list(bars["close"]) == [107, 108, 109, 110, 111]
+assert bars["timestamp"].is_monotonic_increasing
+assert agg._series["BTCUSDT"]["1m"].late == 1
+print("✓ 5 dernières bougies conservées, trade en retard ignoré")
+
+# Test 3: Fusion avec l'historique horaire
+print("\nTest 3: Fusion avec l'historique")
+history = pd.DataFrame({
+    "timestamp": pd.date_range(end=datetime(2026, 3, 1, 14), periods=24, freq="h"),
+    "open": 74000.0, "high": 74200.0, "low": 73800.0, "close": 74000.0, "volume": np.full(24, 10)
+})
+merged = merge_live_candle(history, one_hour)
+assert len(merged) == 24 and merged["close"].iloc[-1] == 74050 and merged["low"].iloc[-1] == 73800
+assert history["close"].iloc[-1] == 74000
+next_hour = dict(one_hour, timestamp=datetime(2026, 3, 1, 15, 5))
+appended = merge_live_candle(history, next_hour)
+assert len(appended) == 24 and appended["timestamp"].iloc[-1] == pd.Timestamp(2026, 3, 1, 15)
+assert merge_live_candle(history, dict(one_hour, timestamp=datetime(2026, 3, 2))).equals(history)
+print("✓ Bougie en cours remplacée / ajoutée, historique d'origine intact")
+
+# Test 4: Bougies Binance depuis les trades agrégés, pas depuis le ticker
+print("\nTest 4: Flux Binance")
+binance = BinanceWebSocketFeed()
+binance.handle_message(json.dumps({"data": {"e": "24hrTicker", "s": "ETHUSDT", "c": "2500", "Q": "9", "E": (hour + 5) * 1000}}))
+assert binance.get_price("ETHUSDT")["price"] == 2500 and binance.candles.current("ETHUSDT") is None
+for price, size, ts in [(2500, 0.5, hour + 10), (2510, 0.25, hour + 20)]:
+    binance.handle_message(json.dumps({"data": {"e": "aggTrade", "s": "ETHUSDT", "p": str(price), "q": str(size), "T": ts * 1000}}))
+live = binance.candles.current("ETHUSDT")
+assert (live["open"], live["close"], live["volume"]) == (2500, 2510, 0.75)
+assert live["timestamp"] == datetime(2026, 3, 1, 14) and binance.get_price("ETHUSDT")["price"] == 2500
+print("✓ Bougie construite depuis @aggTrade (p, q, T), le ticker ne met à jour que le prix")
+
+print("\n✅ Bougies live validées")
@@ -0,0 +1,51 @@
+"""Test: conversion journalière -> horaire vectorisée"""
+import numpy as np
+import pandas as pd
+from src.data import convert_daily_to_hourly
+
+daily = pd.DataFrame({
+    "timestamp": pd.date_range("2026-01-01", periods=90, freq="D"),
+    "open": np.linspace(70000, 75000, 90),
+    "close": np.linspace(70500, 75500, 90),
+})
+daily["high"] = daily[["open", "close"]].max(axis=1) * 1.02
+daily["low"] = daily[["open", "close"]].min(axis=1) * 0.98
+daily["volume"] = 1e9
+
+# Test 1: Forme et timestamps
+print("Test 1: 90 jours -> 2160 bougies horaires")
+hourly = convert_daily_to_hourly(daily, np.random.default_rng(0))
+assert len(hourly) == 90 * 24
+assert list(hourly.columns) == ["timestamp", "open", "high", "low", "close", "volume"]
+assert (hourly["timestamp"].diff().dropna() == pd.Timedelta(hours=1)).all()
+print("✓ Bougies consécutives d'une heure")
+
+# Test 2: Interpolation identique à la version boucle
+print("\nTest 2: Open/close interpolés")
+day, hour = 10, 7
+row = daily.iloc[day]
+expected_open = row["open"] + (row["close"] - row["open"]) * (hour / 24.0)
+expected_close = row["open"] + (row["close"] - row["open"]) * ((hour + 1) / 24.0)
+assert np.isclose(hourly["open"].iloc[day * 24 + hour], expected_open)
+assert np.isclose(hourly["close"].iloc[day * 24 + hour], expected_close)
+assert np.isclose(hourly["close"].iloc[day * 24 + 23], row["close"])
+print("✓ Interpolation linéaire exacte")
+
+# Test 3: Bornes des tirages aléatoires
+print("\nTest 3: Distribution high/low/volume")
+intraday = np.repeat(((daily["high"] - daily["low"]) * 0.4).to_numpy(), 24)
+body_high = hourly[["open", "close"]].max(axis=1)
+body_low = hourly[["open", "close"]].min(axis=1)
+assert ((hourly["high"] - body_high) >= 0).all() and ((hourly["high"] - body_high) <= intraday * 0.5).all()
+assert ((body_low - hourly["low"]) >= 0).all() and ((body_low - hourly["low"]) <= intraday * 0.5).all()
+ratio = hourly["volume"] / (1e9 / 24)
+assert ratio.between(0.8, 1.2).all()
+print(f"✓ Volume/moyenne horaire dans [{ratio.min():.2f}, {ratio.max():.2f}]")
+
+# Test 4: Reproductible avec un Generator seedé
+print("\nTest 4: Reproductibilité")
+again = convert_daily_to_hourly(daily, np.random.default_rng(0))
+assert again.equals(hourly)
+print("✓ Même seed -> mêmes bougies")
+
+print("\n✅ Conversion horaire validée")
@@ -0,0 +1,90 @@
+"""Test: gestionnaire de flux asyncio (reconnexion, réabonnement, statistiques)"""
+import asyncio
+import json
+import threading
+import time
+from websockets.asyncio.server import serve
+from src.feed_manager import FeedManager
+from src.websocket_feeds import CoinbaseWebSocketFeed
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+# Serveur local: répond à l'abonnement par deux ticks, ferme la première
+# connexion (coupure réseau) puis reste muet sur les suivantes
+subscriptions = []
+connections = []
+
+async def handler(ws):
+    connections.append(ws)
+    subscribe = json.loads(await ws.recv())
+    subscriptions.append(subscribe)
+    if len(connections) > 2:
+        await asyncio.sleep(10)
+        return
+    for price in (74000, 74100):
+        await ws.send(json.dumps({"type": "ticker", "product_id": "BTC-USD", "price": str(price + len(connections))}))
+    if len(connections) == 1:
+        await ws.close()
+        return
+    await asyncio.sleep(10)
+
+server_ready = threading.Event()
+server_info = {}
+
+def run_server():
+    async def main():
+        async with serve(handler, "127.0.0.1", 0) as server:
+            server_info["port"] = server.sockets[0].getsockname()[1]
+            server_ready.set()
+            await asyncio.Future()
+    asyncio.run(main())
+
+threading.Thread(target=run_server, daemon=True).start()
+assert server_ready.wait(5)
+url = f"ws://127.0.0.1:{server_info['port']}"
+
+# Test 1: Réception, reconnexion et renvoi de l'abonnement
+print("Test 1: Reconnexion avec réabonnement")
+feed = CoinbaseWebSocketFeed()
+manager = FeedManager(stale_after=1.0, backoff_initial=0.05, backoff_max=0.2)
+received = []
+
+def on_message(message):
+    received.append(message)
+    feed.handle_message(message)
+
+subscribe_msg = {"type": "subscribe", "product_ids": ["BTC-USD"], "channels": ["ticker", "matches"]}
+manager.add_feed("coinbase", url, on_message, subscribe=[subscribe_msg])
+assert wait_until(lambda: len(received) >= 4)
+assert len(subscriptions) >= 2 and all(s == subscribe_msg for s in subscriptions)
+assert feed.get_price("BTC-USD")["price"] == 74102
+status = manager.status()["coinbase"]
+assert status["reconnects"] >= 1 and status["messages"] >= 4 and status["rate"] > 0
+print(f"✓ {status['messages']} messages, {status['reconnects']} reconnexion(s), abonnement renvoyé")
+
+# Test 2: Flux silencieux -> périmé puis reconnecté
+print("\nTest 2: Détection des flux silencieux")
+assert wait_until(lambda: manager.status()["coinbase"]["reconnects"] >= 2, timeout=5)
+assert wait_until(lambda: manager.status()["coinbase"]["stale"], timeout=5)
+print("✓ Flux muet marqué périmé et reconnecté")
+
+# Test 3: Hôte injoignable -> erreurs comptées, pas d'exception
+print("\nTest 3: Hôte injoignable")
+manager.add_feed("dead", "ws://127.0.0.1:9", lambda message: None)
+assert wait_until(lambda: manager.status()["dead"]["errors"] >= 2)
+assert not manager.is_connected("dead")
+print(f"✓ {manager.status()['dead']['errors']} échecs avec backoff")
+
+# Test 4: Arrêt
+print("\nTest 4: Arrêt des flux")
+manager.stop()
+assert manager.status() == {} and not manager.is_connected("coinbase")
+print("✓ Tous les flux arrêtés")
+
+print("\n✅ Gestionnaire de flux validé")
@@ -0,0 +1,59 @@
+"""Test: fenêtres d'historique courtes dérivées d'une fenêtre longue en cache"""
+import tempfile
+import src.data as data
+from src.cache import CacheManager
+
+original_cache = data.cache
+data.cache = CacheManager(cache_dir=tempfile.mkdtemp())
+try:
+    # Test 1: 90J en cache -> 30J et 1J sont des tranches, sans nouvelle génération
+    print("Test 1: Dérivation depuis 90 jours")
+    ninety = data.get_historical_data("EUR", days=90)
+    stats = data.cache.get_stats()
+    thirty = data.get_historical_data("EUR", days=30)
+    one = data.get_historical_data("EUR", days=1)
+    assert len(ninety) == 90 * 24 and len(thirty) == 30 * 24 and len(one) == 24
+    assert thirty.equals(ninety.tail(720).reset_index(drop=True))
+    assert one["close"].iloc[-1] == ninety["close"].iloc[-1]
+    assert data.cache.get("history_EUR_30") is None
+    print(f"✓ 30J/1J = tranches de 90J ({data.cache.get_stats()['memory_items'] - stats['memory_items']} entrée ajoutée)")
+
+    # Test 2: Une fenêtre plus courte ne répond pas à une plus longue
+    print("\nTest 2: Fenêtre plus longue")
+    data.get_historical_data("GBP", days=1)
+    assert data.cache.get("history_windows_GBP") == [1]
+    assert len(data.get_historical_data("GBP", days=30)) == 30 * 24
+    assert data.cache.get("history_windows_GBP") == [1, 30]
+    print("✓ 30J rechargé puis indexé")
+
+    # Test 3: Préchargement de la plus longue fenêtre pour plusieurs tickers
+    print("\nTest 3: prefetch_history")
+    frames = data.prefetch_history(["JPY", "AUD", "JPY"], [1, 30, 90])
+    assert sorted(frames) == ["AUD", "JPY"] and all(len(f) == 90 * 24 for f in frames.values())
+    assert data._cached_history("JPY", 1) is not None and data._cached_history("AUD", 30) is not None
+    assert data.prefetch_history(["JPY", "AUD"], [90]) == {}
+    print("✓ 90J préchargés, 1J et 30J servis depuis le cache, rien de rechargé au rendu suivant")
+
+    # Test 4: Un repli mock n'est jamais indexé ni découpé
+    print("\nTest 4: Repli mock")
+    original_stored = data.get_stored_crypto_history
+    data.get_stored_crypto_history = lambda ticker, days: None
+    try:
+        mock = data.get_historical_data("SOL", days=90)
+        assert len(mock) == 90 * 24 and data.cache.get("history_windows_SOL") is None
+        assert data._cached_history("SOL", 1) is None
+        data.get_historical_data("SOL", days=1)
+        assert data.cache.get("history_windows_SOL") is None
+        # Une fenêtre réelle remplacée par un repli mock sort de l'index
+        data._cache_history("SOL", 30, mock.tail(720), ttl=60)
+        assert data.cache.get("history_windows_SOL") == [30]
+        data._cache_history("SOL", 30, mock.tail(720), ttl=60, shared=False)
+        assert data.cache.get("history_windows_SOL") == [] and data._cached_history("SOL", 1) is not None
+        assert data._cached_history("SOL", 2) is None
+    finally:
+        data.get_stored_crypto_history = original_stored
+    print("✓ 90J mock servi pour 90J seulement, 1J non dérivé du mock")
+finally:
+    data.cache = original_cache
+
+print("\n✅ Fenêtres d'historique validées")
@@ -0,0 +1,89 @@
+"""Test: client HTTP partagé (keep-alive, réessais, limiteur par hôte)"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.http_client import HttpClient, RateLimited, TokenBucket
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures = 0
+    ports = set()
+
+    def do_GET(self):
+        Handler.ports.add(self.client_address[1])
+        if self.path == "/flaky" and Handler.failures < 2:
+            Handler.failures += 1
+            status, body = 503, b"busy"
+        else:
+            status, body = 200, b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base = f"http://127.0.0.1:{server.server_port}"
+
+# Test 1: Connexion réutilisée (keep-alive)
+print("Test 1: Keep-alive")
+client = HttpClient(limits={}, backoff=0.01)
+for _ in range(5):
+    assert client.get(f"{base}/ok", timeout=2).json() == {"ok": True}
+assert len(Handler.ports) == 1
+print(f"✓ 5 requêtes sur {len(Handler.ports)} connexion")
+
+# Test 2: Réessais sur 503
+print("\nTest 2: Réessais")
+response = client.get(f"{base}/flaky", timeout=2)
+assert response.status_code == 200 and client.get_stats()["retried"] == 2
+print(f"✓ Succès après {client.get_stats()['retried']} réessais")
+
+# Test 3: Limiteur: les appels attendent leur tour
+print("\nTest 3: Token bucket")
+client = HttpClient(limits={"127.0.0.1": (20.0, 2)})
+start = time.perf_counter()
+for _ in range(6):
+    client.get(f"{base}/ok", timeout=2)
+elapsed = time.perf_counter() - start
+assert elapsed >= 0.18, elapsed
+assert 0 < client.get_stats()["throttled"] <= 4  # les jetons se rechargent pendant les requêtes lentes
+print(f"✓ 6 requêtes (rafale 2, 20/s) en {elapsed * 1000:.0f} ms")
+
+# Test 4: Pas d'attente au-delà du timeout de la requête
+print("\nTest 4: File d'attente bornée")
+bucket = TokenBucket(rate=0.1, capacity=1)
+assert bucket.acquire(max_wait=0) == 0
+assert bucket.acquire(max_wait=1) is None
+client = HttpClient(limits={"127.0.0.1": (0.1, 1)})
+client.get(f"{base}/ok", timeout=1)
+try:
+    client.get(f"{base}/ok", timeout=1)
+    assert False, "RateLimited attendu"
+except RateLimited:
+    print("✓ RateLimited levé au lieu d'attendre 10 s")
+
+# Test 5: Le délai couvre attente du jeton et réessais
+print("\nTest 5: Délai total")
+client = HttpClient(limits={"127.0.0.1": (1.0, 1)}, retries=5, backoff=0.01)
+client.get(f"{base}/ok", timeout=2)
+start = time.perf_counter()
+try:
+    client.get(f"{base}/ok", timeout=1.5)
+    assert False, "RateLimited attendu"
+except RateLimited:
+    pass
+assert time.perf_counter() - start < 0.5
+Handler.failures = 0
+client = HttpClient(limits={}, retries=5, backoff=1.0)
+start = time.perf_counter()
+response = client.get(f"{base}/flaky", timeout=0.4)
+elapsed = time.perf_counter() - start
+assert response.status_code == 503 and Handler.failures == 1 and elapsed < 0.4, elapsed
+print(f"✓ Jeton à 1 s refusé pour un délai de 1.5 s, 503 renvoyé en {elapsed * 1000:.0f} ms au lieu de réessayer")
+
+server.shutdown()
+print("\n✅ Client HTTP validé")
@@ -0,0 +1,80 @@
+"""Test: indicateurs incrémentaux = derniers points des indicateurs batch"""
+import json
+import numpy as np
+from src import clock
+from src.indicators import (calculate_rsi, calculate_macd, calculate_bollinger_bands, calculate_ema,
+                            IncrementalRSI, IncrementalMACD, IncrementalBollinger, IncrementalEMA,
+                            IncrementalIndicatorSet)
+
+rng = np.random.default_rng(11)
+prices = 74000 * np.exp(np.cumsum(rng.normal(0, 0.01, 300)))
+
+
+def last_values(arrays):
+    return [float(a[-1]) for a in arrays]
+
+
+# Test 1: update() pas à pas depuis zéro, y compris la période de chauffe
+print("Test 1: Flux complet depuis zéro")
+rsi, macd, bands, ema = IncrementalRSI(), IncrementalMACD(), IncrementalBollinger(), IncrementalEMA(20)
+for n in range(1, 120):
+    price = prices[n - 1]
+    for indicator in (rsi, macd, bands, ema):
+        indicator.update(price)
+    window = prices[:n]
+    assert np.isclose(rsi.value, calculate_rsi(window)[-1], rtol=1e-9, atol=1e-9), f"RSI n={n}"
+    assert np.allclose(macd.value, last_values(calculate_macd(window)), rtol=1e-9, atol=1e-9), f"MACD n={n}"
+    assert np.allclose(bands.value, last_values(calculate_bollinger_bands(window)), rtol=1e-9), f"BB n={n}"
+    assert np.isclose(ema.value, calculate_ema(window, 20)[-1], rtol=1e-9), f"EMA n={n}"
+print("✓ Identique au batch à chaque barre")
+
+# Test 2: from_history() puis streaming jusqu'au bout
+print("\nTest 2: Bootstrap depuis l'historique")
+rsi = IncrementalRSI.from_history(prices[:100])
+macd = IncrementalMACD.from_history(prices[:100])
+bands = IncrementalBollinger.from_history(prices[:100])
+for price in prices[100:]:
+    rsi.update(price)
+    macd.update(price)
+    bands.update(price)
+assert np.isclose(rsi.value, calculate_rsi(prices)[-1], rtol=1e-9)
+assert np.allclose(macd.value, last_values(calculate_macd(prices)), rtol=1e-9)
+assert np.allclose(bands.value, last_values(calculate_bollinger_bands(prices)), rtol=1e-9)
+print("✓ from_history + update = batch")
+
+# Test 3: peek() ne modifie pas l'état
+print("\nTest 3: peek()")
+before = rsi.snapshot()
+preview = rsi.peek(prices[-1] * 1.01)
+assert rsi.snapshot() == before
+assert np.isclose(preview, calculate_rsi(np.append(prices, prices[-1] * 1.01))[-1], rtol=1e-9)
+print("✓ peek() sans effet de bord")
+
+# Test 4: snapshot / restore via JSON
+print("\nTest 4: Persistance")
+for indicator in (rsi, macd, bands, IncrementalEMA.from_history(prices, 20)):
+    restored = type(indicator).restore(json.loads(json.dumps(indicator.snapshot())))
+    assert np.allclose(restored.update(prices[0]), indicator.update(prices[0]))
+print("✓ snapshot/restore")
+
+# Test 5: Ticks intra-barre -> indicateurs de la barre en cours
+print("\nTest 5: Agrégation des ticks par barre")
+live = IncrementalIndicatorSet.from_history(prices[:200], now=0)
+live.on_tick(prices[200], timestamp=100)        # même heure: remplace la clôture courante
+live.on_tick(prices[201], timestamp=3600)       # nouvelle heure: valide la barre précédente
+expected = calculate_rsi(np.concatenate([prices[:199], prices[200:202]]))[-1]
+assert np.isclose(live.latest()["rsi"], expected, rtol=1e-9)
+print(f"✓ RSI live: {live.latest()['rsi']:.2f}")
+
+# Test 6: Historique terminé une heure plus tôt: la barre en cours est celle de la dernière bougie
+print("\nTest 6: Barre de la dernière bougie")
+last_bar = 1_700_000_000 // 3600 * 3600
+late = IncrementalIndicatorSet.from_history(prices[:200], now=last_bar)
+late.on_tick(prices[200], last_bar + 3600 + 30)
+assert late.current_bar == last_bar // 3600 + 1
+assert np.isclose(late.latest()["rsi"], calculate_rsi(prices[:201])[-1], rtol=1e-9)
+with clock.use_clock(clock.SimulatedClock(last_bar + 90)):
+    assert IncrementalIndicatorSet.from_history(prices[:200]).current_bar == last_bar // 3600
+print("✓ Premier tick de l'heure suivante: clôture historique validée, RSI = batch")
+
+print("\n✅ Indicateurs incrémentaux validés")
@@ -0,0 +1,58 @@
+"""Test: IndicatorFrame - indicateurs multi-tickers calculés une fois et mémorisés"""
+import numpy as np
+from src.indicator_frame import IndicatorFrame, clear_memo, get_memo_stats
+from src.indicators import calculate_bollinger_bands, calculate_ema, calculate_macd, calculate_macd_batch, calculate_rsi
+from src.trading_rules import SmartSignals
+
+rng = np.random.default_rng(7)
+closes = {
+    "BTC": 74000 * np.exp(np.cumsum(rng.normal(0, 0.01, 720))),
+    "ETH": 2600 * np.exp(np.cumsum(rng.normal(0, 0.01, 720))),
+    "EUR": 1.08 * np.exp(np.cumsum(rng.normal(0, 0.002, 500))),
+    "XAU": np.full(12, 2350.0),
+}
+
+# Test 1: EMA/MACD vectorisés identiques à la récurrence d'origine
+print("Test 1: EMA et MACD vectorisés")
+def reference_ema(prices, period):
+    ema = np.zeros_like(prices)
+    multiplier = 2 / (period + 1)
+    ema[:period] = np.mean(prices[:period])
+    for i in range(period, len(prices)):
+        ema[i] = prices[i] * multiplier + ema[i - 1] * (1 - multiplier)
+    return ema
+
+for period in (9, 12, 26, 200):
+    assert np.allclose(calculate_ema(closes["BTC"], period), reference_ema(closes["BTC"], period), rtol=1e-11)
+batch = calculate_macd_batch(np.vstack([closes["BTC"], closes["ETH"]]))
+for i, ticker in enumerate(("BTC", "ETH")):
+    assert all(np.array_equal(line[i], single) for line, single in zip(batch, calculate_macd(closes[ticker])))
+print("✓ EMA conforme à la boucle, MACD batch = MACD par ticker")
+
+# Test 2: Mêmes résultats que le calcul ticker par ticker
+print("\nTest 2: Résultats identiques")
+clear_memo()
+frame = IndicatorFrame(closes)
+for ticker, prices in closes.items():
+    assert np.array_equal(frame.rsi(ticker), calculate_rsi(prices))
+    assert all(np.array_equal(a, b) for a, b in zip(frame.bollinger(ticker), calculate_bollinger_bands(prices)))
+    assert frame.signals(ticker).get_detailed_signals() == SmartSignals(prices).get_detailed_signals()
+print(f"✓ {len(closes)} tickers (longueurs 720/720/500/12) identiques à SmartSignals")
+
+# Test 3: Un seul calcul par ticker et indicateur, quel que soit le nombre de consommateurs
+print("\nTest 3: Mémorisation par version des données")
+stats = get_memo_stats()
+assert stats["misses"] == len(closes) * 4, stats
+for _ in range(3):
+    again = IndicatorFrame({t: p.copy() for t, p in closes.items()})
+    for ticker in closes:
+        again.signals(ticker)
+        again.rsi(ticker)
+assert get_memo_stats()["misses"] == stats["misses"]
+assert not frame.rsi("BTC").flags.writeable
+updated = dict(closes, BTC=np.append(closes["BTC"][1:], closes["BTC"][-1] * 1.01))
+IndicatorFrame(updated).rsi("BTC")
+assert get_memo_stats()["misses"] == stats["misses"] + 1
+print(f"✓ {stats['misses']} calculs pour 4 rendus, recalcul du seul ticker modifié")
+
+print("\n✅ IndicatorFrame validé")
@@ -0,0 +1,50 @@
+"""Test: moteur de données mock reproductible et registre des actifs"""
+from datetime import datetime
+import numpy as np
+import src.mock_market as mock_market
+from src.mock_market import ASSETS, COINGECKO_IDS, base_price, mock_candles
+from src.data import generate_mock_data, generate_and_sync_mock_data
+
+now = datetime(2026, 3, 1, 14, 35)
+
+# Test 1: Registre central
+print("Test 1: Registre des actifs")
+assert len(ASSETS) == 11 and COINGECKO_IDS["BTC"] == "bitcoin"
+assert base_price("XAU") == 2350 and base_price("UNKNOWN") == 100
+print(f"✓ {len(ASSETS)} actifs, {len(COINGECKO_IDS)} identifiants CoinGecko")
+
+# Test 2: Déterministe pour (ticker, longueur, seed, heure de fin)
+print("\nTest 2: Reproductibilité")
+a = mock_candles("BTC", 720, seed=7, now=now)
+b = mock_candles("BTC", 720, seed=7, now=datetime(2026, 3, 1, 14, 59))
+assert a.equals(b)
+assert a["timestamp"].iloc[-1] == datetime(2026, 3, 1, 14)
+assert not a["close"].equals(mock_candles("BTC", 720, seed=8, now=now)["close"])
+assert not a["close"].equals(mock_candles("ETH", 720, seed=7, now=now)["close"])
+assert not a["close"].equals(mock_candles("BTC", 720, seed=7, now=datetime(2026, 3, 1, 15))["close"])
+print("✓ Même clé -> même série, autre clé -> autre série")
+
+# Test 3: Les appelants peuvent modifier le résultat sans toucher au cache
+print("\nTest 3: Copie indépendante")
+a["close"] += 1000
+assert mock_candles("BTC", 720, seed=7, now=now)["close"].iloc[-1] == b["close"].iloc[-1]
+print("✓ Série en cache intacte")
+
+# Test 4: Fonctions de data.py identiques d'un appel à l'autre
+print("\nTest 4: generate_mock_data / generate_and_sync_mock_data")
+assert generate_mock_data("SOL", 2).equals(generate_mock_data("SOL", 2))
+first = generate_and_sync_mock_data("GBP", 7)
+second = generate_and_sync_mock_data("GBP", 7)
+assert len(first) == 7 * 24 and np.allclose(first["close"], second["close"])
+print("✓ Repli identique entre reruns")
+
+# Test 5: Une seule entrée de cache par série, quelle que soit l'heure
+print("\nTest 5: Entrées de cache")
+entries = mock_market.cache.backend.count()
+for hour in range(10, 14):
+    mock_candles("XRP", 333, seed=7, now=datetime(2026, 3, 1, hour))
+assert mock_market.cache.backend.count() <= entries + 1
+assert mock_candles("XRP", 333, seed=7, now=datetime(2026, 3, 1, 10))["timestamp"].iloc[-1] == datetime(2026, 3, 1, 10)
+print("✓ 4 heures différentes -> 1 entrée remplacée")
+
+print("\n✅ Données mock reproductibles validées")
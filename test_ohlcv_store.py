@@ -0,0 +1,109 @@
+"""Test: store OHLCV local avec ajout incrémental"""
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import src.data as data
+from src.ohlcv_store import OHLCVStore
+
+def candles(start, hours, price=74000.0):
+    closes = price + np.arange(hours, dtype=float)
+    return pd.DataFrame({
+        "timestamp": pd.date_range(start, periods=hours, freq="h"),
+        "open": closes - 1, "high": closes + 5, "low": closes - 5, "close": closes, "volume": 1e6
+    })
+
+# Test 1: Ajout incrémental et lecture par tranches
+print("Test 1: Ajout incrémental")
+store = OHLCVStore(os.path.join(tempfile.mkdtemp(), "ohlcv.sqlite3"))
+assert store.append("BTC", candles("2026-01-01", 90 * 24)) == 2160
+# Chevauchement: seules les bougies postérieures à la dernière sont ajoutées
+assert store.append("BTC", candles("2026-03-31", 48, price=80000.0)) == 24
+assert store.count("BTC") == 2184
+assert store.last_timestamp("BTC") == pd.Timestamp("2026-04-01 23:00")
+day = store.read("BTC", limit=24)
+month = store.read("BTC", limit=30 * 24)
+assert len(day) == 24 and len(month) == 720
+assert day["timestamp"].is_monotonic_increasing and day.equals(month.tail(24).reset_index(drop=True))
+print(f"✓ {store.count('BTC')} bougies, fenêtres 1J/30J = tranches de la même série")
+
+# Test 2: Fraîcheur et jours manquants
+print("\nTest 2: Jours manquants")
+now = time.time()
+store.append("ETH", candles("2026-01-01", 24), now=now - 3 * 86400 - 60)
+assert store.is_stale("ETH", 3600, now=now) and not store.is_stale("BTC", 3600)
+assert store.missing_days("ETH", now=now) == 4
+print("✓ 4 jours à redemander après 3 jours et 1 minute")
+
+# Test 3: get_historical_data ne redemande que la fin manquante
+print("\nTest 3: Requêtes CoinGecko")
+class FakeResponse:
+    # Comme CoinGecko: OHLC en bougies de 30 minutes jusqu'à 2 jours (horodatées à leur fin),
+    # market_chart en un prix par heure (les deux derniers points en avance, horloge décalée)
+    status_code = 200
+    def __init__(self, days, chart=False):
+        now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+        if chart:
+            stamps = pd.date_range(end=now + pd.Timedelta(hours=2), periods=days * 24 + 3, freq="h")
+            self.payload = {"prices": [[int(ts), 196.0 + i % 5] for i, ts in enumerate(stamps.as_unit("ms").astype("int64"))]}
+        else:
+            stamps = pd.date_range(end=now.floor("30min"), periods=days * 48, freq="30min")
+            self.payload = [[int(ts), 195.0, 200.0, 190.0, 196.0] for ts in stamps.as_unit("ms").astype("int64")]
+    def json(self):
+        return self.payload
+
+requested = []
+def fake_get(url, timeout=None):
+    days = int(url.split("days=")[1])
+    requested.append(days)
+    return FakeResponse(days, chart="market_chart" in url)
+
+original = data.http_get, data.ohlcv_store, data.cache
+data.http_get = fake_get
+data.ohlcv_store = OHLCVStore(os.path.join(tempfile.mkdtemp(), "ohlcv.sqlite3"))
+data.cache = type(data.cache)(cache_dir=tempfile.mkdtemp())
+try:
+    data.get_stored_crypto_history("SOL", 90)
+    data.get_stored_crypto_history("SOL", 30)
+    data.get_stored_crypto_history("SOL", 1)
+    assert requested == [90], requested
+    # Rechargement complet: bougies horaires réelles, aucune heure future
+    stored = data.ohlcv_store.read("SOL")
+    utc_hour = pd.Timestamp.now(tz="UTC").tz_localize(None).floor("h")
+    assert len(stored) >= 2160 and (stored["timestamp"].diff().dropna() == pd.Timedelta(hours=1)).all()
+    assert stored["timestamp"].iloc[-1] == utc_hour
+    assert (stored["open"].iloc[1:].to_numpy() == stored["close"].iloc[:-1].to_numpy()).all()
+    # Dernier rafraîchissement il y a ~2 jours: seule la fin est redemandée
+    data.ohlcv_store._connection().execute(
+        "DELETE FROM candles WHERE ticker = 'SOL' AND ts > ?", (int(time.time()) - 2 * 86400,))
+    data.ohlcv_store._connection().execute(
+        "UPDATE series SET fetched_at = ? WHERE ticker = 'SOL'", (time.time() - 2 * 86400 + 60,))
+    before = data.ohlcv_store.last_timestamp("SOL")
+    data.get_stored_crypto_history("SOL", 30)
+    assert requested == [90, 2], requested
+    # Fin manquante en bougies horaires réelles: pas de doublon ni d'heure future
+    stored = data.ohlcv_store.read("SOL")
+    tail = stored[stored["timestamp"] > before]["timestamp"]
+    assert len(tail) > 0 and (tail.diff().dropna() == pd.Timedelta(hours=1)).all()
+    assert stored["timestamp"].is_unique and tail.iloc[-1] <= utc_hour
+    # Rafraîchissement sans bougie nouvelle: la série reste périmée
+    fetched_at = data.ohlcv_store.fetched_at("SOL")
+    assert data.ohlcv_store.append("SOL", stored.tail(3)) == 0 and data.ohlcv_store.fetched_at("SOL") == fetched_at
+    hist = data.get_historical_data("SOL", days=30)
+    assert len(hist) == 720 and list(hist.columns) == ["timestamp", "open", "high", "low", "close", "volume"]
+    print(f"✓ Requêtes CoinGecko: {requested} (90J puis fin manquante)")
+
+    # Série stockée trop courte et API en échec: pas de tranche partielle, repli sur le mock
+    def offline_get(url, timeout=None):
+        raise ConnectionError("offline")
+    data.http_get = offline_get
+    data.ohlcv_store = OHLCVStore(os.path.join(tempfile.mkdtemp(), "ohlcv.sqlite3"))
+    data.ohlcv_store.append("SOL", candles("2026-01-01", 720, price=190.0))
+    assert data.get_stored_crypto_history("SOL", 90) is None
+    assert len(data.get_historical_data("SOL", days=90)) == 2160
+    print("✓ 720 bougies stockées: None pour 90J, historique mock complet")
+finally:
+    data.http_get, data.ohlcv_store, data.cache = original
+
+print("\n✅ Store OHLCV validé")
@@ -0,0 +1,81 @@
+"""Test: optimiseur de paramètres (grille/aléatoire, pool de processus, mémoire partagée)"""
+import subprocess
+import sys
+import time
+import numpy as np
+from src.backtesting import run_backtest
+from src.indicators import calculate_bollinger_bands, calculate_macd, calculate_rsi, calculate_trend
+from src.optimizer import best_params, grid_combinations, optimize, random_combinations
+from src.trading_rules import BUY_SCORE, SELL_SCORE, SmartSignals, TradingRules, composite_scores
+
+rng = np.random.default_rng(11)
+prices = {
+    "BTC": 74000 * np.exp(np.cumsum(rng.normal(0, 0.01, 2160))),
+    "EUR": 1.08 * np.exp(np.cumsum(rng.normal(0, 0.002, 1500))),
+}
+
+# Test 1: Seuils RSI configurables et score composite vectorisé
+print("Test 1: Seuils et score composite")
+closes = prices["BTC"][:500]
+current = TradingRules(closes).rsi[-1]
+assert TradingRules(closes, oversold=current + 1, overbought=current + 2).rsi_signal() == 80
+assert TradingRules(closes, oversold=current - 2, overbought=current - 1).rsi_signal() == 20
+_, _, histogram = calculate_macd(closes)
+_, upper, lower = calculate_bollinger_bands(closes)
+scores = composite_scores(closes, calculate_rsi(closes), histogram, upper, lower, calculate_trend(closes))
+for end in (120, 300, 500):
+    assert scores[end - 1] == SmartSignals(closes[:end]).get_composite_signal()
+print("✓ Score par barre = SmartSignals sur l'historique tronqué")
+
+# Test 2: Grille et tirage aléatoire
+print("\nTest 2: Combinaisons")
+space = {"rsi_period": [7, 14], "oversold": [25, 30], "overbought": [70, 75], "macd_fast": [12, 30],
+         "macd_slow": [26], "bb_std": [2]}
+combos = grid_combinations(space)
+assert len(combos) == 2 * 2 * 2 * 1 and all(c["macd_fast"] < c["macd_slow"] for c in combos)
+sample = random_combinations(5, space, seed=1)
+assert len(sample) == 5 and sample == random_combinations(5, space, seed=1)
+print(f"✓ {len(combos)} combinaisons valides, tirage reproductible")
+
+# Test 3: Pool de processus = calcul local, résultats classés
+print("\nTest 3: Pool de processus")
+local = optimize(prices, combos, max_workers=1)
+pooled = optimize(prices, combos, max_workers=2)
+assert local.equals(pooled) and len(local) == 2 * len(combos)
+assert list(local[local["ticker"] == "BTC"]["rank"]) == list(range(1, len(combos) + 1))
+btc = local[local["ticker"] == "BTC"]
+assert btc["sharpe"].is_monotonic_decreasing
+best = best_params(local)["BTC"]
+rsi = calculate_rsi(prices["BTC"], best["rsi_period"])
+_, _, hist = calculate_macd(prices["BTC"], best["macd_fast"], best["macd_slow"], best["macd_signal"])
+_, up, low = calculate_bollinger_bands(prices["BTC"], best["bb_period"], best["bb_std"])
+score = composite_scores(prices["BTC"], rsi, hist, up, low, calculate_trend(prices["BTC"]), best["oversold"], best["overbought"])
+expected = run_backtest(prices["BTC"], score >= BUY_SCORE, score < SELL_SCORE)
+assert np.isclose(expected["sharpe"], btc["sharpe"].iloc[0])
+print(f"✓ Meilleur BTC: RSI {best['rsi_period']} {best['oversold']}/{best['overbought']}, "
+      f"Sharpe {btc['sharpe'].iloc[0]:.2f}")
+
+# Test 4: Débit sur la grille par défaut
+print("\nTest 4: Grille par défaut")
+start = time.perf_counter()
+table = optimize({"BTC": prices["BTC"]}, max_workers=2)
+elapsed = time.perf_counter() - start
+print(f"✓ {len(table)} combinaisons en {elapsed:.2f}s")
+
+# Test 5: Segment partagé libéré une seule fois, sans avertissement du resource tracker
+print("\nTest 5: Mémoire partagée des workers")
+script = """
+import multiprocessing, numpy as np
+from src.optimizer import optimize, random_combinations
+if __name__ == "__main__":
+    multiprocessing.set_start_method("{method}")
+    prices = {{"BTC": 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, 300))}}
+    print(len(optimize(prices, random_combinations(8), max_workers=2)))
+"""
+for method in ("fork", "spawn"):
+    run = subprocess.run([sys.executable, "-c", script.format(method=method)], capture_output=True, text=True, timeout=120)
+    assert run.returncode == 0 and run.stdout.strip() == "8", run.stderr
+    assert "leaked" not in run.stderr and "Traceback" not in run.stderr, run.stderr
+print("✓ fork et spawn: aucun segment fuité ni double unlink")
+
+print("\n✅ Optimiseur validé")
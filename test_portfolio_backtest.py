@@ -0,0 +1,89 @@
+"""Test: backtest de portefeuille multi-actifs (alignement, risque, flux, walk-forward)"""
+import time
+import numpy as np
+import pandas as pd
+from src.portfolio_backtest import (align_closes, backtest_portfolio, composite_matrix, run_portfolio,
+                                    walk_forward, walk_forward_splits)
+
+def history(start, periods, seed):
+    prices = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, periods)))
+    return pd.DataFrame({"timestamp": pd.date_range(start, periods=periods, freq="h"), "close": prices})
+
+histories = {
+    "BTC": history("2024-01-01", 3000, 1),
+    "ETH": history("2024-01-05", 2900, 2),
+    "SOL": history("2024-01-01", 3000, 3).iloc[::2],
+}
+
+# Test 1: Index commun, NaN avant le début d'un ticker, trous reportés
+print("Test 1: Alignement")
+tickers, timestamps, matrix = align_closes(histories)
+assert tickers == ["BTC", "ETH", "SOL"] and matrix.shape == (3, 3000) and timestamps.is_monotonic_increasing
+assert np.isnan(matrix[1, :96]).all() and not np.isnan(matrix[1, 96:]).any()
+assert not np.isnan(matrix[2]).any() and matrix[2, 1] == matrix[2, 0]
+print("✓ 3 tickers sur 3000 barres")
+
+# Test 2: Scores causaux (tronquer l'historique ne change pas le passé)
+print("\nTest 2: Scores composites")
+scores = composite_matrix(tickers, matrix)
+assert (scores[1, :96] == 50).all()
+assert np.allclose(composite_matrix(tickers, matrix, stop=1500), scores[:, :1500])
+custom = composite_matrix(tickers, matrix, {"BTC": {"oversold": 40, "overbought": 60}})
+assert not np.array_equal(custom[0], scores[0]) and np.array_equal(custom[1:], scores[1:])
+print("✓ Scores indépendants du futur, paramètres par ticker")
+
+# Test 3: Flux d'événements et règle de risque
+print("\nTest 3: Simulation")
+events = list(run_portfolio(tickers, timestamps, matrix, scores, chunk=500, risk_per_trade=0.02, stop_loss=0.05))
+progress, summary = events[:-1], events[-1]
+assert [e["type"] for e in progress] == ["progress"] * 5 and summary["type"] == "summary"
+assert all(a["progress"] < b["progress"] for a, b in zip(progress, progress[1:]))
+trades = [t for e in events for t in e["trades"]]
+assert len(trades) == summary["total_trades"] > 0
+equity = summary["equity"]
+assert len(equity) == 3000 and np.isclose(equity[-1], summary["final_balance"])
+for trade in trades:
+    # Risque jusqu'au stop <= 2% du capital, exposition <= 10% par actif
+    position = trade["units"] * trade["entry_price"]
+    index = timestamps.get_loc(trade["entry_time"])
+    assert position * 0.05 <= 0.02 * equity[index] + 1e-9
+    assert position <= 0.10 * equity[index] + 1e-9
+    assert trade["reason"] != "stop" or trade["return"] <= -0.05
+print(f"✓ {len(trades)} trades, gain {summary['profit_percent']:.2f}%, drawdown {summary['max_drawdown']:.2f}%")
+
+# Test 4: Backtest complet depuis les historiques
+print("\nTest 4: backtest_portfolio")
+again = list(backtest_portfolio(histories, chunk=1000))[-1]
+assert again["final_balance"] == list(run_portfolio(tickers, timestamps, matrix, scores))[-1]["final_balance"]
+print(f"✓ Solde final {again['final_balance']:.2f}")
+
+# Test 5: Walk-forward: fenêtres contiguës et capital chaîné
+print("\nTest 5: Walk-forward")
+splits = walk_forward_splits(3000, 1000, 500)
+assert [(s[0].start, s[1].start, s[1].stop) for s in splits] == [(0, 1000, 1500), (500, 1500, 2000),
+                                                                   (1000, 2000, 2500), (1500, 2500, 3000)]
+assert walk_forward_splits(100, 80, 50) == []
+combos = [{"rsi_period": 14, "oversold": o, "overbought": 70, "macd_fast": 12, "macd_slow": 26,
+           "macd_signal": 9, "bb_period": 20, "bb_std": 2} for o in (25, 35)]
+results = [e for e in walk_forward(histories, 1000, 500, combos=combos, chunk=250, initial_balance=5000)
+           if e["type"] == "split"]
+assert [r["split"] for r in results] == [0, 1, 2, 3]
+assert results[0]["initial_balance"] == 5000
+for previous, current in zip(results, results[1:]):
+    assert current["initial_balance"] == previous["final_balance"]
+assert set(results[0]["params"]) == set(tickers) and results[0]["params"]["BTC"]["oversold"] in (25, 35)
+assert results[-1]["test"][1] == timestamps[-1]
+print(f"✓ {len(results)} fenêtres, solde final {results[-1]['final_balance']:.2f}")
+
+# Test 6: 3 ans de barres horaires sur 5 tickers
+print("\nTest 6: Performance")
+big = {t: history("2021-01-01", 3 * 365 * 24, seed) for seed, t in enumerate("ABCDE")}
+start = time.perf_counter()
+count = 0
+for event in backtest_portfolio(big, chunk=5000):
+    count += 1
+elapsed = time.perf_counter() - start
+assert event["type"] == "summary" and len(event["equity"]) == 3 * 365 * 24 and count > 5
+print(f"✓ {len(event['equity'])} barres x 5 tickers en {elapsed:.2f}s ({event['total_trades']} trades)")
+
+print("\n✅ Backtest de portefeuille validé")
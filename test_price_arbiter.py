@@ -0,0 +1,94 @@
+"""Test: arbitrage des sources de prix selon la fraîcheur"""
+import json
+import tempfile
+import time
+from datetime import datetime, timezone
+import src.data as data
+from src.cache import CacheManager
+from src.price_arbiter import PriceArbiter
+from src.websocket_feeds import BinanceWebSocketFeed, CoinbaseWebSocketFeed
+
+now = time.time()
+
+def source(price, age, latency=0.0):
+    return lambda ticker: {"price": price, "updated_at": now - age, "latency": latency}
+
+# Test 1: Source la plus fraîche dans le budget
+print("Test 1: Source la plus fraîche")
+arbiter = PriceArbiter(staleness_budget=5)
+arbiter.add_source("binance-websocket", source(74000, age=3.0))
+arbiter.add_source("coinbase-websocket", source(74050, age=1.0))
+arbiter.add_source("coincap-websocket", source(73000, age=60.0))
+arbiter.add_source("broken", lambda ticker: 1 / 0)
+result = arbiter.select("BTC", now=now)
+assert result["source"] == "coinbase-websocket" and result["price"] == 74050
+assert abs(result["age"] - 1.0) < 1e-6 and result["candidates"] == 2
+print(f"✓ {result['source']} retenu (âge {result['age']:.1f}s), CoinCap périmé ignoré")
+
+# Test 2: La latence compte dans la fraîcheur
+print("\nTest 2: Latence des sources")
+arbiter = PriceArbiter(staleness_budget=5)
+arbiter.add_source("binance-websocket", source(74000, age=1.0, latency=0.1))
+arbiter.add_source("coinbase-websocket", source(74050, age=0.5, latency=2.0))
+assert arbiter.select("BTC", now=now)["source"] == "binance-websocket"
+arbiter.record_latency("coingecko-api", 0.4)
+arbiter.record_latency("coingecko-api", 0.9)
+assert 0.4 < arbiter.latency("coingecko-api") < 0.9
+print("✓ Âge + latence minimal retenu, latence REST moyennée")
+
+# Test 3: Médiane des sources fraîches
+print("\nTest 3: Mode médiane")
+arbiter = PriceArbiter(staleness_budget=5, mode="median")
+arbiter.add_source("a", source(100, age=1.0))
+arbiter.add_source("b", source(104, age=2.0))
+arbiter.add_source("c", source(101, age=0.5))
+result = arbiter.select("BTC", now=now)
+assert result["price"] == 101 and result["age"] == 2.0 and result["source"].startswith("median(")
+assert arbiter.get_stats()["selected"][result["source"]] == 1
+print(f"✓ Médiane {result['price']} sur {result['candidates']} sources")
+
+# Test 4: get_crypto_price - flux réels, puis REST quand tous sont périmés
+print("\nTest 4: Repli REST quand tous les flux sont périmés")
+
+class FakeResponse:
+    status_code = 200
+
+    def json(self):
+        return {"bitcoin": {"usd": 73500.0, "last_updated_at": time.time() - 20}}
+
+binance = BinanceWebSocketFeed()
+coinbase = CoinbaseWebSocketFeed()
+arbiter = PriceArbiter(staleness_budget=5)
+arbiter.add_source("binance-websocket", data._feed_reader(lambda: binance, lambda t: f"{t}USDT"))
+arbiter.add_source("coinbase-websocket", data._feed_reader(lambda: coinbase, lambda t: f"{t}-USD"))
+original = (data.price_arbiter, data.http_get, data.cache, data.WEBSOCKET_AVAILABLE)
+try:
+    data.price_arbiter = arbiter
+    data.http_get = lambda url, timeout=None: FakeResponse()
+    data.cache = CacheManager(cache_dir=tempfile.mkdtemp())
+    data.WEBSOCKET_AVAILABLE = True
+    binance.handle_message(json.dumps({"data": {"s": "BTCUSDT", "c": "74000", "E": time.time() * 1000}}))
+    coinbase.store.append("BTC-USD", 74100, timestamp=time.time() - 30)
+    live = data.get_crypto_price("BTC")
+    assert live["source"] == "binance-websocket" and live["price"] == 74000 and live["age"] < 5
+    binance.store.append("BTCUSDT", 74000, timestamp=time.time() - 30)
+    rest = data.get_crypto_price("BTC")
+    assert rest["source"] == "coingecko-api" and rest["price"] == 73500 and 19 < rest["age"] < 30
+    print(f"✓ WebSocket frais ({live['age']:.2f}s) puis CoinGecko (âge {rest['age']:.0f}s)")
+finally:
+    data.price_arbiter, data.http_get, data.cache, data.WEBSOCKET_AVAILABLE = original
+
+# Test 5: Tick Coinbase horodaté par l'échange: un flux en retard est écarté
+print("\nTest 5: Retard du flux Coinbase")
+lagging = CoinbaseWebSocketFeed()
+sent = time.time() - 8
+lagging.handle_message(json.dumps({"type": "ticker", "product_id": "ETH-USD", "price": "2500",
+                                   "time": datetime.fromtimestamp(sent, timezone.utc).isoformat().replace("+00:00", "Z")}))
+tick = lagging.get_price("ETH-USD")
+assert abs(tick["updated_at"] - sent) < 1e-3 and 7.5 < lagging.latency.value < 9
+arbiter = PriceArbiter(staleness_budget=5)
+arbiter.add_source("coinbase-websocket", data._feed_reader(lambda: lagging, lambda t: f"{t}-USD"))
+assert arbiter.select("ETH") is None
+print(f"✓ Tick âgé de {time.time() - tick['updated_at']:.1f}s (heure de l'échange), latence {lagging.latency.value:.1f}s")
+
+print("\n✅ Arbitrage des prix validé")
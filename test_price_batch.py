@@ -0,0 +1,83 @@
+"""Test: get_live_price_batch - requêtes regroupées, parallèles et délai total"""
+import tempfile
+import threading
+import time
+import src.data as data
+from src.cache import CacheManager
+
+TICKERS = ["BTC", "ETH", "SOL", "ADA", "XRP", "DOT", "EUR", "GBP", "JPY", "AUD", "XAU"]
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+calls = []
+lock = threading.Lock()
+
+def fake_get(url, timeout=None, delay=0.3):
+    with lock:
+        calls.append(url)
+    time.sleep(delay)
+    if "coingecko" in url:
+        return FakeResponse({coin: {"usd": 100.0} for coin in data.COINGECKO_IDS.values()})
+    if "exchangerate" in url and "base=USD" in url:
+        return FakeResponse({"success": True, "rates": {t: 0.5 for t in data.FOREX_TICKERS}})
+    return FakeResponse({"price": 2400.0})
+
+original_get = data.http_get
+original_cache = data.cache
+original_websocket = data.WEBSOCKET_AVAILABLE
+data.WEBSOCKET_AVAILABLE = False
+try:
+    # Test 1: Une requête CoinGecko + une requête forex, en parallèle
+    print("Test 1: Requêtes regroupées")
+    data.cache = CacheManager(cache_dir=tempfile.mkdtemp())
+    data.http_get = fake_get
+    start = time.perf_counter()
+    prices = data.get_live_price_batch(TICKERS)
+    elapsed = time.perf_counter() - start
+    assert list(prices) == TICKERS
+    assert all(prices[t]["price"] == 100.0 for t in data.COINGECKO_IDS)
+    assert all(prices[t]["price"] == 0.5 for t in data.FOREX_TICKERS)
+    assert prices["XAU"]["price"] == 2400.0
+    assert sum("coingecko" in url for url in calls) == 1
+    assert sum("symbols=EUR,GBP,JPY,AUD" in url for url in calls) == 1
+    assert elapsed < 0.6, elapsed
+    print(f"✓ {len(calls)} requêtes en {elapsed * 1000:.0f} ms")
+
+    # Test 2: Délai total respecté, repli sur les prix par défaut
+    print("\nTest 2: Délai total")
+    data.cache = CacheManager(cache_dir=tempfile.mkdtemp())
+    data.http_get = lambda url, timeout=None: fake_get(url, timeout, delay=2.0)
+    start = time.perf_counter()
+    prices = data.get_live_price_batch(TICKERS, deadline=0.2)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.5, elapsed
+    assert prices["BTC"]["source"] == "fallback-cache"
+    assert all(prices[t]["price"] > 0 for t in TICKERS)
+    print(f"✓ Réponse en {elapsed * 1000:.0f} ms avec prix de repli")
+
+    # Test 3: Devises absentes de la réponse groupée: repli sans requête par devise
+    print("\nTest 3: Devises manquantes")
+    data.cache = CacheManager(cache_dir=tempfile.mkdtemp())
+    calls.clear()
+    def partial_get(url, timeout=None):
+        with lock:
+            calls.append(url)
+        return FakeResponse({"success": True, "rates": {"EUR": 0.9}})
+    data.http_get = partial_get
+    prices = data.get_live_price_batch(["EUR", "GBP", "JPY"])
+    assert prices["EUR"]["price"] == 0.9 and prices["GBP"]["price"] > 0 and prices["JPY"]["price"] > 0
+    assert len(calls) == 1, calls
+    print("✓ 1 requête, GBP/JPY servis par le prix de repli")
+finally:
+    data.http_get = original_get
+    data.cache = original_cache
+    data.WEBSOCKET_AVAILABLE = original_websocket
+
+print("\n✅ Batch de prix validé")
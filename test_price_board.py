@@ -0,0 +1,65 @@
+"""Test: tableau des prix en mémoire partagée (seqlock, lecture inter-processus)"""
+import multiprocessing
+import os
+import time
+import src.data as data
+from src.price_board import PriceBoard, TICKERS
+
+name = f"test_price_board_{os.getpid()}"
+
+def hammer(name, count):
+    # Écrivain dans un autre processus: price == bid == ask à chaque écriture
+    board = PriceBoard(name)
+    for i in range(1, count + 1):
+        board.write("BTC", {"price": i, "bid": i, "ask": i, "source": "binance-websocket"})
+    board.close()
+
+writer = PriceBoard(name, create=True)
+try:
+    # Test 1: Écriture / lecture par un autre attachement
+    print("Test 1: Publication et lecture")
+    writer.heartbeat()
+    writer.write("ETH", {"price": 2600.5, "bid": 2600, "ask": 2601, "volume": 12, "source": "median(a,b)",
+                         "updated_at": time.time() - 1, "latency": 0.05})
+    reader = PriceBoard(name)
+    quote = reader.read("ETH")
+    assert quote["price"] == 2600.5 and quote["ask"] == 2601 and quote["source"] == "median"
+    assert 0.9 < quote["age"] < 2 and quote["latency"] == 0.05
+    assert reader.read("SOL") is None and reader.read("UNKNOWN") is None
+    assert reader.read("ETH", max_age=0.5) is None
+    assert list(reader.snapshot()) == ["ETH"] and reader.writer_age() < 5
+    print(f"✓ ETH {quote['price']} lu ({len(TICKERS)} lignes, âge {quote['age']:.1f}s)")
+
+    # Test 2: Lectures cohérentes pendant les écritures d'un autre processus
+    print("\nTest 2: Seqlock inter-processus")
+    process = multiprocessing.get_context("fork").Process(target=hammer, args=(name, 200000))
+    process.start()
+    reads = torn = 0
+    while process.is_alive():
+        quote = reader.read("BTC")
+        if quote:
+            reads += 1
+            torn += not (quote["price"] == quote["bid"] == quote["ask"])
+    process.join()
+    assert process.exitcode == 0 and torn == 0
+    assert reader.read("BTC")["price"] == 200000
+    print(f"✓ {reads} lectures pendant 200000 écritures, aucune incohérente")
+
+    # Test 3: get_crypto_price lit le tableau avant les flux et l'API
+    print("\nTest 3: Lecture depuis src/data.py")
+    original = data.get_board_reader
+    data.get_board_reader = lambda: reader
+    try:
+        price = data.get_crypto_price("ETH")
+        assert price["price"] == 2600.5 and price["source"] == "median" and price["timestamp"]
+        writer.write("ETH", {"price": 2500, "source": "coincap-websocket", "updated_at": time.time() - 60})
+        assert data._board_crypto_price("ETH") is None
+    finally:
+        data.get_board_reader = original
+    print("✓ Prix partagé servi, prix périmé ignoré")
+    reader.close()
+finally:
+    writer.close()
+    writer.unlink()
+
+print("\n✅ Tableau des prix partagé validé")
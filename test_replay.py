@@ -0,0 +1,82 @@
+"""Test: horloge remplaçable et replay des bougies dans le chemin de signaux live"""
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import src.alerts as alerts_module
+from src import clock
+from src.data import _crypto_fallback_price
+from src.indicators import calculate_bollinger_bands, calculate_macd, calculate_rsi, calculate_trend
+from src.mock_market import mock_candles
+from src.replay import ReplayEngine, candle_events, merge_events, tick_events
+from src.trading_rules import composite_scores
+
+# Test 1: Horloge simulée dans data et alerts
+print("Test 1: Horloge")
+simulated = clock.SimulatedClock(datetime(2024, 3, 1, 12).timestamp())
+with clock.use_clock(simulated):
+    assert _crypto_fallback_price("BTC")["timestamp"] == datetime(2024, 3, 1, 12)
+    simulated.advance(90)
+    alerts_file, alerts_module.ALERTS_FILE = alerts_module.ALERTS_FILE, os.path.join(tempfile.mkdtemp(), "alerts.json")
+    try:
+        alerts_module.save_alert_history("BTC", "overbought", 75)
+        with open(alerts_module.ALERTS_FILE, encoding="utf-8") as f:
+            assert json.load(f)[-1]["timestamp"] == "2024-03-01T12:01:30"
+    finally:
+        alerts_module.ALERTS_FILE = alerts_file
+    simulated.set(0)
+    assert clock.time() == datetime(2024, 3, 1, 12, 1, 30).timestamp()
+assert isinstance(clock.get_clock(), clock.SystemClock) and abs(clock.time() - time.time()) < 1
+print("✓ datetime.now() de data/alerts suit l'horloge installée")
+
+# Test 2: Découpage des bougies et fusion des flux
+print("\nTest 2: Événements")
+candles = mock_candles("BTC", 1440, now=pd.Timestamp("2025-06-01"))
+events = candle_events("BTC", candles.iloc[:2])
+assert events[0][2] == candles["open"].iat[0] and events[3][2] == candles["close"].iat[0]
+assert events[3][0] - events[0][0] == 3599 and events[4][0] - events[0][0] == 3600
+merged = list(merge_events(tick_events("ETH", [1.0, 2.0], [10.0, 5000.0]), events))
+assert [e[0] for e in merged] == sorted(e[0] for e in merged) and len(merged) == 10
+print("✓ 4 ticks par bougie, flux fusionnés dans l'ordre")
+
+# Test 3: Signaux du replay = scores composites du backtest, barre par barre
+print("\nTest 3: Replay vs backtest")
+closes = candles["close"].to_numpy()
+engine = ReplayEngine(speed=None, history_bars=None)
+engine.warmup("BTC", closes[:721], candles["timestamp"].iat[720].timestamp())
+report = engine.run(candle_events("BTC", candles.iloc[721:]))
+signals = report["signals"]
+assert report["events"] == 4 * 719 and len(signals) == 719
+assert np.allclose([s["price"] for s in signals], closes[720:1439])
+expected = composite_scores(closes, calculate_rsi(closes), calculate_macd(closes)[2],
+                            *calculate_bollinger_bands(closes)[1:], calculate_trend(closes))
+assert np.allclose([s["score"] for s in signals], expected[720:1439])
+assert np.isclose(engine.indicators["BTC"].latest()["rsi"], calculate_rsi(closes)[-1])
+assert all(a["type"] in ("overbought", "oversold") and a["timestamp"].year == 2025 for a in report["alerts"])
+assert signals[0]["timestamp"] == datetime.fromtimestamp(candles["timestamp"].iat[721].timestamp())
+print(f"✓ {len(signals)} signaux identiques au backtest, {len(report['alerts'])} alertes, "
+      f"{report['events_per_sec']:,.0f} événements/s")
+
+# Test 4: Vitesse 1000x
+print("\nTest 4: Cadence")
+engine = ReplayEngine(speed=1000)
+ticks = tick_events("ETH", 2000 + np.arange(5.0), 1.7e9 + np.arange(5) * 60)
+report = engine.run(ticks)
+assert report["simulated_seconds"] == 240 and 0.24 <= report["seconds"] < 1.0
+print(f"✓ 240 s simulées en {report['seconds']:.3f} s (x{report['acceleration']:.0f})")
+
+# Test 5: Générateur suspendu: l'horloge globale reste celle du système
+print("\nTest 5: Horloge du replay isolée")
+engine = ReplayEngine(speed=None)
+engine.warmup("BTC", closes[:721], candles["timestamp"].iat[720].timestamp())
+stream = engine.stream(candle_events("BTC", candles.iloc[721:760]))
+first = next(stream)
+assert first["timestamp"].year == 2025 and engine.clock.time() < time.time() - 86400
+assert isinstance(clock.get_clock(), clock.SystemClock) and abs(clock.time() - time.time()) < 1
+assert sum(1 for _ in stream) > 0 and isinstance(clock.get_clock(), clock.SystemClock)
+print("✓ Heure simulée propre au moteur, clock.time() inchangé entre deux événements")
+
+print("\n✅ Replay validé")
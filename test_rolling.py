@@ -0,0 +1,54 @@
+"""Test: fenêtres glissantes O(n) et indicateurs qui les utilisent"""
+import numpy as np
+from src.rolling import rolling_mean, rolling_std, rolling_min, rolling_max
+from src.indicators import calculate_bollinger_bands, calculate_volatility
+from src.trading_rules import RiskAssessment
+
+rng = np.random.default_rng(7)
+windows = np.lib.stride_tricks.sliding_window_view
+
+
+def max_rel_error(result, expected):
+    return np.max(np.abs(result - expected) / np.maximum(np.abs(expected), 1e-300))
+
+
+# Test 1: rolling_* == calcul fenêtre par fenêtre
+print("Test 1: Équivalence avec np.mean/np.std/np.min/np.max par fenêtre")
+for scale in [0.0067, 1.08, 74000]:
+    prices = scale * np.exp(np.cumsum(rng.normal(0, 0.01, 3000)))
+    for window in [2, 5, 20, 50]:
+        view = windows(prices, window)
+        assert max_rel_error(rolling_mean(prices, window), view.mean(axis=1)) < 1e-9
+        assert max_rel_error(rolling_std(prices, window), view.std(axis=1)) < 1e-9
+        assert np.array_equal(rolling_min(prices, window), view.min(axis=1))
+        assert np.array_equal(rolling_max(prices, window), view.max(axis=1))
+print("✓ Erreur relative < 1e-9")
+
+# Test 2: Bollinger et volatilité identiques à l'ancienne boucle
+print("\nTest 2: Bollinger & volatilité")
+prices = 74000 * np.exp(np.cumsum(rng.normal(0, 0.01, 2160)))
+mid, upper, lower = calculate_bollinger_bands(prices)
+expected_std = np.zeros_like(prices)
+for i in range(19, len(prices)):
+    expected_std[i] = np.std(prices[i - 19:i + 1])
+assert max_rel_error(upper - mid, expected_std * 2) < 1e-9
+returns = np.diff(np.log(prices))
+volatility = calculate_volatility(prices)
+for i in [19, 500, len(prices) - 2, len(prices) - 1]:
+    assert abs(volatility[i] - np.std(returns[i - 19:i + 1])) <= 1e-9 * volatility[i]
+print("✓ Bandes et volatilité conformes")
+
+# Test 3: Fenêtre plus grande que la série -> vide
+print("\nTest 3: Séries trop courtes")
+assert len(rolling_std(np.array([1.0, 2.0]), 5)) == 0
+assert len(rolling_min(np.array([]), 3)) == 0
+print("✓ Arrays vides")
+
+# Test 4: Support / résistance sur la dernière période
+print("\nTest 4: Support / résistance")
+risk = RiskAssessment(prices, period=30)
+assert risk.find_support() == np.min(prices[-30:])
+assert risk.find_resistance() == np.max(prices[-30:])
+print("✓ Support et résistance inchangés")
+
+print("\n✅ Fenêtres glissantes validées")
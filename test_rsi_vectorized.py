@@ -0,0 +1,63 @@
+"""Test: le RSI vectorisé reproduit la boucle de Wilder d'origine"""
+import time
+import numpy as np
+from src.indicators import calculate_rsi, calculate_rsi_batch
+
+
+def reference_rsi(prices, period=14):
+    """Ancienne implémentation barre par barre (référence)"""
+    deltas = np.diff(prices)
+    seed = deltas[:period+1]
+    up = seed[seed >= 0].sum() / period
+    down = -seed[seed < 0].sum() / period
+    rs = up / down if down != 0 else 0
+    rsis = np.zeros_like(prices)
+    rsis[period] = 100 - 100 / (1 + rs) if rs >= 0 else 0
+    for i in range(period + 1, len(prices)):
+        delta = deltas[i - 1]
+        if delta > 0:
+            up = (up * (period - 1) + delta) / period
+            down = down * (period - 1) / period
+        else:
+            up = up * (period - 1) / period
+            down = (down * (period - 1) - delta) / period
+        rs = up / down if down != 0 else 0
+        rsis[i] = 100 - 100 / (1 + rs) if rs >= 0 else 0
+    return rsis
+
+
+rng = np.random.default_rng(42)
+
+# Test 1: Séries aléatoires, plusieurs périodes
+print("Test 1: Équivalence avec la boucle d'origine")
+for period in [2, 7, 14, 30]:
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 500)))
+    expected = reference_rsi(prices, period)
+    result = calculate_rsi(prices, period)
+    assert np.allclose(result, expected, rtol=0, atol=1e-9), f"RSI({period}) diverge"
+print("✓ RSI identique (atol 1e-9)")
+
+# Test 2: Séries courtes -> valeur neutre
+print("\nTest 2: Séries courtes")
+assert list(calculate_rsi(np.array([100.0, 101.0]))) == [50, 50]
+assert list(calculate_rsi(np.array([]))) == [50]
+print("✓ Valeur neutre 50")
+
+# Test 3: Batch 2-D = calcul ligne par ligne
+print("\nTest 3: Batch multi-tickers")
+matrix = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (11, 2160)), axis=1))
+start = time.perf_counter()
+batch = calculate_rsi_batch(matrix)
+elapsed = time.perf_counter() - start
+for row, prices in zip(batch, matrix):
+    assert np.allclose(row, reference_rsi(prices), rtol=0, atol=1e-9)
+print(f"✓ 11 tickers x 2160 barres en {elapsed * 1000:.1f} ms")
+
+# Test 4: NaN -> RSI à 0 ensuite, comme avant
+print("\nTest 4: NaN dans les prix")
+prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 60)))
+prices[40] = np.nan
+assert np.allclose(calculate_rsi(prices), reference_rsi(prices), rtol=0, atol=1e-9)
+print("✓ Comportement NaN conservé")
+
+print("\n✅ RSI vectorisé validé")
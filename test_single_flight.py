@@ -0,0 +1,80 @@
+"""Test: regroupement des appels amont concurrents (single-flight)"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import src.data as data
+from src.data import SingleFlight
+
+# Test 1: 20 appels concurrents -> 1 exécution
+print("Test 1: Appels concurrents identiques")
+flights = SingleFlight()
+executions = []
+
+def slow_fetch(value):
+    executions.append(value)
+    time.sleep(0.2)
+    return {"price": value}
+
+with ThreadPoolExecutor(max_workers=20) as pool:
+    results = list(pool.map(lambda _: flights.do("price_BTC", slow_fetch, 74000.0), range(20)))
+assert len(executions) == 1
+assert all(r == {"price": 74000.0} for r in results)
+stats = flights.get_stats()
+assert stats["calls"] == 20 and stats["executed"] == 1 and stats["deduplicated"] == 19
+print(f"✓ {stats}")
+
+# Test 2: Clés différentes -> appels séparés, appels successifs -> ré-exécution
+print("\nTest 2: Clés distinctes et appels successifs")
+flights.do("price_ETH", slow_fetch, 2600.0)
+flights.do("price_ETH", slow_fetch, 2600.0)
+assert len(executions) == 3
+assert flights.get_stats()["in_flight"] == 0
+print("✓ Pas de résultat conservé après la fin de l'appel")
+
+# Test 3: L'exception est partagée par tous les appelants
+print("\nTest 3: Propagation des erreurs")
+def failing_fetch():
+    time.sleep(0.1)
+    raise ConnectionError("upstream down")
+
+errors = []
+def call():
+    try:
+        flights.do("down", failing_fetch)
+    except ConnectionError as e:
+        errors.append(e)
+threads = [threading.Thread(target=call) for _ in range(5)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+assert len(errors) == 5
+print("✓ 5 appelants reçoivent l'erreur")
+
+# Test 4: get_gold_price concurrent -> une seule série de requêtes HTTP
+print("\nTest 4: get_gold_price")
+class FakeResponse:
+    status_code = 200
+    def json(self):
+        return {"price": 2400.0}
+
+urls = []
+def fake_get(url, timeout=None):
+    urls.append(url)
+    time.sleep(0.2)
+    return FakeResponse()
+
+original_get = data.http_get
+data.http_get = fake_get
+try:
+    before = data.get_single_flight_stats()["deduplicated"]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        prices = list(pool.map(lambda _: data.get_gold_price()["price"], range(8)))
+finally:
+    data.http_get = original_get
+assert prices == [2400.0] * 8
+assert len(urls) == 1
+assert data.get_single_flight_stats()["deduplicated"] - before == 7
+print(f"✓ 8 appels, {len(urls)} requête HTTP")
+
+print("\n✅ Single-flight validé")
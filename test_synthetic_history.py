@@ -0,0 +1,51 @@
+"""Test: générateurs d'historique forex/or vectorisés (marche aléatoire en forme fermée)"""
+import numpy as np
+import pandas as pd
+import src.data as data
+from src.data import _linear_walk, fetch_forex_historical, fetch_gold_historical
+
+# Test 1: Forme fermée == récurrence pas à pas
+print("Test 1: Récurrence linéaire")
+rng = np.random.default_rng(1)
+growth = 1 + rng.normal(0, 0.0015, 8760)
+drift = rng.normal(0, 0.1, 8760)
+expected, x = [], 2000.0
+for g, d in zip(growth, drift):
+    x = g * x + d
+    expected.append(x)
+assert np.allclose(_linear_walk(2000.0, growth, drift), expected, rtol=1e-10)
+print("✓ 8760 pas identiques à la boucle")
+
+class FakeResponse:
+    status_code = 200
+    def json(self):
+        return {"success": True, "rates": {"GBP": 0.79}}
+
+original_get = data.http_get
+data.http_get = lambda url, timeout=None: FakeResponse()
+try:
+    # Test 2: Forex synchronisé sur le taux live
+    print("\nTest 2: Historique forex")
+    forex = fetch_forex_historical("GBP", 365, rng=np.random.default_rng(0))
+    assert len(forex) == 365 * 24
+    assert np.isclose(forex["close"].iloc[-1], 0.79)
+    assert (forex["high"] >= forex[["open", "close"]].max(axis=1)).all()
+    assert (forex["low"] <= forex[["open", "close"]].min(axis=1)).all()
+    assert (forex["timestamp"].diff().dropna() == pd.Timedelta(hours=1)).all()
+    assert forex.equals(fetch_forex_historical("GBP", 365, rng=np.random.default_rng(0)).assign(timestamp=forex["timestamp"]))
+    print(f"✓ {len(forex)} bougies, dernière clôture {forex['close'].iloc[-1]:.4f}")
+finally:
+    data.http_get = original_get
+
+# Test 3: Or synchronisé sur le prix live
+print("\nTest 3: Historique or")
+gold = fetch_gold_historical(90, rng=np.random.default_rng(0))
+live = data.get_gold_price()["price"]
+assert len(gold) == 90 * 24
+assert np.isclose(gold["close"].iloc[-1], live)
+assert (gold["high"] >= gold[["open", "close"]].max(axis=1)).all()
+assert (gold["low"] <= gold[["open", "close"]].min(axis=1)).all()
+assert gold["timestamp"].is_monotonic_increasing
+print(f"✓ {len(gold)} bougies, dernière clôture {gold['close'].iloc[-1]:.2f}")
+
+print("\n✅ Historiques synthétiques validés")
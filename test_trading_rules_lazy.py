@@ -0,0 +1,72 @@
+"""Test: TradingRules à indicateurs paresseux, nettoyage NaN conditionnel et mode last_only"""
+import numpy as np
+import src.trading_rules as trading_rules
+from src.indicators import calculate_bollinger_bands, calculate_macd, calculate_rsi, calculate_trend
+from src.trading_rules import SmartSignals, TradingRules
+
+rng = np.random.default_rng(5)
+prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 720)))
+
+# Test 1: Calcul au premier accès, une seule fois
+print("Test 1: Indicateurs paresseux")
+calls = []
+original = trading_rules.calculate_trend
+trading_rules.calculate_trend = lambda *args: calls.append(1) or original(*args)
+try:
+    rules = TradingRules(prices)
+    assert calls == [] and rules.rsi_signal() in (20, 50, 80) and calls == []
+    assert rules.trend is rules.trend and calls == [1]
+finally:
+    trading_rules.calculate_trend = original
+assert np.array_equal(rules.rsi, calculate_rsi(prices))
+assert np.array_equal(rules.histogram, calculate_macd(prices)[2])
+assert np.array_equal(rules.bb_upper, calculate_bollinger_bands(prices)[1])
+print("✓ Chaque groupe calculé au premier accès puis mémorisé")
+
+# Test 2: Pas de copie pour des indicateurs finis, NaN toujours nettoyés
+print("\nTest 2: Nettoyage conditionnel")
+rsi, macd_line, signal_line, histogram = calculate_rsi(prices), *calculate_macd(prices)
+sma, upper, lower = calculate_bollinger_bands(prices)
+trend = calculate_trend(prices)
+rules = TradingRules.from_arrays(prices, rsi, macd_line, signal_line, histogram, sma, upper, lower, trend)
+assert rules.rsi is rsi and rules.bb_lower is lower and rules.trend is trend
+dirty = rsi.copy()
+dirty[-1] = np.nan
+rules = TradingRules.from_arrays(prices, dirty, macd_line, signal_line, histogram, sma, upper, lower, [])
+assert rules.rsi[-1] == 50 and rules.rsi_signal() == 50 and rules.trend.tolist() == [0]
+rules.rsi = np.array([np.nan, 10.0])
+assert rules.rsi.tolist() == [50, 10] and rules.rsi_signal() == 80
+print("✓ Arrays finis réutilisés tels quels, NaN remplacés, affectations revalidées")
+
+# Test 3: last_only = mêmes signaux que le calcul complet
+print("\nTest 3: Mode last_only")
+for n in (1, 5, 19, 20, 21, 22, 60, 720):
+    for seed in range(20):
+        series = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, n)))
+        full, fast = SmartSignals(series), SmartSignals(series, last_only=True)
+        assert fast.get_composite_signal() == full.get_composite_signal()
+        assert fast.rules.trend[-1] == full.rules.trend[-1]
+        detailed, quick = full.get_detailed_signals(), fast.get_detailed_signals()
+        assert quick["signal"] == detailed["signal"] and np.isclose(quick["bollinger"], detailed["bollinger"])
+assert len(SmartSignals(prices, last_only=True).rules.bb_upper) == 20
+print("✓ Signaux identiques sur 160 séries (1 à 720 barres)")
+
+# Test 4: last_only ne calcule Bollinger et la tendance que sur la fenêtre de queue
+print("\nTest 4: Fenêtres calculées")
+sizes = []
+originals = trading_rules.calculate_bollinger_bands, trading_rules.calculate_trend
+trading_rules.calculate_bollinger_bands = lambda p, *args: sizes.append(("bb", len(p))) or originals[0](p, *args)
+trading_rules.calculate_trend = lambda p, *args: sizes.append(("trend", len(p))) or originals[1](p, *args)
+try:
+    SmartSignals(prices, last_only=True).get_detailed_signals()
+    assert sorted(sizes) == [("bb", 20), ("trend", 21)], sizes
+    sizes.clear()
+    SmartSignals(prices).get_detailed_signals()
+    assert sorted(sizes) == [("bb", 720), ("trend", 720)], sizes
+    sizes.clear()
+    assert TradingRules(prices, last_only=True).rsi_signal() in (20, 50, 80) and sizes == []
+finally:
+    trading_rules.calculate_bollinger_bands, trading_rules.calculate_trend = originals
+print("✓ last_only: Bollinger sur 20 barres et tendance sur 21 au lieu de 720, rien d'autre pour le RSI seul")
+
+print("\n✅ TradingRules paresseux validé")